@@ -1,6 +1,5 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
-import asyncio
 import re
 from contextlib import suppress
 from typing import Iterable
@@ -54,11 +53,10 @@ async def extract_files(history: list[Message]) -> list[FileChatInfo]:
                             seen.add(url.file_id)
                             files[url.file_id] = item
 
-    # TODO: N+1 query issue, add bulk endpoint
-    file_objects = await asyncio.gather(*(File.get(file_id) for file_id in files))
     existing_filenames = set()
     result = []
-    for file, message in zip(file_objects, files.values()):
+    for file in await File.get_many(files):
+        message = files[file.id]
         result.append(
             FileChatInfo(
                 file=file,
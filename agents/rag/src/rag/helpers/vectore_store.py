@@ -1,12 +1,15 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 import asyncio
+import time
 import uuid
 
 from asyncio import TaskGroup
+from contextlib import aclosing
 from datetime import timedelta
-from typing import Any, AsyncGenerator, Protocol
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, Protocol
 
+import openai
 from openai.types import CreateEmbeddingResponse
 
 from agentstack_sdk.a2a.extensions import TrajectoryExtensionServer
@@ -17,10 +20,22 @@ from rag.helpers.trajectory import TrajectoryEvent
 from tenacity import (
     AsyncRetrying,
     retry_if_exception_type,
+    stop_after_attempt,
     stop_after_delay,
+    wait_exponential,
     wait_fixed,
 )
 
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+# Text is split in windows of this many characters, only the unfinished tail is carried over to the next window
+TEXT_WINDOW_SIZE = 64 * CHUNK_SIZE
+# Limits of a single embeddings request, batches are embedded concurrently and stored as soon as they finish
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_BATCH_MAX_CHARS = 32 * CHUNK_SIZE
+EMBEDDING_CONCURRENCY = 4
+PROGRESS_INTERVAL = timedelta(seconds=1)
+
 
 class FileExtractionEvent(TrajectoryEvent):
     kind: str = "file_extraction"
@@ -32,6 +47,12 @@ class FileEmbeddingEvent(TrajectoryEvent):
     file: File
 
 
+class FileEmbeddingProgressEvent(TrajectoryEvent):
+    kind: str = "file_embedding_progress"
+    file: File
+    embedded_chunks: int
+
+
 class CreateVectorStoreEvent(TrajectoryEvent):
     kind: str = "create_vector_store"
     vector_store_id: str | None = None
@@ -63,57 +84,108 @@ async def extract_file(file: File) -> None:
                 raise TimeoutError("Text extraction is not finished yet")
 
 
-async def chunk_and_embed(embedding_function: EmbeddingFunction, file: File, vector_store_id: str):
+async def _read_chunks(file: File, text_splitter: RecursiveCharacterTextSplitter) -> AsyncIterator[str]:
+    """Stream the extracted text of the file and split it lazily, window by window."""
+    buffer = ""
+    async with file.load_text_content(stream=True) as loaded_file:
+        async for text in loaded_file.aiter_text():
+            buffer += text
+            if len(buffer) < TEXT_WINDOW_SIZE:
+                continue
+            # the last chunk may be cut at the window boundary, split it again with the following text
+            *chunks, tail = text_splitter.create_documents([buffer])
+            for chunk in chunks:
+                yield chunk.page_content
+            buffer = buffer[tail.metadata["start_index"] :]
+    for chunk in text_splitter.split_text(buffer):
+        yield chunk
+
+
+async def _batch_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[list[str]]:
+    batch, batch_chars = [], 0
+    async for chunk in chunks:
+        if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or batch_chars + len(chunk) > EMBEDDING_BATCH_MAX_CHARS):
+            yield batch
+            batch, batch_chars = [], 0
+        batch.append(chunk)
+        batch_chars += len(chunk)
+    if batch:
+        yield batch
+
+
+async def chunk_and_embed(
+    embedding_function: EmbeddingFunction,
+    file: File,
+    vector_store_id: str,
+    on_progress: Callable[[int], Awaitable[None]] | None = None,
+):
     """
-    Extract text from file, chunk it using RecursiveCharacterTextSplitter,
-    generate embeddings, and store in vector database.
+    Stream extracted text from file, chunk it using RecursiveCharacterTextSplitter,
+    generate embeddings in batches, and store each batch in vector database as soon as it is embedded.
     """
 
     vector_store = await VectorStore.get(vector_store_id)
-    model_id = vector_store.model_id
-
-    async with file.load_text_content() as loaded_file:
-        text = loaded_file.text
-
-    if not text.strip():
-        return
 
     text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
         length_function=len,
         is_separator_regex=False,
         separators=["\n\n", "\n", " ", ""],
+        add_start_index=True,
     )
 
-    chunks = text_splitter.split_text(text)
-
-    if not chunks:
-        return
-
-    embedding = await embedding_function(input=chunks)
-
-    vector_items = []
-    for i, (chunk, embedding_data) in enumerate(zip(chunks, embedding.data, strict=False)):
-        vector_items.append(
-            VectorStoreItem(
-                document_id=file.id,
-                document_type="platform_file",
-                model_id=embedding.model,
-                text=chunk,
-                embedding=embedding_data.embedding,
-                metadata={
-                    "file_id": file.id,
-                    "filename": file.filename,
-                    "chunk_index": str(i),
-                    "chunk_id": str(uuid.uuid4()),
-                    "total_chunks": str(len(chunks)),
-                    "url": str(file.url),
-                },
-            ),
-        )
-
-    await vector_store.add_documents(vector_items)
+    # bounds both the requests in flight and the chunks held in memory
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+    embedded_chunks = 0
+
+    async def embed_and_store(chunks: list[str], first_chunk_index: int) -> None:
+        nonlocal embedded_chunks
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(5),
+                wait=wait_exponential(max=30),
+                retry=retry_if_exception_type(
+                    (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+                ),
+                reraise=True,
+            ):
+                with attempt:
+                    embedding = await embedding_function(input=chunks)
+
+            embedding_data = sorted(embedding.data, key=lambda data: data.index)
+            await vector_store.add_documents(
+                [
+                    VectorStoreItem(
+                        document_id=file.id,
+                        document_type="platform_file",
+                        model_id=embedding.model,
+                        text=chunk,
+                        embedding=data.embedding,
+                        metadata={
+                            "file_id": file.id,
+                            "filename": file.filename,
+                            "chunk_index": str(first_chunk_index + i),
+                            "chunk_id": str(uuid.uuid4()),
+                            "url": str(file.url),
+                        },
+                    )
+                    for i, (chunk, data) in enumerate(zip(chunks, embedding_data, strict=True))
+                ]
+            )
+        finally:
+            semaphore.release()
+
+        embedded_chunks += len(chunks)
+        if on_progress:
+            await on_progress(embedded_chunks)
+
+    chunk_index = 0
+    async with TaskGroup() as tg, aclosing(_batch_chunks(_read_chunks(file, text_splitter))) as batches:
+        async for batch in batches:
+            await semaphore.acquire()
+            tg.create_task(embed_and_store(batch, chunk_index))
+            chunk_index += len(batch)
 
 
 async def embed_all_files(
@@ -157,7 +229,19 @@ async def embed_all_files(
         embedding_start_event = FileEmbeddingEvent(file=file, phase="start")
         await event_queue.put(embedding_start_event.metadata(trajectory))
 
-        await chunk_and_embed(embedding_function, file, vector_store_id)
+        last_progress = time.monotonic()
+
+        async def report_progress(embedded_chunks: int) -> None:
+            nonlocal last_progress
+            if time.monotonic() - last_progress < PROGRESS_INTERVAL.total_seconds():
+                return
+            last_progress = time.monotonic()
+            progress_event = FileEmbeddingProgressEvent(
+                parent_id=embedding_start_event.id, phase=None, file=file, embedded_chunks=embedded_chunks
+            )
+            await event_queue.put(progress_event.metadata(trajectory))
+
+        await chunk_and_embed(embedding_function, file, vector_store_id, on_progress=report_progress)
         embedding_end_event = FileEmbeddingEvent(parent_id=embedding_start_event.id, file=file, phase="end")
         await event_queue.put(embedding_end_event.metadata(trajectory))
 
@@ -1,6 +1,5 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
-import asyncio
 from contextlib import suppress
 
 import pydantic.type_adapter
@@ -53,8 +52,7 @@ async def extract_files(history: list[Message]) -> list[File]:
                         seen.add(url.file_id)
                         file_ids.append(url.file_id)
 
-    # TODO: N+1 query issue, add bulk endpoint
-    return await asyncio.gather(*(File.get(file_id) for file_id in file_ids))
+    return await File.get_many(file_ids)
 
 
 def format_size(size: int | None) -> str:
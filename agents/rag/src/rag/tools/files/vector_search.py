@@ -18,13 +18,17 @@ class VectorSearchToolInput(BaseModel):
     """Input schema for vector search tool."""
 
     query: str = Field(description="The search query to find relevant documents.")
+    keywords_only: bool = Field(
+        default=False,
+        description="Match only the exact words of the query, for identifiers, error codes or names.",
+    )
 
 
 class VectorSearchToolResult(BaseModel):
     """Individual search result from vector store."""
 
     text: str = Field(description="The text content of the document chunk.")
-    score: float = Field(description="Similarity score between 0.0 and 1.0.")
+    score: float = Field(description="Relevance score, higher is better.")
     metadata: dict[str, Any] = Field(description="Additional metadata for the document.")
 
     @property
@@ -83,8 +87,8 @@ class VectorSearchTool(Tool[VectorSearchToolInput, ToolRunOptions, VectorSearchT
     """
     Vector search tool for retrieving relevant documents from a vector database.
 
-    This tool performs semantic search over previously embedded documents using
-    vector similarity search to find the most relevant content for a given query.
+    This tool performs hybrid search over previously embedded documents, fusing
+    vector similarity and full-text keyword matches to find the most relevant content.
     """
 
     name: str = "vector_search"
@@ -92,7 +96,8 @@ class VectorSearchTool(Tool[VectorSearchToolInput, ToolRunOptions, VectorSearchT
         "Search for relevant information across multiple uploaded documents using semantic search. "
         "Use this tool for: research questions, content discovery across multiple files, "
         "and finding specific topics or concepts within documents. "
-        "This tool finds the most relevant content based on meaning rather than exact keyword matching.\n\n"
+        "This tool finds the most relevant content based on both meaning and matching keywords. "
+        "Set keywords_only when looking for exact identifiers, error codes, names or quoted phrases.\n\n"
         "# How to Create Effective Vector Search Queries:\n\n"
         "1. **Use Natural Language**: Write queries as you would ask a human expert\n"
         "   - Good: 'What are the benefits of renewable energy sources?'\n"
@@ -138,13 +143,21 @@ class VectorSearchTool(Tool[VectorSearchToolInput, ToolRunOptions, VectorSearchT
         context: RunContext,
     ) -> VectorSearchToolOutput:
         try:
-            embed_response = await self.embedding_function(input=input.query)
-            query_embedding = embed_response.data[0].embedding
-
-            # Perform vector search
-            search_results = await VectorStore.search(
-                self.vector_store_id, query_vector=query_embedding, limit=self.limit
-            )
+            if input.keywords_only:
+                # Full-text search does not need the query embedding
+                search_results = await VectorStore.search(
+                    self.vector_store_id, query_text=input.query, mode="lexical", limit=self.limit
+                )
+            else:
+                embed_response = await self.embedding_function(input=input.query)
+                query_embedding = embed_response.data[0].embedding
+                search_results = await VectorStore.search(
+                    self.vector_store_id,
+                    query_vector=query_embedding,
+                    query_text=input.query,
+                    mode="hybrid",
+                    limit=self.limit,
+                )
 
             # Convert results to tool output format
             results = []
@@ -97,6 +97,7 @@ class Context(pydantic.BaseModel):
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
         include_empty: bool = True,
         provider_id: str | None = None,
+        total_count: Literal["exact", "estimate"] | None = None,
     ) -> PaginatedResult[Context]:
         # `self` has a weird type so that you can call both `instance.get()` to update an instance, or `File.get("123")` to obtain a new instance
         async with client or get_platform_client() as client:
@@ -112,6 +113,7 @@ class Context(pydantic.BaseModel):
                                 "order_by": order_by,
                                 "include_empty": include_empty,
                                 "provider_id": provider_id,
+                                "total_count": total_count,
                             }
                         ),
                     )
@@ -235,6 +237,7 @@ class Context(pydantic.BaseModel):
         limit: int | None = None,
         order: Literal["asc"] | Literal["desc"] | None = "asc",
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
+        total_count: Literal["exact", "estimate"] | None = None,
         client: PlatformClient | None = None,
     ) -> PaginatedResult[ContextHistoryItem]:
         """List all history items for this context in chronological order"""
@@ -245,7 +248,13 @@ class Context(pydantic.BaseModel):
                     await platform_client.get(
                         url=f"/api/v1/contexts/{target_context_id}/history",
                         params=filter_dict(
-                            {"page_token": page_token, "limit": limit, "order": order, "order_by": order_by}
+                            {
+                                "page_token": page_token,
+                                "limit": limit,
+                                "order": order,
+                                "order_by": order_by,
+                                "total_count": total_count,
+                            }
                         ),
                     )
                 )
@@ -263,3 +272,24 @@ class Context(pydantic.BaseModel):
             result = await Context.list_history(self, page_token=result.next_page_token, client=client)
             for item in result.items:
                 yield item
+
+    async def stream_history(
+        self: Context | str,
+        *,
+        after: str | UUID | None = None,
+        client: PlatformClient | None = None,
+    ) -> AsyncIterator[ContextHistoryItem]:
+        """Stream history items in chronological order in a single request, optionally only items newer than `after`"""
+        target_context_id = self if isinstance(self, str) else self.id
+        async with (
+            client or get_platform_client() as platform_client,
+            platform_client.stream(
+                "GET",
+                url=f"/api/v1/contexts/{target_context_id}/history/stream",
+                params=filter_dict({"after": after and str(after)}),
+            ) as response,
+        ):
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield ContextHistoryItem.model_validate_json(line)
@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import typing
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from typing import Literal
 
@@ -12,7 +12,19 @@ import pydantic
 from a2a.types import FilePart, FileWithUri
 
 from agentstack_sdk.platform.client import PlatformClient, get_platform_client
+from agentstack_sdk.platform.common import PaginatedResult
 from agentstack_sdk.util.file import LoadedFile, LoadedFileWithUri, PlatformFileUrl
+from agentstack_sdk.util.utils import filter_dict
+
+_MAX_FILE_IDS_PER_REQUEST = 100
+
+
+def _range_header(byte_range: tuple[int, int | None] | None) -> dict[str, str]:
+    """Range header for an inclusive (start, end) byte range, end None reads until the end of the file"""
+    if byte_range is None:
+        return {}
+    start, end = byte_range
+    return {"Range": f"bytes={start}-{'' if end is None else end}"}
 
 
 class Extraction(pydantic.BaseModel):
@@ -86,6 +98,40 @@ class File(pydantic.BaseModel):
                 .json()
             )
 
+    @staticmethod
+    async def get_many(
+        file_ids: Iterable[str],
+        *,
+        client: PlatformClient | None = None,
+        context_id: str | None | Literal["auto"] = "auto",
+    ) -> list[File]:
+        """Get multiple files in as few requests as possible, files that do not exist or are not accessible are omitted"""
+        file_ids = list(dict.fromkeys(file_ids))
+        files: list[File] = []
+        async with client or get_platform_client() as platform_client:
+            context_id = platform_client.context_id if context_id == "auto" else context_id
+            for start in range(0, len(file_ids), _MAX_FILE_IDS_PER_REQUEST):
+                files.extend(
+                    pydantic.TypeAdapter(PaginatedResult[File])
+                    .validate_python(
+                        (
+                            await platform_client.get(
+                                url="/api/v1/files",
+                                params=filter_dict(
+                                    {
+                                        "ids": file_ids[start : start + _MAX_FILE_IDS_PER_REQUEST],
+                                        "context_id": context_id,
+                                    }
+                                ),
+                            )
+                        )
+                        .raise_for_status()
+                        .json()
+                    )
+                    .items
+                )
+        return files
+
     async def delete(
         self: File | str,
         *,
@@ -107,6 +153,7 @@ class File(pydantic.BaseModel):
         self: File | str,
         *,
         stream: bool = False,
+        byte_range: tuple[int, int | None] | None = None,
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> AsyncIterator[LoadedFile]:
@@ -118,7 +165,10 @@ class File(pydantic.BaseModel):
             file = await File.get(file_id, client=client, context_id=context_id) if isinstance(self, str) else self
 
             async with platform_client.stream(
-                "GET", url=f"/api/v1/files/{file_id}/content", params=context_id and {"context_id": context_id}
+                "GET",
+                url=f"/api/v1/files/{file_id}/content",
+                params=context_id and {"context_id": context_id},
+                headers=_range_header(byte_range),
             ) as response:
                 response.raise_for_status()
                 if not stream:
@@ -130,6 +180,7 @@ class File(pydantic.BaseModel):
         self: File | str,
         *,
         stream: bool = False,
+        byte_range: tuple[int, int | None] | None = None,
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> AsyncIterator[LoadedFile]:
@@ -144,6 +195,7 @@ class File(pydantic.BaseModel):
                 "GET",
                 url=f"/api/v1/files/{file_id}/text_content",
                 params=context_id and {"context_id": context_id},
+                headers=_range_header(byte_range),
             ) as response:
                 response.raise_for_status()
                 if not stream:
@@ -166,6 +166,7 @@ class ProviderBuild(pydantic.BaseModel):
         order: Literal["asc"] | Literal["desc"] | None = "asc",
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
         user_owned: bool | None = None,
+        total_count: Literal["exact", "estimate"] | None = None,
         client: PlatformClient | None = None,
     ) -> PaginatedResult[ProviderBuild]:
         # `self` has a weird type so that you can call both `instance.list_history()` or `ProviderBuild.list_history("123")`
@@ -181,6 +182,7 @@ class ProviderBuild(pydantic.BaseModel):
                                 "order": order,
                                 "order_by": order_by,
                                 "user_owned": user_owned,
+                                "total_count": total_count,
                             }
                         ),
                     )
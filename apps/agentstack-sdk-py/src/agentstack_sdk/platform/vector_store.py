@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import base64
+import struct
 import typing
 import uuid
 from typing import Literal
@@ -16,6 +18,7 @@ from agentstack_sdk.platform.types import Metadata
 class VectorStoreStats(pydantic.BaseModel):
     usage_bytes: int
     num_documents: int
+    partition: str | None = None
 
 
 class VectorStoreDocument(pydantic.BaseModel):
@@ -26,21 +29,57 @@ class VectorStoreDocument(pydantic.BaseModel):
     created_at: pydantic.AwareDatetime
 
 
+EmbeddingEncoding = Literal["float", "base64", "base64_float16"]
+"""float: JSON list, base64: little-endian float32 buffer, base64_float16: little-endian float16 buffer"""
+
+_STRUCT_FORMATS = {"base64": "f", "base64_float16": "e"}
+
+
+def _encode_embedding(embedding: list[float], encoding_format: EmbeddingEncoding) -> str | list[float]:
+    if fmt := _STRUCT_FORMATS.get(encoding_format):
+        return base64.b64encode(struct.pack(f"<{len(embedding)}{fmt}", *embedding)).decode("ascii")
+    return embedding
+
+
+def _decode_embedding(value: typing.Any, info: pydantic.ValidationInfo) -> typing.Any:
+    if isinstance(value, str):
+        fmt = _STRUCT_FORMATS.get((info.context or {}).get("encoding_format", "base64"), "f")
+        buffer = base64.b64decode(value)
+        return list(struct.unpack(f"<{len(buffer) // struct.calcsize(fmt)}{fmt}", buffer))
+    return value
+
+
 class VectorStoreItem(pydantic.BaseModel):
     id: str = pydantic.Field(default_factory=lambda: uuid.uuid4().hex)
     document_id: str
     document_type: typing.Literal["platform_file", "external"] = "platform_file"
     model_id: str | typing.Literal["platform"] = "platform"
     text: str
-    embedding: list[float]
+    embedding: typing.Annotated[list[float], pydantic.BeforeValidator(_decode_embedding)]
     metadata: Metadata | None = None
 
+    @pydantic.field_serializer("embedding", when_used="json")
+    def _serialize_embedding(self, embedding: list[float], info: pydantic.FieldSerializationInfo) -> str | list[float]:
+        return _encode_embedding(embedding, (info.context or {}).get("encoding_format", "float"))
+
+
+def _encode_frame(item: VectorStoreItem, encoding_format: EmbeddingEncoding) -> bytes:
+    header = item.model_dump_json(exclude={"embedding"}).encode()
+    embedding = struct.pack(f"<{len(item.embedding)}{_STRUCT_FORMATS.get(encoding_format, 'f')}", *item.embedding)
+    return struct.pack("<I", len(header)) + header + struct.pack("<I", len(embedding)) + embedding
+
 
 class VectorStoreSearchResult(pydantic.BaseModel):
     item: VectorStoreItem
     score: float
 
 
+class VectorStoreIngestionStats(pydantic.BaseModel):
+    items: int
+    elapsed_sec: float
+    rows_per_second: float
+
+
 class VectorStore(pydantic.BaseModel):
     id: str
     name: str | None = None
@@ -123,6 +162,7 @@ class VectorStore(pydantic.BaseModel):
         /,
         items: list[VectorStoreItem],
         *,
+        encoding_format: EmbeddingEncoding = "float",
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> None:
@@ -133,17 +173,64 @@ class VectorStore(pydantic.BaseModel):
             _ = (
                 await platform_client.put(
                     url=f"/api/v1/vector_stores/{vector_store_id}",
-                    json=[item.model_dump(mode="json") for item in items],
-                    params=context_id and {"context_id": context_id},
+                    json=[item.model_dump(mode="json", context={"encoding_format": encoding_format}) for item in items],
+                    params={"encoding_format": encoding_format} | ({"context_id": context_id} if context_id else {}),
                 )
             ).raise_for_status()
 
+    async def add_documents_stream(
+        self: VectorStore | str,
+        /,
+        items: typing.Iterable[VectorStoreItem] | typing.AsyncIterable[VectorStoreItem],
+        *,
+        encoding_format: EmbeddingEncoding = "base64_float16",
+        client: PlatformClient | None = None,
+        context_id: str | None | Literal["auto"] = "auto",
+    ) -> VectorStoreIngestionStats:
+        """
+        Stream a large number of items to the vector store without holding the request in memory. Embeddings are sent
+        as raw little-endian buffers in vector frames (float16 for base64_float16, float32 otherwise).
+        """
+        # `self` has a weird type so that you can call both `instance.add_documents_stream()` or `VectorStore.add_documents_stream("123", items)`
+        vector_store_id = self if isinstance(self, str) else self.id
+
+        context = {"encoding_format": encoding_format}
+
+        async def frames() -> typing.AsyncIterator[bytes]:
+            if isinstance(items, typing.AsyncIterable):
+                async for item in items:
+                    yield _encode_frame(item, encoding_format)
+            else:
+                for item in items:
+                    yield _encode_frame(item, encoding_format)
+
+        async with client or get_platform_client() as platform_client:
+            context_id = platform_client.context_id if context_id == "auto" else context_id
+            return pydantic.TypeAdapter(VectorStoreIngestionStats).validate_python(
+                (
+                    await platform_client.put(
+                        url=f"/api/v1/vector_stores/{vector_store_id}",
+                        content=frames(),
+                        headers={"Content-Type": "application/vnd.agentstack.vector-frame"},
+                        params=context | ({"context_id": context_id} if context_id else {}),
+                    )
+                )
+                .raise_for_status()
+                .json()
+            )
+
     async def search(
         self: VectorStore | str,
         /,
-        query_vector: list[float],
+        query_vector: list[float] | None = None,
         *,
+        query_text: str | None = None,
+        mode: Literal["vector", "lexical", "hybrid"] = "vector",
         limit: int = 10,
+        metric: Literal["cosine", "l2", "inner_product"] = "cosine",
+        ef_search: int | None = None,
+        metadata_filter: Metadata | None = None,
+        encoding_format: EmbeddingEncoding = "float",
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> list[VectorStoreSearchResult]:
@@ -151,16 +238,27 @@ class VectorStore(pydantic.BaseModel):
         vector_store_id = self if isinstance(self, str) else self.id
         async with client or get_platform_client() as platform_client:
             context_id = platform_client.context_id if context_id == "auto" else context_id
+            context = {"encoding_format": encoding_format}
             return pydantic.TypeAdapter(list[VectorStoreSearchResult]).validate_python(
                 (
                     await platform_client.post(
                         url=f"/api/v1/vector_stores/{vector_store_id}/search",
-                        json={"query_vector": query_vector, "limit": limit},
+                        json={
+                            "query_vector": query_vector and _encode_embedding(query_vector, encoding_format),
+                            "query_text": query_text,
+                            "mode": mode,
+                            "encoding_format": encoding_format,
+                            "limit": limit,
+                            "metric": metric,
+                            "ef_search": ef_search,
+                            "metadata_filter": metadata_filter,
+                        },
                         params=context_id and {"context_id": context_id},
                     )
                 )
                 .raise_for_status()
-                .json()["items"]
+                .json()["items"],
+                context=context,
             )
 
     async def list_documents(
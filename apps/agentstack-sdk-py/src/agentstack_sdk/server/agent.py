@@ -2,18 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
+import functools
 import inspect
 import json
 from asyncio import CancelledError
-from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Generator
 from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta
-from typing import NamedTuple, TypeAlias, TypedDict, cast
+from typing import Any, NamedTuple, TypeAlias, TypedDict, cast
 
-import janus
 from a2a.client import create_text_message_object
 from a2a.server.agent_execution import AgentExecutor, RequestContext
-from a2a.server.events import EventQueue, QueueManager
+from a2a.server.events import Event, EventQueue, QueueManager
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     AgentCapabilities,
@@ -39,14 +39,15 @@ from a2a.types import (
 from agentstack_sdk.a2a.extensions.ui.agent_detail import AgentDetail, AgentDetailExtensionSpec
 from agentstack_sdk.a2a.types import ArtifactChunk, Metadata, RunYield, RunYieldResume
 from agentstack_sdk.server.constants import _IMPLICIT_DEPENDENCY_PREFIX
-from agentstack_sdk.server.context import RunContext
+from agentstack_sdk.server.context import RunContext, YieldHandler
 from agentstack_sdk.server.dependencies import extract_dependencies
 from agentstack_sdk.server.store.context_store import ContextStore
+from agentstack_sdk.server.store.distributed_queue_manager import DistributedQueueManager
 from agentstack_sdk.server.utils import cancel_task, close_queue
 from agentstack_sdk.util.logging import logger
 from agentstack_sdk.util.utils import extract_messages
 
-AgentFunction: TypeAlias = Callable[[], AsyncGenerator[RunYield, RunYieldResume]]
+AgentFunction: TypeAlias = Callable[[YieldHandler], Awaitable[None]]
 AgentFunctionFactory: TypeAlias = Callable[
     [TaskUpdater, RequestContext, ContextStore], AbstractAsyncContextManager[tuple[AgentFunction, RunContext]]
 ]
@@ -150,44 +151,36 @@ def agent(
             )
 
             if inspect.isasyncgenfunction(fn):
+                # fast path: the generator is driven directly by the executor task, no thread or queue handoffs
 
                 async def execute_fn(_ctx: RunContext, *args, **kwargs) -> None:
+                    gen: AsyncGenerator[RunYield, RunYieldResume] = fn(*args, **kwargs)
                     try:
-                        gen: AsyncGenerator[RunYield, RunYieldResume] = fn(*args, **kwargs)
                         value: RunYieldResume = None
                         while True:
-                            value = await _ctx.yield_async(await gen.asend(value))
-                    except StopAsyncIteration:
-                        pass
-                    except Exception as e:
-                        await _ctx.yield_async(e)
+                            try:
+                                yielded_value = await gen.asend(value)
+                            except StopAsyncIteration:
+                                return
+                            value = await _ctx.yield_async(yielded_value)
                     finally:
-                        _ctx.shutdown()
+                        await gen.aclose()
 
             elif inspect.iscoroutinefunction(fn):
 
                 async def execute_fn(_ctx: RunContext, *args, **kwargs) -> None:
-                    try:
-                        await _ctx.yield_async(await fn(*args, **kwargs))
-                    except Exception as e:
-                        await _ctx.yield_async(e)
-                    finally:
-                        _ctx.shutdown()
+                    await _ctx.yield_async(await fn(*args, **kwargs))
 
             elif inspect.isgeneratorfunction(fn):
 
                 def _execute_fn_sync(_ctx: RunContext, *args, **kwargs) -> None:
+                    gen: Generator[RunYield, RunYieldResume] = fn(*args, **kwargs)
                     try:
-                        gen: Generator[RunYield, RunYieldResume] = fn(*args, **kwargs)
                         value = None
                         while True:
                             value = _ctx.yield_sync(gen.send(value))
                     except StopIteration:
                         pass
-                    except Exception as e:
-                        _ctx.yield_sync(e)
-                    finally:
-                        _ctx.shutdown()
 
                 async def execute_fn(_ctx: RunContext, *args, **kwargs) -> None:
                     await asyncio.to_thread(_execute_fn_sync, _ctx, *args, **kwargs)
@@ -195,12 +188,7 @@ def agent(
             else:
 
                 def _execute_fn_sync(_ctx: RunContext, *args, **kwargs) -> None:
-                    try:
-                        _ctx.yield_sync(fn(*args, **kwargs))
-                    except Exception as e:
-                        _ctx.yield_sync(e)
-                    finally:
-                        _ctx.shutdown()
+                    _ctx.yield_sync(fn(*args, **kwargs))
 
                 async def execute_fn(_ctx: RunContext, *args, **kwargs) -> None:
                     await asyncio.to_thread(_execute_fn_sync, _ctx, *args, **kwargs)
@@ -237,12 +225,21 @@ def agent(
                         initialized_dependencies=list(dependency_args.values()),
                     )
 
-                    async def agent_generator():
-                        yield_queue = context._yield_queue
-                        yield_resume_queue = context._yield_resume_queue
-
-                        task = asyncio.create_task(
-                            execute_fn(
+                    async def run_agent(yield_handler: YieldHandler) -> None:
+                        async def handle_yield(value: RunYield) -> RunYieldResume:
+                            resume_value = await yield_handler(value)
+                            if resume_value:
+                                # TODO: context.call_context should be updated here
+                                # Unfortunately queue implementation does not support passing external types
+                                # (only a2a.event_queue.Event is supported:
+                                # Event = Message | Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
+                                for ext in sdk_extensions:
+                                    ext.handle_incoming_message(resume_value, context)
+                            return resume_value
+
+                        context.start(handle_yield)
+                        try:
+                            await execute_fn(
                                 context,
                                 **{
                                     k: v
@@ -250,30 +247,10 @@ def agent(
                                     if not k.startswith(_IMPLICIT_DEPENDENCY_PREFIX)
                                 },
                             )
-                        )
-                        try:
-                            while not task.done() or yield_queue.async_q.qsize() > 0:
-                                value = yield await yield_queue.async_q.get()
-                                if isinstance(value, Exception):
-                                    raise value
-
-                                if value:
-                                    # TODO: context.call_context should be updated here
-                                    # Unfortunately queue implementation does not support passing external types
-                                    # (only a2a.event_queue.Event is supported:
-                                    # Event = Message | Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
-                                    for ext in sdk_extensions:
-                                        ext.handle_incoming_message(value, context)
-
-                                await yield_resume_queue.async_q.put(value)
-                        except janus.AsyncQueueShutDown:
-                            pass
-                        except GeneratorExit:
-                            return
                         finally:
-                            await cancel_task(task)
+                            context.shutdown()
 
-                    yield agent_generator, context
+                    yield run_agent, context
 
             return Agent(card=card, execute=agent_executor_lifespan)
 
@@ -282,6 +259,219 @@ def agent(
     return decorator
 
 
+class _YieldHandler:
+    """Translates values yielded by an agent into task updates, the handler is looked up by the value type."""
+
+    def __init__(self, task_updater: TaskUpdater, resume_queue: EventQueue, on_yield: Callable[[], None]) -> None:
+        self._task_updater = task_updater
+        self._resume_queue = resume_queue
+        self._on_yield = on_yield
+        self._opened_artifacts: set[str] = set()
+        # values yielded concurrently (e.g. from multiple tasks of the agent) are handled one at a time
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, value: RunYield) -> RunYieldResume:
+        self._on_yield()
+        handler = _yield_handler_for(type(value))
+        async with self._lock:
+            return await handler(self, value)
+
+    def _with_context(self, message: Message | None = None) -> Message | None:
+        if message is None:
+            return None
+        # Note: This check would require extra handling in agents just forwarding messages from other agents
+        # Instead, we just silently replace it.
+        # if message.task_id and message.task_id != task_updater.task_id:
+        #     raise ValueError("Message must have the same task_id as the task")
+        # if message.context_id and message.context_id != task_updater.context_id:
+        #     raise ValueError("Message must have the same context_id as the task")
+        return message.model_copy(
+            deep=True, update={"context_id": self._task_updater.context_id, "task_id": self._task_updater.task_id}
+        )
+
+    async def _update_parts(self, parts: list[Part], metadata: dict[str, Any] | None = None) -> None:
+        message = self._task_updater.new_agent_message(parts=parts, metadata=metadata)
+        await self._task_updater.update_status(TaskState.working, message=message)
+
+    async def _resume(self) -> RunYieldResume:
+        value = cast(RunYieldResume, await self._resume_queue.dequeue_event())
+        self._resume_queue.task_done()
+        return value
+
+    async def text(self, text: str) -> None:
+        await self._update_parts([Part(root=TextPart(text=text))])
+
+    async def part(self, part: Part) -> None:
+        await self._update_parts([part])
+
+    async def part_root(self, part: TextPart | FilePart | DataPart) -> None:
+        await self._update_parts([Part(root=part)])
+
+    async def file(self, file: FileWithBytes | FileWithUri) -> None:
+        await self._update_parts([Part(root=FilePart(file=file))])
+
+    async def message(self, message: Message) -> None:
+        await self._task_updater.update_status(TaskState.working, message=self._with_context(message))
+
+    async def artifact_chunk(self, chunk: ArtifactChunk) -> None:
+        await self._task_updater.add_artifact(
+            parts=cast(list[Part], chunk.parts),
+            artifact_id=chunk.artifact_id,
+            name=chunk.name,
+            metadata=chunk.metadata,
+            append=chunk.artifact_id in self._opened_artifacts,
+            last_chunk=chunk.last_chunk,
+        )
+        self._opened_artifacts.add(chunk.artifact_id)
+
+    async def artifact(self, artifact: Artifact) -> None:
+        await self._task_updater.add_artifact(
+            parts=artifact.parts,
+            artifact_id=artifact.artifact_id,
+            name=artifact.name,
+            metadata=artifact.metadata,
+            last_chunk=True,
+            append=False,
+        )
+
+    async def status(self, status: TaskStatus) -> RunYieldResume:
+        match status.state:
+            case TaskState.input_required:
+                await self._task_updater.requires_input(message=self._with_context(status.message), final=True)
+                return await self._resume()
+            case TaskState.auth_required:
+                await self._task_updater.requires_auth(message=self._with_context(status.message), final=True)
+                return await self._resume()
+            case state:
+                await self._task_updater.update_status(
+                    state=state, message=self._with_context(status.message), timestamp=status.timestamp
+                )
+
+    async def status_update_event(self, event: TaskStatusUpdateEvent) -> None:
+        await self._task_updater.update_status(
+            state=event.status.state,
+            message=self._with_context(event.status.message),
+            timestamp=event.status.timestamp,
+            final=event.final,
+            metadata=event.metadata,
+        )
+
+    async def artifact_update_event(self, event: TaskArtifactUpdateEvent) -> None:
+        await self._task_updater.add_artifact(
+            parts=event.artifact.parts,
+            artifact_id=event.artifact.artifact_id,
+            name=event.artifact.name,
+            metadata=event.artifact.metadata,
+            append=event.append,
+            last_chunk=event.last_chunk,
+        )
+
+    async def metadata(self, metadata: Metadata) -> None:
+        await self._update_parts([], metadata=metadata)
+
+    async def data(self, data: dict[str, Any]) -> None:
+        await self._update_parts([Part(root=DataPart(data=data))])
+
+    async def exception(self, ex: Exception) -> None:
+        raise ex
+
+    async def invalid(self, value: Any) -> None:
+        raise ValueError(f"Invalid value yielded from agent: {type(value)}")
+
+
+_YIELD_HANDLERS: dict[type, Callable[[_YieldHandler, Any], Awaitable[RunYieldResume]]] = {
+    str: _YieldHandler.text,
+    Part: _YieldHandler.part,
+    TextPart: _YieldHandler.part_root,
+    FilePart: _YieldHandler.part_root,
+    DataPart: _YieldHandler.part_root,
+    FileWithBytes: _YieldHandler.file,
+    FileWithUri: _YieldHandler.file,
+    Message: _YieldHandler.message,
+    ArtifactChunk: _YieldHandler.artifact_chunk,
+    Artifact: _YieldHandler.artifact,
+    TaskStatus: _YieldHandler.status,
+    TaskStatusUpdateEvent: _YieldHandler.status_update_event,
+    TaskArtifactUpdateEvent: _YieldHandler.artifact_update_event,
+    Metadata: _YieldHandler.metadata,  # must be resolved before dict (Metadata is a dict subclass)
+    dict: _YieldHandler.data,
+    Exception: _YieldHandler.exception,
+}
+
+
+@functools.cache
+def _yield_handler_for(value_type: type) -> Callable[[_YieldHandler, Any], Awaitable[RunYieldResume]]:
+    """Handler of the closest registered base class (subclasses such as AgentMessage or InputRequired)."""
+    for base in value_type.__mro__:
+        if handler := _YIELD_HANDLERS.get(base):
+            return handler
+    return _YieldHandler.invalid
+
+
+def _merge_parts(first: list[Part], second: list[Part]) -> list[Part]:
+    """Concatenate parts, adjacent text parts without metadata are joined into one."""
+    match first[-1:], second[:1]:
+        case [Part(root=TextPart(metadata=None) as last)], [Part(root=TextPart(metadata=None) as next_part)]:
+            return [*first[:-1], Part(root=TextPart(text=last.text + next_part.text)), *second[1:]]
+        case _:
+            return [*first, *second]
+
+
+def _merge_events(first: Event, second: Event) -> Event | None:
+    """Merge two consecutive events if the second one only extends the first one."""
+    match first, second:
+        case (
+            TaskArtifactUpdateEvent(last_chunk=False | None, metadata=None),
+            TaskArtifactUpdateEvent(append=True, metadata=None),
+        ) if (
+            first.artifact.artifact_id == second.artifact.artifact_id
+            and first.artifact.name == second.artifact.name
+            and second.artifact.metadata in (None, first.artifact.metadata)
+        ):
+            artifact = first.artifact.model_copy(
+                update={"parts": _merge_parts(first.artifact.parts, second.artifact.parts)}
+            )
+            return first.model_copy(update={"artifact": artifact, "last_chunk": second.last_chunk})
+        case (
+            TaskStatusUpdateEvent(
+                final=False,
+                metadata=None,
+                status=TaskStatus(state=TaskState.working, message=Message(metadata=None, extensions=None)),
+            ),
+            TaskStatusUpdateEvent(
+                final=False,
+                metadata=None,
+                status=TaskStatus(state=TaskState.working, message=Message(metadata=None, extensions=None)),
+            ),
+        ):
+            first_message, second_message = first.status.message, second.status.message
+            assert first_message and second_message
+            if first_message.role != second_message.role or (
+                first_message.reference_task_ids or second_message.reference_task_ids
+            ):
+                return None
+            message = first_message.model_copy(
+                update={"parts": _merge_parts(first_message.parts, second_message.parts)}
+            )
+            return first.model_copy(update={"status": second.status.model_copy(update={"message": message})})
+        case _:
+            return None
+
+
+def _coalesce_events(events: list[Event]) -> list[Event]:
+    coalesced: list[Event] = []
+    for event in events:
+        if coalesced and (merged := _merge_events(coalesced[-1], event)):
+            coalesced[-1] = merged
+        else:
+            coalesced.append(event)
+    return coalesced
+
+
+def _is_final(event: Event) -> bool:
+    return isinstance(event, TaskStatusUpdateEvent) and event.final
+
+
 class RunningTask(TypedDict):
     task: asyncio.Task
     last_invocation: datetime
@@ -294,6 +484,7 @@ class Executor(AgentExecutor):
         queue_manager: QueueManager,
         context_store: ContextStore,
         task_timeout: timedelta,
+        coalesce_events: bool = False,
     ) -> None:
         self._agent_executor_span = execute_fn
         self._queue_manager = queue_manager
@@ -301,6 +492,9 @@ class Executor(AgentExecutor):
         self._cancel_queues: dict[str, EventQueue] = {}
         self._context_store = context_store
         self._task_timeout = task_timeout
+        self._coalesce_events = coalesce_events
+        # queues are shared with other replicas, the agent run may live elsewhere
+        self._distributed = isinstance(queue_manager, DistributedQueueManager)
 
     async def _watch_for_cancellation(self, task_id: str, task: asyncio.Task) -> None:
         cancel_queue = await self._queue_manager.create_or_tap(f"_cancel_{task_id}")
@@ -326,131 +520,15 @@ class Executor(AgentExecutor):
         assert current_task
         cancellation_task = asyncio.create_task(self._watch_for_cancellation(task_updater.task_id, current_task))
 
-        def with_context(message: Message | None = None) -> Message | None:
-            if message is None:
-                return None
-            # Note: This check would require extra handling in agents just forwarding messages from other agents
-            # Instead, we just silently replace it.
-            # if message.task_id and message.task_id != task_updater.task_id:
-            #     raise ValueError("Message must have the same task_id as the task")
-            # if message.context_id and message.context_id != task_updater.context_id:
-            #     raise ValueError("Message must have the same context_id as the task")
-            return message.model_copy(
-                deep=True, update={"context_id": task_updater.context_id, "task_id": task_updater.task_id}
-            )
+        def update_last_invocation() -> None:
+            self._running_tasks[task_updater.task_id]["last_invocation"] = datetime.now()
 
         try:
-            async with self._agent_executor_span(task_updater, context, context_store) as (execute_fn, _run_context):
-                agent_generator_fn = execute_fn()
-
+            async with self._agent_executor_span(task_updater, context, context_store) as (run_agent, _run_context):
                 await task_updater.start_work()
-                value: RunYieldResume = None
-                opened_artifacts: set[str] = set()
-                while True:
-                    # update invocation time
-                    self._running_tasks[task_updater.task_id]["last_invocation"] = datetime.now()
-
-                    yielded_value = await agent_generator_fn.asend(value)
-
-                    match yielded_value:
-                        case str(text):
-                            await task_updater.update_status(
-                                TaskState.working,
-                                message=task_updater.new_agent_message(parts=[Part(root=TextPart(text=text))]),
-                            )
-                        case Part(root=part) | (TextPart() | FilePart() | DataPart() as part):
-                            await task_updater.update_status(
-                                TaskState.working,
-                                message=task_updater.new_agent_message(parts=[Part(root=part)]),
-                            )
-                        case FileWithBytes() | FileWithUri() as file:
-                            await task_updater.update_status(
-                                TaskState.working,
-                                message=task_updater.new_agent_message(parts=[Part(root=FilePart(file=file))]),
-                            )
-                        case Message() as message:
-                            await task_updater.update_status(TaskState.working, message=with_context(message))
-                        case ArtifactChunk(
-                            parts=parts,
-                            artifact_id=artifact_id,
-                            name=name,
-                            metadata=metadata,
-                            last_chunk=last_chunk,
-                        ):
-                            await task_updater.add_artifact(
-                                parts=cast(list[Part], parts),
-                                artifact_id=artifact_id,
-                                name=name,
-                                metadata=metadata,
-                                append=artifact_id in opened_artifacts,
-                                last_chunk=last_chunk,
-                            )
-                            opened_artifacts.add(artifact_id)
-                        case Artifact(parts=parts, artifact_id=artifact_id, name=name, metadata=metadata):
-                            await task_updater.add_artifact(
-                                parts=parts,
-                                artifact_id=artifact_id,
-                                name=name,
-                                metadata=metadata,
-                                last_chunk=True,
-                                append=False,
-                            )
-                        case TaskStatus(state=TaskState.input_required, message=message, timestamp=timestamp):
-                            await task_updater.requires_input(message=with_context(message), final=True)
-                            value = cast(RunYieldResume, await resume_queue.dequeue_event())
-                            resume_queue.task_done()
-                            continue
-                        case TaskStatus(state=TaskState.auth_required, message=message, timestamp=timestamp):
-                            await task_updater.requires_auth(message=with_context(message), final=True)
-                            value = cast(RunYieldResume, await resume_queue.dequeue_event())
-                            resume_queue.task_done()
-                            continue
-                        case TaskStatus(state=state, message=message, timestamp=timestamp):
-                            await task_updater.update_status(
-                                state=state, message=with_context(message), timestamp=timestamp
-                            )
-                        case TaskStatusUpdateEvent(
-                            status=TaskStatus(state=state, message=message, timestamp=timestamp),
-                            final=final,
-                            metadata=metadata,
-                        ):
-                            await task_updater.update_status(
-                                state=state,
-                                message=with_context(message),
-                                timestamp=timestamp,
-                                final=final,
-                                metadata=metadata,
-                            )
-                        case TaskArtifactUpdateEvent(
-                            artifact=Artifact(artifact_id=artifact_id, name=name, metadata=metadata, parts=parts),
-                            append=append,
-                            last_chunk=last_chunk,
-                        ):
-                            await task_updater.add_artifact(
-                                parts=parts,
-                                artifact_id=artifact_id,
-                                name=name,
-                                metadata=metadata,
-                                append=append,
-                                last_chunk=last_chunk,
-                            )
-                        case Metadata() as metadata:
-                            await task_updater.update_status(
-                                state=TaskState.working,
-                                message=task_updater.new_agent_message(parts=[], metadata=metadata),
-                            )
-                        case dict() as data:
-                            await task_updater.update_status(
-                                state=TaskState.working,
-                                message=task_updater.new_agent_message(parts=[Part(root=DataPart(data=data))]),
-                            )
-                        case Exception() as ex:
-                            raise ex
-                        case _:
-                            raise ValueError(f"Invalid value yielded from agent: {type(yielded_value)}")
-                    value = None
-        except StopAsyncIteration:
-            await task_updater.complete()
+                update_last_invocation()
+                await run_agent(_YieldHandler(task_updater, resume_queue, on_yield=update_last_invocation))
+                await task_updater.complete()
         except CancelledError:
             await task_updater.cancel()
         except Exception as ex:
@@ -488,6 +566,8 @@ class Executor(AgentExecutor):
 
             if current_status in {TaskState.input_required, TaskState.auth_required}:
                 await resume_queue.enqueue_event(context.message)
+                if context.task_id not in self._running_tasks:
+                    await close_queue(self._queue_manager, f"_resume_{context.task_id}", immediate=True)
             else:
                 task_updater = TaskUpdater(long_running_event_queue, context.task_id, context.context_id)
                 run_generator = self._run_agent_function(
@@ -506,12 +586,20 @@ class Executor(AgentExecutor):
 
             while True:
                 # Forward messages to local event queue
-                event = await long_running_event_queue.dequeue_event()
+                events = [await long_running_event_queue.dequeue_event()]
                 long_running_event_queue.task_done()
-                await event_queue.enqueue_event(event)
-                match event:
-                    case TaskStatusUpdateEvent(final=True):
-                        break
+                if self._coalesce_events:
+                    # events produced faster than they are forwarded are merged in a single batch
+                    for _ in range(long_running_event_queue.queue.qsize()):
+                        if _is_final(events[-1]):
+                            break
+                        events.append(await long_running_event_queue.dequeue_event(no_wait=True))
+                        long_running_event_queue.task_done()
+                    events = _coalesce_events(events)
+                for event in events:
+                    await event_queue.enqueue_event(event)
+                if _is_final(events[-1]):
+                    break
         except CancelledError:
             # Handles cancellation of this handler:
             # When a streaming request is canceled, this executor is canceled first meaning that "cancellation" event
@@ -524,10 +612,19 @@ class Executor(AgentExecutor):
             logger.error("Error executing agent", exc_info=ex)
             local_updater = TaskUpdater(event_queue, task_id=context.task_id, context_id=context.context_id)
             await local_updater.failed(local_updater.new_agent_message(parts=[Part(root=TextPart(text=str(ex)))]))
+        finally:
+            if self._distributed:
+                # the next request for this task may be handled by another replica, stop buffering its events here
+                await close_queue(self._queue_manager, f"_event_{context.task_id}", immediate=True)
 
     async def _cancel_task(self, task_id: str):
         if queue := self._cancel_queues.get(task_id):
             await queue.enqueue_event(create_text_message_object(content="canceled"))
+        elif self._distributed:
+            # the task may be running in another replica
+            queue = await self._queue_manager.create_or_tap(f"_cancel_{task_id}")
+            await queue.enqueue_event(create_text_message_object(content="canceled"))
+            await close_queue(self._queue_manager, f"_cancel_{task_id}", immediate=True)
 
     async def _schedule_run_cleanup(self, task_id: str, task_timeout: timedelta):
         task = self._running_tasks.get(task_id)
@@ -32,13 +32,20 @@ def create_app(
     dependencies: list[Depends] | None = None,  # pyright: ignore [reportGeneralTypeIssues]
     override_interfaces: bool = True,
     task_timeout: timedelta = timedelta(minutes=10),
+    coalesce_events: bool = False,
     **kwargs,
 ) -> FastAPI:
     queue_manager = queue_manager or InMemoryQueueManager()
     task_store = task_store or InMemoryTaskStore()
     context_store = context_store or InMemoryContextStore()
     http_handler = DefaultRequestHandler(
-        agent_executor=Executor(agent.execute, queue_manager, context_store=context_store, task_timeout=task_timeout),
+        agent_executor=Executor(
+            agent.execute,
+            queue_manager,
+            context_store=context_store,
+            task_timeout=task_timeout,
+            coalesce_events=coalesce_events,
+        ),
         task_store=task_store,
         queue_manager=queue_manager,
         push_config_store=push_config_store,
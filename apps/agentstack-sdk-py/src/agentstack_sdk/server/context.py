@@ -1,10 +1,10 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import TypeAlias
 
-from collections.abc import AsyncIterator
-
-import janus
 from a2a.server.context import ServerCallContext
 from a2a.server.tasks import TaskUpdater
 from a2a.types import Artifact, Message, MessageSendConfiguration, Task
@@ -13,6 +13,8 @@ from pydantic import BaseModel, PrivateAttr
 from agentstack_sdk.a2a.types import RunYield, RunYieldResume
 from agentstack_sdk.server.store.context_store import ContextStoreInstance
 
+YieldHandler: TypeAlias = Callable[[RunYield], Awaitable[RunYieldResume]]
+
 
 class RunContext(BaseModel, arbitrary_types_allowed=True):
     configuration: MessageSendConfiguration | None = None
@@ -24,8 +26,8 @@ class RunContext(BaseModel, arbitrary_types_allowed=True):
     call_context: ServerCallContext | None = None
 
     _store: ContextStoreInstance | None = PrivateAttr(None)
-    _yield_queue: janus.Queue[RunYield] = PrivateAttr(default_factory=janus.Queue)
-    _yield_resume_queue: janus.Queue[RunYieldResume] = PrivateAttr(default_factory=janus.Queue)
+    _yield_handler: YieldHandler | None = PrivateAttr(None)
+    _loop: asyncio.AbstractEventLoop | None = PrivateAttr(None)
 
     async def store(self, data: Message | Artifact):
         if not self._store:
@@ -41,13 +43,19 @@ class RunContext(BaseModel, arbitrary_types_allowed=True):
             yield item
 
     def yield_sync(self, value: RunYield) -> RunYieldResume:
-        self._yield_queue.sync_q.put(value)
-        return self._yield_resume_queue.sync_q.get()
+        """Yield from a synchronous agent, which runs in a worker thread."""
+        if not self._yield_handler or not self._loop:
+            raise RuntimeError("Agent is not running")
+        return asyncio.run_coroutine_threadsafe(self._yield_handler(value), self._loop).result()
 
     async def yield_async(self, value: RunYield) -> RunYieldResume:
-        await self._yield_queue.async_q.put(value)
-        return await self._yield_resume_queue.async_q.get()
+        if not self._yield_handler:
+            raise RuntimeError("Agent is not running")
+        return await self._yield_handler(value)
+
+    def start(self, yield_handler: YieldHandler) -> None:
+        self._yield_handler = yield_handler
+        self._loop = asyncio.get_running_loop()
 
     def shutdown(self) -> None:
-        self._yield_queue.shutdown()
-        self._yield_resume_queue.shutdown()
+        self._yield_handler = None
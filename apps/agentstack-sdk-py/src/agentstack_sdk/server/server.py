@@ -37,6 +37,7 @@ from agentstack_sdk.platform.provider import Provider
 from agentstack_sdk.server.agent import Agent, AgentFactory
 from agentstack_sdk.server.agent import agent as agent_decorator
 from agentstack_sdk.server.store.context_store import ContextStore
+from agentstack_sdk.server.store.distributed_queue_manager import DistributedQueueManager
 from agentstack_sdk.server.store.memory_context_store import InMemoryContextStore
 from agentstack_sdk.server.telemetry import configure_telemetry as configure_telemetry_func
 from agentstack_sdk.server.utils import cancel_task
@@ -78,6 +79,7 @@ class Server:
         context_store: ContextStore | None = None,
         queue_manager: QueueManager | None = None,
         task_timeout: timedelta = timedelta(minutes=10),
+        coalesce_events: bool = False,
         push_config_store: PushNotificationConfigStore | None = None,
         push_sender: PushNotificationSender | None = None,
         request_context_builder: RequestContextBuilder | None = None,
@@ -158,7 +160,10 @@ class Server:
 
         @asynccontextmanager
         async def _lifespan_fn(app: FastAPI) -> AsyncGenerator[None, None]:
-            async with self._self_registration_client or nullcontext():
+            async with (
+                self._self_registration_client or nullcontext(),
+                queue_manager if isinstance(queue_manager, DistributedQueueManager) else nullcontext(),
+            ):
                 register_task = asyncio.create_task(self._register_agent()) if self_registration else None
                 reload_task = asyncio.create_task(self._reload_variables_periodically()) if self_registration else None
 
@@ -194,6 +199,7 @@ class Server:
             push_config_store=push_config_store,
             push_sender=push_sender,
             task_timeout=task_timeout,
+            coalesce_events=coalesce_events,
             request_context_builder=request_context_builder,
         )
 
@@ -0,0 +1,97 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Self
+
+from a2a.server.events import Event, EventQueue, InMemoryQueueManager
+from pydantic import TypeAdapter
+
+from agentstack_sdk.server.store.event_broker import EventBroker
+
+_event_adapter: TypeAdapter[Event] = TypeAdapter(Event)
+
+
+class _DistributedEventQueue(EventQueue):
+    """Queue whose events are published through the broker and received back by every replica holding the queue."""
+
+    def __init__(self, name: str, broker: EventBroker):
+        super().__init__()
+        # the broker delivers events without backpressure, buffer all of them for slow readers instead of dropping
+        self.queue = asyncio.Queue()
+        self._name = name
+        self._broker = broker
+
+    async def enqueue_event(self, event: Event) -> None:
+        # publish even if closed locally, the queue may still be read by another replica
+        await self._broker.publish(self._name, _event_adapter.dump_json(event).decode())
+
+    def receive(self, event: Event) -> None:
+        """Buffer an event delivered by the broker, without blocking the delivery of other events."""
+        if self.is_closed():
+            return
+        self.queue.put_nowait(event)
+        for child in self._children:
+            if isinstance(child, _DistributedEventQueue):
+                child.receive(event)
+
+    def tap(self) -> EventQueue:
+        queue = _DistributedEventQueue(self._name, self._broker)
+        self._children.append(queue)
+        return queue
+
+
+class DistributedQueueManager(InMemoryQueueManager):
+    """
+    Queue manager sharing the agent executor queues between replicas.
+
+    Queues the executor uses to resume, cancel and follow a running agent are distributed through the broker, so any
+    replica can continue a task started by another one. Use together with a shared task store, for example a2a
+    `DatabaseTaskStore`. Agent runs themselves are not persisted and end with the replica that started them.
+    Other queues stay local to the replica as in `InMemoryQueueManager`.
+    """
+
+    def __init__(self, broker: EventBroker):
+        super().__init__()
+        self._broker = broker
+        self._subscribed = False
+        self._subscribe_lock = asyncio.Lock()
+
+    @staticmethod
+    def _is_distributed(task_id: str) -> bool:
+        return task_id.startswith(("_event_", "_resume_", "_cancel_"))
+
+    async def __aenter__(self) -> Self:
+        await self._subscribe()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        async with self._subscribe_lock:
+            if self._subscribed:
+                await self._broker.unsubscribe(self._receive)
+                self._subscribed = False
+
+    async def _subscribe(self) -> None:
+        async with self._subscribe_lock:
+            if not self._subscribed:
+                await self._broker.subscribe(self._receive)
+                self._subscribed = True
+
+    async def _receive(self, task_id: str, data: str) -> None:
+        if isinstance(queue := self._task_queue.get(task_id), _DistributedEventQueue):
+            queue.receive(_event_adapter.validate_json(data))
+
+    async def create_or_tap(self, task_id: str) -> EventQueue:
+        if not self._is_distributed(task_id):
+            return await super().create_or_tap(task_id)
+        await self._subscribe()
+        async with self._lock:
+            if task_id not in self._task_queue:
+                self._task_queue[task_id] = _DistributedEventQueue(task_id, self._broker)
+                return self._task_queue[task_id]
+            return self._task_queue[task_id].tap()
+
+    async def add(self, task_id: str, queue: EventQueue) -> None:
+        if self._is_distributed(task_id) and not isinstance(queue, _DistributedEventQueue):
+            raise ValueError(f"Queue {task_id} must be created by the queue manager")
+        await super().add(task_id, queue)
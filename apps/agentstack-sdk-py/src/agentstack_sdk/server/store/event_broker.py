@@ -0,0 +1,42 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import abc
+from collections.abc import Awaitable, Callable
+
+EventHandler = Callable[[str, str], Awaitable[None]]
+
+
+class EventBroker(abc.ABC):
+    """Publish/subscribe channel shared by all replicas of an agent."""
+
+    @abc.abstractmethod
+    async def publish(self, queue_name: str, data: str) -> None:
+        """Deliver serialized event to every subscriber, including the ones in this process."""
+
+    @abc.abstractmethod
+    async def subscribe(self, handler: EventHandler) -> None: ...
+
+    @abc.abstractmethod
+    async def unsubscribe(self, handler: EventHandler) -> None: ...
+
+
+class InMemoryEventBroker(EventBroker):
+    """
+    In-process broker, a stand-in for a shared broker when testing.
+
+    Several queue managers sharing one instance behave like replicas connected to the same database.
+    """
+
+    def __init__(self):
+        self._handlers: list[EventHandler] = []
+
+    async def publish(self, queue_name: str, data: str) -> None:
+        for handler in self._handlers.copy():
+            await handler(queue_name, data)
+
+    async def subscribe(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+
+    async def unsubscribe(self, handler: EventHandler) -> None:
+        self._handlers.remove(handler)
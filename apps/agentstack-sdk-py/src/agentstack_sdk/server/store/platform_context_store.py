@@ -2,8 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from uuid import UUID
 
+import httpx
 from a2a.types import Artifact, Message
+from cachetools import TTLCache
 
 from agentstack_sdk.a2a.extensions.services.platform import (
     PlatformApiExtensionServer,
@@ -15,7 +20,28 @@ from agentstack_sdk.server.dependencies import Dependency, Depends
 from agentstack_sdk.server.store.context_store import ContextStore, ContextStoreInstance
 
 
+@dataclass
+class _CachedHistory:
+    items: list[Message | Artifact] = field(default_factory=list)
+    last_item_id: UUID | None = None
+
+
 class PlatformContextStore(ContextStore):
+    def __init__(self, max_cached_contexts: int = 1000, cache_ttl: timedelta = timedelta(hours=1)):
+        """
+        Initialize platform context store.
+
+        History already read from the platform is kept in memory, so each load only fetches items newer than the last
+        one seen. The platform is still queried on every load, which also checks that the caller may read the context.
+
+        Args:
+            max_cached_contexts: Maximum number of context histories to keep in memory
+            cache_ttl: Time-to-live for a cached context history (default: 1 hour)
+        """
+        self._history_cache: TTLCache[str, _CachedHistory] = TTLCache(
+            maxsize=max_cached_contexts, ttl=cache_ttl.total_seconds()
+        )
+
     def modify_dependencies(self, dependencies: dict[str, Depends]) -> None:
         for dependency in dependencies.values():
             if dependency.extension is None:
@@ -30,18 +56,44 @@ class PlatformContextStore(ContextStore):
 
     async def create(self, context_id: str, initialized_dependencies: list[Dependency]) -> ContextStoreInstance:
         [platform_ext] = [d for d in initialized_dependencies if isinstance(d, PlatformApiExtensionServer)]
-        return PlatformContextStoreInstance(context_id=context_id, platform_extension=platform_ext)
+        return PlatformContextStoreInstance(
+            context_id=context_id, platform_extension=platform_ext, history_cache=self._history_cache
+        )
 
 
 class PlatformContextStoreInstance(ContextStoreInstance):
-    def __init__(self, context_id: str, platform_extension: PlatformApiExtensionServer):
+    def __init__(
+        self,
+        context_id: str,
+        platform_extension: PlatformApiExtensionServer,
+        history_cache: TTLCache[str, _CachedHistory] | None = None,
+    ):
         self._context_id = context_id
         self._platform_extension = platform_extension
+        self._history_cache = history_cache if history_cache is not None else {}
 
-    async def load_history(self) -> AsyncIterator[Message | Artifact]:
+    async def _fetch_new_items(self, cached: _CachedHistory) -> _CachedHistory:
+        # Build a new entry rather than appending in place, concurrent loads of the same context share the cache
+        updated = _CachedHistory(items=cached.items.copy(), last_item_id=cached.last_item_id)
         async with self._platform_extension.use_client():
-            async for history_item in Context.list_all_history(self._context_id):
-                yield history_item.data
+            async for history_item in Context.stream_history(self._context_id, after=cached.last_item_id):
+                updated.items.append(history_item.data)
+                updated.last_item_id = history_item.id
+        return updated
+
+    async def load_history(self) -> AsyncIterator[Message | Artifact]:
+        cached = self._history_cache.get(self._context_id) or _CachedHistory()
+        try:
+            cached = await self._fetch_new_items(cached)
+        except httpx.HTTPStatusError as ex:
+            if cached.last_item_id is None or ex.response.status_code != 404:
+                raise
+            # The cursor item no longer exists (e.g. the history was rewritten), fetch everything again
+            cached = await self._fetch_new_items(_CachedHistory())
+        self._history_cache[self._context_id] = cached
+
+        for item in cached.items:
+            yield item.model_copy(deep=True)
 
     async def store(self, data: Message | Artifact) -> None:
         async with self._platform_extension.use_client():
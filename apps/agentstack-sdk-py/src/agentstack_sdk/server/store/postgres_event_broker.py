@@ -0,0 +1,171 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import time
+from contextlib import suppress
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+from agentstack_sdk.server.store.event_broker import EventBroker, EventHandler
+from agentstack_sdk.server.utils import cancel_task
+
+if TYPE_CHECKING:
+    import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_MAX_NOTIFY_PAYLOAD = 7900
+
+
+class PostgresEventBroker(EventBroker):
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "agentstack_queue_events",
+        table: str = "agentstack_queue_events",
+        retention: timedelta = timedelta(hours=1),
+    ):
+        """
+        Broker using Postgres LISTEN/NOTIFY, requires the `postgresql` extra (`pip install 'agentstack-sdk[postgresql]'`).
+
+        Small events are sent in the notification payload, larger events are stored in a table and only their id is
+        notified. Stored events are deleted after the retention period. Events published while the listening
+        connection is being re-established are not delivered. The table is created by `setup()`, call it once before
+        the broker is used (for example when deploying the agent).
+
+        Args:
+            dsn: Postgres connection string
+            channel: Name of the notification channel
+            table: Name of the table holding events too large for a notification
+            retention: How long large events are kept in the table
+        """
+        try:
+            import asyncpg  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "PostgresEventBroker requires asyncpg. Install it with: 'pip install agentstack-sdk[postgresql]'"
+            ) from e
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", table) or not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError("Channel and table names must be lowercase identifiers")
+
+        self._dsn = dsn
+        self._channel = channel
+        self._table = table
+        self._retention = retention
+        self._handlers: list[EventHandler] = []
+        self._connection: asyncpg.Connection | None = None
+        self._connection_lock = asyncio.Lock()
+        # large events are fetched over a separate connection so that dispatching does not hold up publishing
+        self._read_connection: asyncpg.Connection | None = None
+        self._notifications: asyncio.Queue[str] = asyncio.Queue()
+        self._listen_task: asyncio.Task | None = None
+        self._dispatch_task: asyncio.Task | None = None
+        self._last_cleanup = 0.0
+
+    async def setup(self) -> None:
+        """Create the table for large events if it does not exist."""
+        import asyncpg
+
+        connection = await asyncpg.connect(self._dsn)
+        try:
+            await connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} ("
+                "id BIGSERIAL PRIMARY KEY, data TEXT NOT NULL, created_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        finally:
+            await connection.close()
+
+    async def _reconnect(self, connection: asyncpg.Connection | None) -> asyncpg.Connection:
+        import asyncpg
+
+        if connection is None or connection.is_closed():
+            connection = await asyncpg.connect(self._dsn)
+        return connection
+
+    async def publish(self, queue_name: str, data: str) -> None:
+        payload = json.dumps({"queue": queue_name, "data": data})
+        # publishing over a single connection keeps events from this replica in order
+        async with self._connection_lock:
+            self._connection = connection = await self._reconnect(self._connection)
+            if len(payload.encode()) <= _MAX_NOTIFY_PAYLOAD:
+                await connection.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+            else:
+                async with connection.transaction():
+                    event_id = await connection.fetchval(
+                        f"INSERT INTO {self._table} (data) VALUES ($1) RETURNING id", payload
+                    )
+                    await connection.execute("SELECT pg_notify($1, $2)", self._channel, f"@{event_id}")
+            if time.monotonic() - self._last_cleanup > self._retention.total_seconds() / 10:
+                self._last_cleanup = time.monotonic()
+                await connection.execute(
+                    f"DELETE FROM {self._table} WHERE created_at < now() - $1::interval", self._retention
+                )
+
+    async def subscribe(self, handler: EventHandler) -> None:
+        self._handlers.append(handler)
+        if not self._listen_task:
+            self._listen_task = asyncio.create_task(self._listen())
+            self._dispatch_task = asyncio.create_task(self._dispatch())
+
+    async def unsubscribe(self, handler: EventHandler) -> None:
+        self._handlers.remove(handler)
+        if self._handlers:
+            return
+        for task in (self._listen_task, self._dispatch_task):
+            if task:
+                await cancel_task(task)
+        self._listen_task = self._dispatch_task = None
+        if self._read_connection:
+            await self._read_connection.close()
+            self._read_connection = None
+        async with self._connection_lock:
+            if self._connection:
+                await self._connection.close()
+                self._connection = None
+
+    def _on_notification(self, _connection: Any, _pid: int, _channel: str, payload: str) -> None:
+        self._notifications.put_nowait(payload)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        while True:
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                try:
+                    terminated = asyncio.Event()
+                    connection.add_termination_listener(lambda _, terminated=terminated: terminated.set())
+                    await connection.add_listener(self._channel, self._on_notification)
+                    await terminated.wait()
+                finally:
+                    with suppress(Exception):
+                        await connection.close()
+            except Exception as ex:
+                logger.warning(f"Listening for queue events failed, reconnecting: {ex}")
+            await asyncio.sleep(1)
+
+    async def _dispatch(self) -> None:
+        # notifications are dispatched one by one so that fetching a large event does not reorder the queue
+        while True:
+            payload = await self._notifications.get()
+            try:
+                if payload.startswith("@"):
+                    self._read_connection = connection = await self._reconnect(self._read_connection)
+                    payload = await connection.fetchval(
+                        f"SELECT data FROM {self._table} WHERE id = $1", int(payload[1:])
+                    )
+                    if payload is None:
+                        logger.warning("Queue event expired before it was delivered")
+                        continue
+                message = json.loads(payload)
+                for handler in self._handlers.copy():
+                    await handler(message["queue"], message["data"])
+            except Exception as ex:
+                logger.error("Error when dispatching queue event", exc_info=ex)
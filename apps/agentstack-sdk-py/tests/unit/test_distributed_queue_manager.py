@@ -0,0 +1,119 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from a2a.client import create_text_message_object
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import Message, MessageSendParams, Task, TaskState, TaskStatus, TaskStatusUpdateEvent
+
+from agentstack_sdk.a2a.types import AgentMessage, InputRequired
+from agentstack_sdk.server.agent import Executor
+from agentstack_sdk.server.store.distributed_queue_manager import DistributedQueueManager
+from agentstack_sdk.server.store.event_broker import InMemoryEventBroker
+from agentstack_sdk.server.store.memory_context_store import InMemoryContextStore
+
+
+def _executors(execute_fn) -> tuple[Executor, Executor]:
+    broker = InMemoryEventBroker()
+    executor_a, executor_b = (
+        Executor(
+            execute_fn,
+            DistributedQueueManager(broker),
+            context_store=InMemoryContextStore(),
+            task_timeout=timedelta(minutes=1),
+        )
+        for _ in range(2)
+    )
+    return executor_a, executor_b
+
+
+def _request(text: str, task: Task | None = None) -> RequestContext:
+    message = create_text_message_object(content=text)
+    return RequestContext(request=MessageSendParams(message=message), task_id="task", context_id="context", task=task)
+
+
+def _drain(queue: EventQueue) -> list:
+    return [queue.queue.get_nowait() for _ in range(queue.queue.qsize())]
+
+
+@pytest.mark.unit
+async def test_executor_queues_are_shared_between_replicas() -> None:
+    broker = InMemoryEventBroker()
+    replica_a, replica_b = DistributedQueueManager(broker), DistributedQueueManager(broker)
+
+    reader = await replica_a.create_or_tap("_resume_task")
+    writer = await replica_b.create_or_tap("_resume_task")
+    await writer.enqueue_event(create_text_message_object(content="resume"))
+
+    assert (await reader.dequeue_event(no_wait=True)).parts[0].root.text == "resume"  # pyright: ignore
+    assert await replica_a.get("task") is None
+    await replica_b.create_or_tap("task")
+    assert await replica_a.get("task") is None
+
+
+@pytest.mark.unit
+async def test_events_are_not_dropped_for_slow_readers() -> None:
+    broker = InMemoryEventBroker()
+    replica_a, replica_b = DistributedQueueManager(broker), DistributedQueueManager(broker)
+
+    reader = await replica_a.create_or_tap("_event_task")
+    writer = await replica_b.create_or_tap("_event_task")
+    for i in range(2000):
+        await writer.enqueue_event(create_text_message_object(content=str(i)))
+
+    assert [event.parts[0].root.text for event in _drain(reader)] == [str(i) for i in range(2000)]  # pyright: ignore
+
+
+@pytest.mark.unit
+async def test_task_is_cancelled_from_another_replica() -> None:
+    started = asyncio.Event()
+
+    @asynccontextmanager
+    async def execute_fn(task_updater, context, context_store):
+        async def run_agent(yield_handler) -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        yield run_agent, None
+
+    executor_a, executor_b = _executors(execute_fn)
+    context = _request("hi")
+    event_queue = EventQueue()
+
+    execution = asyncio.create_task(executor_a.execute(context, event_queue))
+    await asyncio.wait_for(started.wait(), timeout=1)
+    await executor_b._cancel_task("task")
+    await asyncio.wait_for(execution, timeout=1)
+
+    events = _drain(event_queue)
+    assert isinstance(events[-1], TaskStatusUpdateEvent)
+    assert events[-1].status.state == TaskState.canceled
+
+
+@pytest.mark.unit
+async def test_task_is_resumed_on_another_replica() -> None:
+    @asynccontextmanager
+    async def execute_fn(task_updater, context, context_store):
+        async def run_agent(yield_handler) -> None:
+            answer: Message = await yield_handler(InputRequired(text="name?"))
+            await yield_handler(AgentMessage(text=f"hello {answer.parts[0].root.text}"))  # pyright: ignore
+
+        yield run_agent, None
+
+    executor_a, executor_b = _executors(execute_fn)
+
+    first_queue, second_queue = EventQueue(), EventQueue()
+    await asyncio.wait_for(executor_a.execute(_request("hi"), first_queue), timeout=1)
+    assert _drain(first_queue)[-1].status.state == TaskState.input_required
+
+    paused_task = Task(id="task", context_id="context", status=TaskStatus(state=TaskState.input_required))
+    await asyncio.wait_for(executor_b.execute(_request("bob", task=paused_task), second_queue), timeout=1)
+
+    *_, reply, completed = _drain(second_queue)
+    assert reply.status.message.parts[0].root.text == "hello bob"
+    assert completed.status.state == TaskState.completed
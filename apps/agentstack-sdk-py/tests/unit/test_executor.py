@@ -0,0 +1,92 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import (
+    Artifact,
+    Part,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from agentstack_sdk.a2a.types import AgentMessage, InputRequired, Metadata
+from agentstack_sdk.server.agent import _coalesce_events, _yield_handler_for, _YieldHandler
+
+
+def _text_status(text: str, final: bool = False, state: TaskState = TaskState.working) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        task_id="task",
+        context_id="context",
+        final=final,
+        status=TaskStatus(state=state, message=AgentMessage(text=text)),
+    )
+
+
+def _artifact_chunk(text: str, append: bool, last_chunk: bool = False) -> TaskArtifactUpdateEvent:
+    return TaskArtifactUpdateEvent(
+        task_id="task",
+        context_id="context",
+        append=append,
+        last_chunk=last_chunk,
+        artifact=Artifact(artifact_id="artifact", name="file.txt", parts=[Part(root=TextPart(text=text))]),
+    )
+
+
+@pytest.mark.unit
+def test_yield_handler_dispatch_follows_subclasses() -> None:
+    assert _yield_handler_for(Metadata) is _YieldHandler.metadata
+    assert _yield_handler_for(dict) is _YieldHandler.data
+    assert _yield_handler_for(AgentMessage) is _YieldHandler.message
+    assert _yield_handler_for(InputRequired) is _YieldHandler.status
+    assert _yield_handler_for(KeyError) is _YieldHandler.exception
+    assert _yield_handler_for(int) is _YieldHandler.invalid
+
+
+@pytest.mark.unit
+async def test_yield_handler_streams_artifact_chunks() -> None:
+    queue = EventQueue()
+    handler = _YieldHandler(TaskUpdater(queue, "task", "context"), EventQueue(), on_yield=lambda: None)
+    for text in ["a", "b"]:
+        await handler(Artifact(artifact_id="artifact", parts=[Part(root=TextPart(text=text))]))
+
+    events = [await queue.dequeue_event(no_wait=True) for _ in range(2)]
+    assert [(event.append, event.last_chunk) for event in events] == [(False, True), (False, True)]  # pyright: ignore
+
+
+@pytest.mark.unit
+def test_consecutive_text_and_artifact_chunks_are_coalesced() -> None:
+    events = [
+        _text_status("Hel"),
+        _text_status("lo"),
+        _artifact_chunk("first ", append=False),
+        _artifact_chunk("second ", append=True),
+        _artifact_chunk("last", append=True, last_chunk=True),
+        _artifact_chunk("new", append=True),
+        _text_status("done", final=True, state=TaskState.completed),
+    ]
+
+    coalesced = _coalesce_events(events)
+
+    assert len(coalesced) == 4
+    text_status, artifact, new_artifact, final = coalesced
+    assert isinstance(text_status, TaskStatusUpdateEvent) and text_status.status.message
+    assert [part.root.text for part in text_status.status.message.parts] == ["Hello"]  # pyright: ignore
+    assert isinstance(artifact, TaskArtifactUpdateEvent)
+    assert [part.root.text for part in artifact.artifact.parts] == ["first second last"]  # pyright: ignore
+    assert artifact.append is False and artifact.last_chunk is True
+    assert new_artifact is events[5]
+    assert final is events[6]
+
+
+@pytest.mark.unit
+def test_status_with_metadata_is_not_coalesced() -> None:
+    with_metadata = _text_status("b")
+    assert with_metadata.status.message
+    with_metadata.status.message.metadata = {"key": "value"}
+
+    assert len(_coalesce_events([_text_status("a"), with_metadata])) == 2
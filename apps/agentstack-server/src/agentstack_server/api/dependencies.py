@@ -23,7 +23,7 @@ from agentstack_server.domain.models.permissions import AuthorizedUser, Permissi
 from agentstack_server.domain.models.user import UserRole
 from agentstack_server.exceptions import EntityNotFoundError
 from agentstack_server.service_layer.services.a2a import A2AProxyService
-from agentstack_server.service_layer.services.auth import AuthService
+from agentstack_server.service_layer.services.auth import AuthorizedUserCache, AuthService
 from agentstack_server.service_layer.services.configurations import ConfigurationService
 from agentstack_server.service_layer.services.connector import ConnectorService
 from agentstack_server.service_layer.services.contexts import ContextService
@@ -48,15 +48,33 @@ UserServiceDependency = Annotated[UserService, Depends(lambda: di[UserService])]
 VectorStoreServiceDependency = Annotated[VectorStoreService, Depends(lambda: di[VectorStoreService])]
 UserFeedbackServiceDependency = Annotated[UserFeedbackService, Depends(lambda: di[UserFeedbackService])]
 AuthServiceDependency = Annotated[AuthService, Depends(lambda: di[AuthService])]
+AuthorizedUserCacheDependency = Annotated[AuthorizedUserCache, Depends(lambda: di[AuthorizedUserCache])]
 ModelProviderServiceDependency = Annotated[ModelProviderService, Depends(lambda: di[ModelProviderService])]
 ConnectorServiceDependency = Annotated[ConnectorService, Depends(lambda: di[ConnectorService])]
 
 logger = logging.getLogger(__name__)
 
 
+async def authorized_user_by_email(
+    email: str, user_service: UserService, user_cache: AuthorizedUserCache
+) -> AuthorizedUser:
+    cache_key = user_cache.key("email", email)
+    if authorized := user_cache.get(cache_key):
+        return authorized
+    user = await user_service.get_user_by_email(email)
+    authorized = AuthorizedUser(
+        user=user,
+        global_permissions=ROLE_PERMISSIONS[user.role],
+        context_permissions=ROLE_PERMISSIONS[user.role],
+    )
+    user_cache.set(cache_key, authorized)
+    return authorized
+
+
 async def authenticate_oauth_user(
     bearer_auth: HTTPAuthorizationCredentials,
     user_service: UserServiceDependency,
+    user_cache: AuthorizedUserCacheDependency,
     configuration: ConfigurationDependency,
     request: Request,
 ) -> AuthorizedUser:
@@ -76,6 +94,10 @@ async def authenticate_oauth_user(
         create_resource_uri(request.url.replace(path="/")) if configuration.auth.oidc.validate_audience else None
     )
 
+    cache_key = user_cache.key("oidc", expected_audience or "", token)
+    if authorized := user_cache.get(cache_key):
+        return authorized
+
     try:
         claims, provider = await validate_oauth_access_token(
             token=token, aud=expected_audience, configuration=configuration
@@ -83,6 +105,8 @@ async def authenticate_oauth_user(
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token validation failed") from e
 
+    expires_at = claims.get("exp") if claims else None
+
     try:
         claims = (
             claims
@@ -104,15 +128,18 @@ async def authenticate_oauth_user(
         role = UserRole.ADMIN if is_admin else configuration.auth.oidc.default_new_user_role
         user = await user_service.create_user(email=email, role=role)
 
-    return AuthorizedUser(
+    authorized = AuthorizedUser(
         user=user,
         global_permissions=ROLE_PERMISSIONS[user.role],
         context_permissions=ROLE_PERMISSIONS[user.role],
     )
+    user_cache.set(cache_key, authorized, expires_at=expires_at)
+    return authorized
 
 
 async def authorized_user(
     user_service: UserServiceDependency,
+    user_cache: AuthorizedUserCacheDependency,
     configuration: ConfigurationDependency,
     basic_auth: Annotated[HTTPBasicCredentials | None, Depends(HTTPBasic(auto_error=False))],
     bearer_auth: Annotated[HTTPAuthorizationCredentials | None, Depends(HTTPBearer(auto_error=False))],
@@ -121,6 +148,9 @@ async def authorized_user(
     if bearer_auth:
         # Check Bearer token first - locally this allows for "checking permissions" for development purposes
         # even if auth is disabled (requests that would pass with no header may not pass with context token header)
+        cache_key = user_cache.key("internal", bearer_auth.credentials)
+        if authorized := user_cache.get(cache_key):
+            return authorized
         try:
             parsed_token = verify_internal_jwt(bearer_auth.credentials, configuration=configuration)
             user = await user_service.get_user(parsed_token.user_id)
@@ -130,42 +160,28 @@ async def authorized_user(
                 context_permissions=parsed_token.context_permissions,
                 token_context_id=parsed_token.context_id,
             )
+            user_cache.set(cache_key, token, expires_at=parsed_token.raw["exp"])
             return token
         except Exception:
             if configuration.auth.oidc.enabled:
-                return await authenticate_oauth_user(bearer_auth, user_service, configuration, request)
+                return await authenticate_oauth_user(bearer_auth, user_service, user_cache, configuration, request)
             # TODO: update agents
             logger.warning("Bearer token is invalid, agent is not probably not using llm extension correctly")
 
     if configuration.auth.oidc.enabled:
         if not bearer_auth:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bearer token not found")
-        return await authenticate_oauth_user(bearer_auth, user_service, configuration, request)
+        return await authenticate_oauth_user(bearer_auth, user_service, user_cache, configuration, request)
 
     if configuration.auth.basic.enabled:
         assert configuration.auth.basic.admin_password is not None
         if basic_auth and basic_auth.password == configuration.auth.basic.admin_password.get_secret_value():
-            user = await user_service.get_user_by_email("admin@beeai.dev")
-            return AuthorizedUser(
-                user=user,
-                global_permissions=ROLE_PERMISSIONS[user.role],
-                context_permissions=ROLE_PERMISSIONS[user.role],
-            )
+            return await authorized_user_by_email("admin@beeai.dev", user_service, user_cache)
         else:
-            user = await user_service.get_user_by_email("user@beeai.dev")
-            return AuthorizedUser(
-                user=user,
-                global_permissions=ROLE_PERMISSIONS[user.role],
-                context_permissions=ROLE_PERMISSIONS[user.role],
-            )
+            return await authorized_user_by_email("user@beeai.dev", user_service, user_cache)
 
     if configuration.auth.disable_auth:
-        user = await user_service.get_user_by_email("admin@beeai.dev")
-        return AuthorizedUser(
-            user=user,
-            global_permissions=ROLE_PERMISSIONS[user.role],
-            context_permissions=ROLE_PERMISSIONS[user.role],
-        )
+        return await authorized_user_by_email("admin@beeai.dev", user_service, user_cache)
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
 
@@ -2,11 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
 from uuid import UUID
 
 import fastapi
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
 from agentstack_server.api.auth.auth import issue_internal_jwt
 from agentstack_server.api.dependencies import (
@@ -15,7 +17,7 @@ from agentstack_server.api.dependencies import (
     RequiresContextPermissionsPath,
     RequiresPermissions,
 )
-from agentstack_server.api.schema.common import EntityModel, PaginationQuery
+from agentstack_server.api.schema.common import NDJSON_MEDIA_TYPE, EntityModel, PaginationQuery
 from agentstack_server.api.schema.contexts import (
     ContextCreateRequest,
     ContextHistoryItemCreateRequest,
@@ -143,6 +145,30 @@ async def add_context_history_item(
     await context_service.add_history_item(context_id=context_id, data=history_item_data.root, user=user.user)
 
 
+@router.get(
+    "/{context_id}/history/stream",
+    response_class=StreamingResponse,
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def stream_context_history(
+    context_id: UUID,
+    context_service: ContextServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissionsPath(context_data={"read"}))],
+    after: Annotated[UUID | None, Query(description="Return only items newer than this history item")] = None,
+) -> StreamingResponse:
+    """
+    Stream the whole history (or the part newer than the `after` item) as newline delimited JSON in chronological
+    order. Clients keeping a local copy of the history pass the id of the last item they have seen.
+    """
+    history = await context_service.stream_history(context_id=context_id, user=user.user, after=after)
+
+    async def ndjson() -> AsyncIterator[str]:
+        async for item in history:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(ndjson(), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/{context_id}/history")
 async def list_context_history(
     context_id: UUID,
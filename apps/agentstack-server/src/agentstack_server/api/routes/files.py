@@ -2,26 +2,33 @@
 # SPDX-License-Identifier: Apache-2.0
 import logging
 from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Annotated
 from uuid import UUID
 
 import fastapi
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from agentstack_server.api.dependencies import (
     FileServiceDependency,
     RequiresContextPermissions,
 )
 from agentstack_server.api.schema.common import EntityModel
-from agentstack_server.domain.models.file import AsyncFile, ExtractionStatus, File, TextExtraction
+from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.file import AsyncFile, ExtractionStatus, File, FileReadOptions, TextExtraction
 from agentstack_server.domain.models.permissions import AuthorizedUser
+from agentstack_server.exceptions import FileReadConditionError
 from agentstack_server.service_layer.services.files import FileService
+from agentstack_server.utils.utils import filter_dict
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_FILE_IDS = 100
+
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def upload_file(
@@ -40,6 +47,17 @@ async def upload_file(
     )
 
 
+@router.get("")
+async def list_files(
+    file_service: FileServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(files={"read"}))],
+    ids: Annotated[list[UUID], Query(min_length=1, max_length=MAX_FILE_IDS)],
+) -> PaginatedResult[File]:
+    """Get metadata of multiple files at once. Files that do not exist or are not accessible are omitted."""
+    files = await file_service.get_many(file_ids=ids, user=user.user, context_id=user.context_id)
+    return PaginatedResult(items=list(files), total_count=len(files))
+
+
 @router.get("/{file_id}")
 async def get_file(
     file_id: UUID,
@@ -49,44 +67,118 @@ async def get_file(
     return EntityModel(await file_service.get(file_id=file_id, user=user.user, context_id=user.context_id))
 
 
-async def _stream_file(*, file_service: FileService, user: AuthorizedUser, file_id: UUID) -> StreamingResponse:
-    exit_stack = AsyncExitStack()
-    file = await exit_stack.enter_async_context(
-        file_service.get_content(file_id=file_id, user=user.user, context_id=user.context_id)
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None  # invalid dates are ignored as per RFC 9110
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _read_options(request: Request) -> FileReadOptions:
+    headers = request.headers
+    byte_range = headers.get("range")
+    return FileReadOptions(
+        range=byte_range if byte_range and byte_range.startswith("bytes=") else None,
+        if_match=headers.get("if-match"),
+        if_none_match=headers.get("if-none-match"),
+        if_modified_since=_parse_http_date(headers.get("if-modified-since")),
+        if_unmodified_since=_parse_http_date(headers.get("if-unmodified-since")),
     )
 
-    async def iter_file(chunk_size=8192):
+
+async def _stream_file(
+    *, file_service: FileService, user: AuthorizedUser, file_id: UUID, request: Request, redirect: bool = False
+) -> Response:
+    if redirect:
+        url = await file_service.get_content_url(file_id=file_id, user=user.user, context_id=user.context_id)
+        return RedirectResponse(str(url), status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    exit_stack = AsyncExitStack()
+    try:
+        file = await exit_stack.enter_async_context(
+            file_service.get_content(
+                file_id=file_id, user=user.user, context_id=user.context_id, options=_read_options(request)
+            )
+        )
+    except FileReadConditionError as e:
+        if e.status_code != status.HTTP_304_NOT_MODIFIED:
+            raise
+        # A 304 must carry the validators a 200 would have sent (RFC 9110)
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=filter_dict({"ETag": e.etag, "Last-Modified": e.last_modified}),
+        )
+
+    async def iter_file():
+        # Start small for a fast first byte, then grow to keep the per-chunk overhead low on large files
+        chunk_size = MIN_CHUNK_SIZE
         try:
             while chunk := await file.read(chunk_size):
                 yield chunk
+                chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
         finally:
             await exit_stack.aclose()
 
-    return StreamingResponse(content=iter_file(), media_type=file.content_type)
+    headers = filter_dict(
+        {
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(file.size) if file.size is not None else None,
+            "Content-Range": file.content_range,
+            "ETag": file.etag,
+            "Last-Modified": format_datetime(file.last_modified, usegmt=True) if file.last_modified else None,
+        }
+    )
+    return StreamingResponse(
+        content=iter_file(),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if file.content_range else status.HTTP_200_OK,
+        media_type=file.content_type,
+        headers=headers,
+    )
 
 
 @router.get("/{file_id}/content")
 async def get_file_content(
     file_id: UUID,
+    request: Request,
     file_service: FileServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(files={"read"}))],
-) -> StreamingResponse:
-    return await _stream_file(file_service=file_service, user=user, file_id=file_id)
+    redirect: Annotated[bool, Query(description="Redirect to a presigned object storage URL")] = False,
+) -> Response:
+    """
+    Download the file content. Supports Range requests and conditional requests (ETag, Last-Modified); with
+    `redirect=true` the client is redirected to the object storage which must then be reachable by the client.
+    """
+    return await _stream_file(file_service=file_service, user=user, file_id=file_id, request=request, redirect=redirect)
 
 
 @router.get("/{file_id}/text_content")
 async def get_text_file_content(
     file_id: UUID,
+    request: Request,
     file_service: FileServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(files={"read"}))],
-) -> StreamingResponse:
+    redirect: Annotated[bool, Query(description="Redirect to a presigned object storage URL")] = False,
+) -> Response:
     extraction = await file_service.get_extraction(file_id=file_id, user=user.user, context_id=user.context_id)
     if not extraction.status == ExtractionStatus.COMPLETED or not extraction.extracted_file_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Extraction is not completed (status {extraction.status})",
         )
-    return await _stream_file(file_service=file_service, user=user, file_id=extraction.extracted_file_id)
+    return await _stream_file(
+        file_service=file_service,
+        user=user,
+        file_id=extraction.extracted_file_id,
+        request=request,
+        redirect=redirect,
+    )
 
 
 @router.delete("/{file_id}", status_code=fastapi.status.HTTP_204_NO_CONTENT)
@@ -1,11 +1,8 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
-import base64
-import json
 import re
-import struct
 import typing
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, AsyncIterator
 from typing import Annotated, Any
 
 import fastapi
@@ -14,8 +11,8 @@ import ibm_watsonx_ai.foundation_models.embeddings
 import openai
 import openai.pagination
 import openai.types.chat
+import orjson
 from fastapi import Depends, HTTPException
-from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from openai.types import CreateEmbeddingResponse
 from starlette.status import HTTP_400_BAD_REQUEST
@@ -29,6 +26,7 @@ from agentstack_server.api.schema.openai import (
 )
 from agentstack_server.domain.models.model_provider import Model, ModelProvider, ModelProviderType
 from agentstack_server.domain.models.permissions import AuthorizedUser
+from agentstack_server.utils.embeddings import EmbeddingEncoding, decode_embedding, encode_embedding
 
 router = fastapi.APIRouter()
 
@@ -47,36 +45,30 @@ async def create_chat_completion(
     if not provider.supports_llm:
         raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Model does not support chat completions")
 
-    api_key = await model_provider_service.get_provider_api_key(model_provider_id=provider.id)
-
     if provider.type == ModelProviderType.WATSONX:
-        model = ibm_watsonx_ai.foundation_models.ModelInference(
-            model_id=model_id,
-            credentials=ibm_watsonx_ai.Credentials(url=str(provider.base_url), api_key=api_key),
-            project_id=provider.watsonx_project_id,
-            space_id=provider.watsonx_space_id,
-            params=ibm_watsonx_ai.foundation_models.model.TextChatParameters(
-                frequency_penalty=request.frequency_penalty,
-                logprobs=request.logprobs,
-                top_logprobs=request.top_logprobs,
-                presence_penalty=request.presence_penalty,
-                response_format=request.response_format,
-                temperature=request.temperature,
-                max_tokens=request.max_tokens,
-                max_completion_tokens=request.max_completion_tokens,
-                top_p=request.top_p,
-                n=request.n,
-                logit_bias=request.logit_bias,
-                seed=request.seed,
-                stop=[request.stop] if isinstance(request.stop, str) else request.stop,
-            ),
+        model = await model_provider_service.get_watsonx_model(provider=provider, model_id=model_id)
+        params = ibm_watsonx_ai.foundation_models.model.TextChatParameters(
+            frequency_penalty=request.frequency_penalty,
+            logprobs=request.logprobs,
+            top_logprobs=request.top_logprobs,
+            presence_penalty=request.presence_penalty,
+            response_format=request.response_format,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            max_completion_tokens=request.max_completion_tokens,
+            top_p=request.top_p,
+            n=request.n,
+            logit_bias=request.logit_bias,
+            seed=request.seed,
+            stop=[request.stop] if isinstance(request.stop, str) else request.stop,
         )
 
         if request.stream:
             return StreamingResponse(
                 _stream_watsonx(
-                    model.chat_stream(
+                    await model.achat_stream(
                         messages=request.messages,
+                        params=params,
                         tools=request.tools,
                         tool_choice=request.tool_choice if isinstance(request.tool_choice, dict) else None,
                         tool_choice_option=request.tool_choice if isinstance(request.tool_choice, str) else None,
@@ -86,9 +78,9 @@ async def create_chat_completion(
                 media_type="text/event-stream",
             )
         else:
-            response = await run_in_threadpool(
-                model.chat,
+            response = await model.achat(
                 messages=request.messages,
+                params=params,
                 tools=request.tools,
                 tool_choice=request.tool_choice if isinstance(request.tool_choice, dict) else None,
                 tool_choice_option=request.tool_choice if isinstance(request.tool_choice, str) else None,
@@ -132,11 +124,7 @@ async def create_chat_completion(
                 ),
             ).model_dump(mode="json") | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
     else:
-        client = openai.AsyncOpenAI(
-            api_key=api_key,
-            base_url=str(provider.base_url),
-            default_headers=({"RITS_API_KEY": api_key} if provider.type == ModelProviderType.RITS else {}),
-        )
+        client = await model_provider_service.get_openai_client(provider=provider)
         if request.stream:
             return StreamingResponse(
                 _stream_openai(
@@ -159,73 +147,81 @@ async def create_chat_completion(
             )
 
 
-def _stream_watsonx(stream: Generator, request_model_id: str) -> Generator[str, Any]:
+def _sse(data: dict[str, Any]) -> bytes:
+    return b"data: " + orjson.dumps(data | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}) + b"\n\n"
+
+
+_SSE_DONE = b"data: [DONE]\n\n"
+
+
+def _watsonx_usage(usage: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "completion_tokens": usage["completion_tokens"],
+        "prompt_tokens": usage["prompt_tokens"],
+        "total_tokens": usage["total_tokens"],
+        "completion_tokens_details": None,
+        "prompt_tokens_details": None,
+    }
+
+
+def _watsonx_chunk(chunk: dict[str, Any], request_model_id: str) -> dict[str, Any]:
+    """Map a watsonx chat chunk directly to the OpenAI ChatCompletionChunk shape, bypassing pydantic models."""
+    return {
+        "id": chunk["id"],
+        "choices": [
+            {
+                "delta": {
+                    "content": choice["delta"].get("content"),
+                    "function_call": None,
+                    "refusal": choice["delta"].get("refusal"),
+                    "role": choice["delta"].get("role"),
+                    "tool_calls": [
+                        {
+                            "index": tool_call["index"],
+                            "id": tool_call.get("id"),
+                            "function": {
+                                "arguments": tool_call["function"]["arguments"],
+                                "name": tool_call["function"]["name"],
+                            },
+                            "type": "function",
+                        }
+                        for tool_call in choice["delta"].get("tool_calls", [])
+                    ]
+                    or None,
+                },
+                "finish_reason": choice.get("finish_reason"),
+                "index": choice["index"],
+                "logprobs": None,
+            }
+            for choice in chunk.get("choices", [])
+        ],
+        "created": chunk["created"],
+        "model": request_model_id,
+        "object": "chat.completion.chunk",
+        "service_tier": None,
+        "system_fingerprint": chunk["model_version"],
+        "usage": _watsonx_usage(chunk["usage"]) if "usage" in chunk else None,
+    }
+
+
+async def _stream_watsonx(stream: AsyncIterator[dict[str, Any]], request_model_id: str) -> AsyncGenerator[bytes]:
     try:
-        for chunk in stream:
-            yield f"""data: {
-                json.dumps(
-                    openai.types.chat.ChatCompletionChunk(
-                        object="chat.completion.chunk",
-                        id=chunk["id"],
-                        created=chunk["created"],
-                        model=request_model_id,
-                        system_fingerprint=chunk["model_version"],
-                        choices=[
-                            openai.types.chat.chat_completion_chunk.Choice(
-                                index=choice["index"],
-                                delta=openai.types.chat.chat_completion_chunk.ChoiceDelta(
-                                    role=choice["delta"].get("role"),
-                                    content=choice["delta"].get("content"),
-                                    refusal=choice["delta"].get("refusal"),
-                                    tool_calls=[
-                                        openai.types.chat.chat_completion_chunk.ChoiceDeltaToolCall(
-                                            index=tool_call["index"],
-                                            type="function",
-                                            function=openai.types.chat.chat_completion_chunk.ChoiceDeltaFunctionCall(
-                                                name=tool_call["function"]["name"],
-                                                arguments=tool_call["function"]["arguments"],
-                                            ),
-                                        )
-                                        for tool_call in choice["delta"].get("tool_calls", [])
-                                    ]
-                                    or None,
-                                ),
-                                finish_reason=choice.get("finish_reason"),
-                            )
-                            for choice in chunk.get("choices", [])
-                        ],
-                        usage=(
-                            openai.types.CompletionUsage(
-                                completion_tokens=chunk["usage"]["completion_tokens"],
-                                prompt_tokens=chunk["usage"]["prompt_tokens"],
-                                total_tokens=chunk["usage"]["total_tokens"],
-                            )
-                            if "usage" in chunk
-                            else None
-                        ),
-                    ).model_dump(mode="json")
-                    | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
-                )
-            }\n\n"""
+        async for chunk in stream:
+            yield _sse(_watsonx_chunk(chunk, request_model_id))
     except Exception as e:
-        yield f"data: {json.dumps({'error': {'message': str(e), 'type': type(e).__name__}, 'agentstack_proxy_version': AGENTSTACK_PROXY_VERSION})}\n\n"
+        yield _sse({"error": {"message": str(e), "type": type(e).__name__}})
     finally:
-        yield "data: [DONE]\n\n"
+        yield _SSE_DONE
 
 
-async def _stream_openai(stream: AsyncGenerator, request_model_id: str) -> AsyncGenerator[str, Any]:
+async def _stream_openai(stream: AsyncIterator, request_model_id: str) -> AsyncGenerator[bytes]:
     try:
         async for chunk in stream:
-            data = json.dumps(
-                chunk.model_dump(mode="json")
-                | {"model": request_model_id}
-                | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
-            )
-            yield f"data: {data}\n\n"
+            yield _sse(chunk.model_dump(mode="json") | {"model": request_model_id})
     except Exception as e:
-        yield f"data: {json.dumps({'error': {'message': str(e), 'type': type(e).__name__}, 'agentstack_proxy_version': AGENTSTACK_PROXY_VERSION})}\n\n"
+        yield _sse({"error": {"message": str(e), "type": type(e).__name__}})
     finally:
-        yield "data: [DONE]\n\n"
+        yield _SSE_DONE
 
 
 def _get_provider_model_id(request_model_id: str, provider: ModelProvider):
@@ -248,60 +244,60 @@ async def create_embedding(
         # Voyage does not support 'float' value: https://docs.voyageai.com/reference/embeddings-api
         request.encoding_format = None if request.encoding_format == "float" else request.encoding_format
 
-    api_key = await model_provider_service.get_provider_api_key(model_provider_id=provider.id)
+    inputs = [request.input] if isinstance(request.input, str) else request.input
+    embeddings: list[list[float] | str | None] = [
+        *model_provider_service.embeddings_cache.get_many(model_id=request.model, inputs=inputs)
+    ]
+    missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+    response_model, usage = model_id, openai.types.create_embedding_response.Usage(prompt_tokens=0, total_tokens=0)
 
-    if provider.type == ModelProviderType.WATSONX:
-        watsonx_response = await run_in_threadpool(
-            ibm_watsonx_ai.foundation_models.embeddings.Embeddings(
-                model_id=model_id,
-                credentials=ibm_watsonx_ai.Credentials(url=str(provider.base_url), api_key=api_key),
-                project_id=provider.watsonx_project_id,
-                space_id=provider.watsonx_space_id,
-            ).generate,
-            inputs=[request.input] if isinstance(request.input, str) else request.input,
-        )
-        return openai.types.CreateEmbeddingResponse(
-            object="list",
-            model=watsonx_response["model_id"],
-            data=[
-                MultiformatEmbedding(
-                    object="embedding",
-                    index=i,
-                    embedding=(
-                        _float_list_to_base64(result["embedding"])
-                        if request.encoding_format == "base64"
-                        else typing.cast(list[float], result["embedding"])
-                    ),
-                )
-                for i, result in enumerate(watsonx_response.get("results", []))
-            ],
-            usage=openai.types.create_embedding_response.Usage(
+    if missing:
+        missing_inputs = [inputs[idx] for idx in missing]
+        if provider.type == ModelProviderType.WATSONX:
+            model = await model_provider_service.get_watsonx_embeddings(provider=provider, model_id=model_id)
+            watsonx_response = await model.agenerate(inputs=missing_inputs)
+            response_model = watsonx_response["model_id"]
+            upstream = [result["embedding"] for result in watsonx_response.get("results", [])]
+            usage = openai.types.create_embedding_response.Usage(
                 prompt_tokens=watsonx_response.get("usage", {}).get("prompt_tokens", 0),
                 total_tokens=watsonx_response.get("usage", {}).get("total_tokens", 0),
-            ),
-        ).model_dump(mode="json") | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
-    else:
-        result: CreateEmbeddingResponse = await openai.AsyncOpenAI(
-            api_key=api_key,
-            base_url=str(provider.base_url),
-            default_headers=({"RITS_API_KEY": api_key} if provider.type == ModelProviderType.RITS else {}),
-        ).embeddings.create(**(request.model_dump(mode="json", exclude_none=True) | {"model": model_id}))
-        # Despite the typing, OpenAI library does return str embeddings when base64 is requested
-        # However, some providers, like Ollama, silently don't support base64, so we have to convert
-        if request.encoding_format == "base64" and result.data and isinstance(result.data[0].embedding, list):
-            result.data = [
-                MultiformatEmbedding(
-                    object="embedding",
-                    index=embedding.index,
-                    embedding=_float_list_to_base64(embedding.embedding),
-                )
-                for embedding in result.data
-            ]
-        return result.model_dump(mode="json") | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
-
-
-def _float_list_to_base64(embedding: list[float]) -> str:
-    return base64.b64encode(struct.pack(f"<{len(embedding)}f", *embedding)).decode("utf-8")
+            )
+        else:
+            client = await model_provider_service.get_openai_client(provider=provider)
+            result: CreateEmbeddingResponse = await client.embeddings.create(
+                **(request.model_dump(mode="json", exclude_none=True) | {"model": model_id, "input": missing_inputs})
+            )
+            # OpenAI-compatible providers may omit usage despite the typing
+            response_model, usage = result.model, result.usage or usage
+            # Despite the typing, OpenAI library does return str embeddings when base64 is requested
+            upstream = [embedding.embedding for embedding in sorted(result.data, key=lambda e: e.index)]
+
+        model_provider_service.embeddings_cache.set_many(
+            model_id=request.model, inputs=missing_inputs, embeddings=upstream
+        )
+        for idx, embedding in zip(missing, upstream, strict=True):
+            embeddings[idx] = embedding
+
+    return openai.types.CreateEmbeddingResponse(
+        object="list",
+        model=response_model,
+        data=[
+            MultiformatEmbedding(
+                object="embedding",
+                index=i,
+                embedding=_format_embedding(typing.cast(list[float] | str, embedding), request.encoding_format),
+            )
+            for i, embedding in enumerate(embeddings)
+        ],
+        usage=usage,
+    ).model_dump(mode="json") | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION}
+
+
+def _format_embedding(embedding: list[float] | str, encoding_format: str | None) -> list[float] | str:
+    # Some providers, like Ollama, silently don't support base64, so we have to convert
+    if encoding_format == "base64":
+        return embedding if isinstance(embedding, str) else encode_embedding(embedding, EmbeddingEncoding.BASE64)
+    return decode_embedding(embedding, EmbeddingEncoding.BASE64).tolist() if isinstance(embedding, str) else embedding
 
 
 @router.get("/models")
@@ -1,17 +1,22 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import logging
+import struct
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from agentstack_server.api.dependencies import (
     RequiresContextPermissions,
     VectorStoreServiceDependency,
 )
-from agentstack_server.api.schema.common import EntityModel
+from agentstack_server.api.schema.common import NDJSON_MEDIA_TYPE, VECTOR_FRAME_MEDIA_TYPE, EntityModel
 from agentstack_server.api.schema.vector_stores import (
     CreateVectorStoreRequest,
     SearchRequest,
@@ -21,14 +26,19 @@ from agentstack_server.domain.models.permissions import AuthorizedUser
 from agentstack_server.domain.models.vector_store import (
     VectorStore,
     VectorStoreDocument,
+    VectorStoreIngestionStats,
     VectorStoreItem,
     VectorStoreSearchResult,
 )
+from agentstack_server.utils.embeddings import EmbeddingEncoding
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_items_adapter = TypeAdapter(list[VectorStoreItem])
+_frame_length = struct.Struct("<I")
+
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 async def create_vector_store(
@@ -70,34 +80,161 @@ async def delete_vector_store(
     await vector_store_service.delete(vector_store_id=vector_store_id, user=user.user, context_id=user.context_id)
 
 
-@router.put("/{vector_store_id}")
+async def _parse_ndjson_items(request: Request, encoding_format: EmbeddingEncoding) -> AsyncIterator[VectorStoreItem]:
+    buffer, line_number = b"", 0
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_item(line, line_number, encoding_format)
+    if buffer.strip():
+        yield _parse_item(buffer, line_number + 1, encoding_format)
+
+
+def _parse_item(line: bytes, line_number: int, encoding_format: EmbeddingEncoding) -> VectorStoreItem:
+    try:
+        return VectorStoreItem.model_validate_json(line, context={"encoding_format": encoding_format})
+    except ValidationError as e:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Invalid item on line {line_number}: {e}"
+        ) from e
+
+
+async def _parse_vector_frames(
+    stream: AsyncIterable[bytes], encoding_format: EmbeddingEncoding
+) -> AsyncIterator[VectorStoreItem]:
+    buffer, record_number = bytearray(), 0
+    async for chunk in stream:
+        buffer += chunk
+        offset = 0
+        while frame := _next_frame(buffer, offset):
+            header, embedding, offset = frame
+            record_number += 1
+            yield _parse_frame(header, embedding, record_number, encoding_format)
+        del buffer[:offset]
+    if buffer:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Item {record_number + 1} is truncated ({len(buffer)} bytes)"
+        )
+
+
+def _next_frame(buffer: bytearray, offset: int) -> tuple[bytes, bytes, int] | None:
+    if len(buffer) < offset + _frame_length.size:
+        return None
+    (header_length,) = _frame_length.unpack_from(buffer, offset)
+    header_end = offset + _frame_length.size + header_length
+    if len(buffer) < header_end + _frame_length.size:
+        return None
+    (embedding_length,) = _frame_length.unpack_from(buffer, header_end)
+    end = header_end + _frame_length.size + embedding_length
+    if len(buffer) < end:
+        return None
+    return bytes(buffer[offset + _frame_length.size : header_end]), bytes(buffer[end - embedding_length : end]), end
+
+
+def _parse_frame(
+    header: bytes, embedding: bytes, record_number: int, encoding_format: EmbeddingEncoding
+) -> VectorStoreItem:
+    try:
+        item = json.loads(header)
+        if not isinstance(item, dict):
+            raise ValueError("header must be a JSON object")
+        return VectorStoreItem.model_validate(
+            {**item, "embedding": embedding}, context={"encoding_format": encoding_format}
+        )
+    except ValueError as e:  # includes ValidationError and JSONDecodeError
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Invalid item {record_number}: {e}") from e
+
+
+@router.put(
+    "/{vector_store_id}",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                **{
+                    media_type: {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/VectorStoreItem"}}}
+                    for media_type in ("application/json", NDJSON_MEDIA_TYPE)
+                },
+                VECTOR_FRAME_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
 async def add_items(
     vector_store_id: UUID,
-    items: list[VectorStoreItem],
+    request: Request,
     vector_store_service: VectorStoreServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(vector_stores={"write"}))],
-) -> None:
-    await vector_store_service.add_items(
+    encoding_format: Annotated[
+        EmbeddingEncoding,
+        Query(description="Encoding of embeddings sent as base64 strings or raw buffers in vector frames"),
+    ] = EmbeddingEncoding.FLOAT,
+) -> VectorStoreIngestionStats:
+    """
+    Add items to a vector store. Large item sets should be sent as NDJSON (one item per line, content type
+    application/x-ndjson), these are streamed into the database in batches. Embeddings can be sent as base64 encoded
+    float32 or float16 buffers (see encoding_format) which are about 4x smaller than JSON floats.
+
+    The vector frame format (content type application/vnd.agentstack.vector-frame) avoids base64 altogether. The body
+    is a sequence of records, each a little-endian uint32 header length, the item as JSON without the embedding,
+    a little-endian uint32 embedding length and the raw little-endian embedding (float16 when encoding_format is
+    base64_float16, float32 otherwise). Frames are streamed into the database like NDJSON.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(VECTOR_FRAME_MEDIA_TYPE):
+        return await vector_store_service.bulk_add_items(
+            vector_store_id=vector_store_id,
+            items=_parse_vector_frames(request.stream(), encoding_format),
+            user=user.user,
+            context_id=user.context_id,
+        )
+    if content_type.startswith(NDJSON_MEDIA_TYPE):
+        return await vector_store_service.bulk_add_items(
+            vector_store_id=vector_store_id,
+            items=_parse_ndjson_items(request, encoding_format),
+            user=user.user,
+            context_id=user.context_id,
+        )
+    try:
+        items = _items_adapter.validate_json(await request.body(), context={"encoding_format": encoding_format})
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        ) from e
+    return await vector_store_service.add_items(
         vector_store_id=vector_store_id, items=items, user=user.user, context_id=user.context_id
     )
 
 
-@router.post("/{vector_store_id}/search")
+@router.post("/{vector_store_id}/search", response_model=PaginatedResult[VectorStoreSearchResult])
 async def search_with_vector(
     vector_store_id: UUID,
     request: SearchRequest,
     vector_store_service: VectorStoreServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(vector_stores={"read"}))],
-) -> PaginatedResult[VectorStoreSearchResult]:
+) -> PaginatedResult[VectorStoreSearchResult] | Response:
     """Search a vector store using either text or a vector."""
     response = await vector_store_service.search(
         vector_store_id=vector_store_id,
         query_vector=request.query_vector,
+        query_text=request.query_text,
+        mode=request.mode,
         limit=request.limit,
+        metric=request.metric,
+        ef_search=request.ef_search,
+        metadata_filter=request.metadata_filter,
         user=user.user,
         context_id=user.context_id,
     )
-    return PaginatedResult(items=response, total_count=len(response))
+    result = PaginatedResult(items=response, total_count=len(response))
+    if request.encoding_format != EmbeddingEncoding.FLOAT:
+        return Response(
+            content=result.model_dump_json(context={"encoding_format": request.encoding_format}),
+            media_type="application/json",
+        )
+    return result
 
 
 @router.get("/{vector_store_id}/documents")
@@ -5,12 +5,22 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from agentstack_server.domain.models.common import TotalCount
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Records of <u32 header length><JSON header><u32 embedding length><raw little-endian embedding>, see add_items
+VECTOR_FRAME_MEDIA_TYPE = "application/vnd.agentstack.vector-frame"
+
 
 class PaginationQuery(BaseModel):
     limit: int = Field(default_factory=lambda: 40, ge=1, le=100)
-    page_token: UUID | None = None
+    page_token: str | None = None
     order: str = Field(default_factory=lambda: "desc", pattern="^(asc|desc)$")
     order_by: str = Field(default_factory=lambda: "created_at", pattern="^created_at|updated_at$")
+    total_count: TotalCount = Field(
+        default=TotalCount.ESTIMATE,
+        description="Count the remaining items exactly or use a cheap planner estimate (exact for the last page)",
+    )
 
 
 class ErrorStreamResponseError(BaseModel, extra="allow"):
@@ -2,7 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-from pydantic import BaseModel, Field
+from typing import Any, Self
+
+from pydantic import BaseModel, Field, model_validator
+
+from agentstack_server.domain.models.common import Metadata
+from agentstack_server.domain.models.vector_store import Embedding, VectorDistanceMetric, VectorSearchMode
+from agentstack_server.utils.embeddings import EmbeddingEncoding, decode_embedding
 
 
 class CreateVectorStoreRequest(BaseModel):
@@ -16,5 +22,44 @@ class CreateVectorStoreRequest(BaseModel):
 class SearchRequest(BaseModel):
     """Request to search a vector store."""
 
-    query_vector: list[float] = Field(description="Vector to search for")
+    query_vector: Embedding | None = Field(
+        None, description="Vector to search for, a list of floats or a base64 encoded buffer, not used in lexical mode"
+    )
+    query_text: str | None = Field(
+        None,
+        min_length=1,
+        max_length=1000,
+        description='Text to match using full-text search, supports "quoted phrases", or and -excluded words',
+    )
+    mode: VectorSearchMode = Field(
+        VectorSearchMode.VECTOR,
+        description="vector ranks by query_vector, lexical by query_text, hybrid fuses both rankings (scores are RRF)",
+    )
     limit: int = Field(5, description="Maximum number of results to return", le=10)
+    metric: VectorDistanceMetric = Field(
+        VectorDistanceMetric.COSINE,
+        description="Distance metric used for ranking, only cosine is served by the approximate (HNSW) index",
+    )
+    ef_search: int | None = Field(
+        None, ge=1, le=1000, description="Size of the HNSW candidate list, higher values trade latency for recall"
+    )
+    metadata_filter: Metadata | None = Field(None, description="Only return items whose metadata contains these pairs")
+    encoding_format: EmbeddingEncoding = Field(
+        EmbeddingEncoding.FLOAT, description="Encoding of a base64 query_vector and of embeddings in the results"
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def _decode_query_vector(cls, data: Any) -> Any:
+        if isinstance(data, dict) and isinstance(data.get("query_vector"), str):
+            encoding = EmbeddingEncoding(data.get("encoding_format", EmbeddingEncoding.BASE64))
+            return data | {"query_vector": decode_embedding(data["query_vector"], encoding)}
+        return data
+
+    @model_validator(mode="after")
+    def _check_query(self) -> Self:
+        if self.mode != VectorSearchMode.LEXICAL and self.query_vector is None:
+            raise ValueError(f"query_vector is required in {self.mode} mode")
+        if self.mode != VectorSearchMode.VECTOR and not self.query_text:
+            raise ValueError(f"query_text is required in {self.mode} mode")
+        return self
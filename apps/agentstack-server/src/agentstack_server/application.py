@@ -35,6 +35,8 @@ from agentstack_server.api.routes.variables import router as variables_router
 from agentstack_server.api.routes.vector_stores import router as vector_stores_router
 from agentstack_server.bootstrap import bootstrap_dependencies_sync
 from agentstack_server.configuration import Configuration
+from agentstack_server.domain.repositories.file import IObjectStorageRepository, ITextExtractionBackend
+from agentstack_server.domain.repositories.notifications import INotificationListener
 from agentstack_server.exceptions import (
     DuplicateEntityError,
     ManifestLoadError,
@@ -42,7 +44,12 @@ from agentstack_server.exceptions import (
 )
 from agentstack_server.jobs.crons.provider import check_registry
 from agentstack_server.run_workers import run_workers
+from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager
+from agentstack_server.service_layer.services.a2a import A2AProxyService
+from agentstack_server.service_layer.services.auth import AuthorizedUserCache
 from agentstack_server.service_layer.services.mcp import McpService
+from agentstack_server.service_layer.services.model_providers import ModelProviderService
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
 from agentstack_server.telemetry import INSTRUMENTATION_NAME, shutdown_telemetry
 from agentstack_server.utils.fastapi import ProxyHeadersMiddleware
 
@@ -186,10 +193,33 @@ def app(*, dependency_overrides: Container | None = None) -> FastAPI:
 
     @asynccontextmanager
     @inject
-    async def lifespan(_app: FastAPI, procrastinate_app: procrastinate.App, mcp_service: McpService):
+    async def lifespan(
+        _app: FastAPI,
+        procrastinate_app: procrastinate.App,
+        mcp_service: McpService,
+        a2a_proxy_service: A2AProxyService,
+        model_provider_service: ModelProviderService,
+        vector_store_service: VectorStoreService,
+        notification_listener: INotificationListener,
+        provider_deployment_manager: IProviderDeploymentManager,
+        object_storage: IObjectStorageRepository,
+        extraction_backend: ITextExtractionBackend,
+        _authorized_user_cache: AuthorizedUserCache,  # subscribes to notifications, must exist before listening
+    ):
         try:
             register_telemetry()
-            async with procrastinate_app.open_async(), run_workers(app=procrastinate_app), mcp_service:
+            async with (
+                object_storage,
+                extraction_backend,
+                procrastinate_app.open_async(),
+                run_workers(app=procrastinate_app, configuration=configuration),
+                mcp_service,
+                a2a_proxy_service,
+                model_provider_service,
+                vector_store_service,
+                notification_listener,
+                provider_deployment_manager,
+            ):
                 with suppress(AlreadyEnqueued):
                     # Force initial sync of the registry immediately
                     await check_registry.defer_async(timestamp=int(time.time()))
@@ -12,11 +12,14 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 
 from agentstack_server.configuration import Configuration, get_configuration
 from agentstack_server.domain.repositories.file import IObjectStorageRepository, ITextExtractionBackend
+from agentstack_server.domain.repositories.notifications import INotificationListener
 from agentstack_server.infrastructure.kubernetes.provider_build_manager import KubernetesProviderBuildManager
 from agentstack_server.infrastructure.kubernetes.provider_deployment_manager import KubernetesProviderDeploymentManager
 from agentstack_server.infrastructure.object_storage.repository import S3ObjectStorageRepository
+from agentstack_server.infrastructure.persistence.notifications import PostgresNotificationListener
 from agentstack_server.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWorkFactory
 from agentstack_server.infrastructure.text_extraction.docling import DoclingTextExtractionBackend
+from agentstack_server.infrastructure.vector_database.vector_db import register_vector_codecs
 from agentstack_server.jobs.procrastinate import create_app
 from agentstack_server.service_layer.build_manager import IProviderBuildManager
 from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager
@@ -27,11 +30,13 @@ logger = logging.getLogger(__name__)
 
 
 def setup_database_engine(config: Configuration) -> AsyncEngine:
-    return config.persistence.create_async_engine(
-        isolation_level="READ COMMITTED",
-        hide_parameters=True,
-        pool_size=20,
-        max_overflow=10,
+    return register_vector_codecs(
+        config.persistence.create_async_engine(
+            isolation_level="READ COMMITTED",
+            hide_parameters=True,
+            pool_size=20,
+            max_overflow=10,
+        )
     )
 
 
@@ -78,10 +83,9 @@ async def bootstrap_dependencies(dependency_overrides: Container | None = None):
             manifest_template_dir=di[Configuration].provider.manifest_template_dir,
         ),
     )
-    _set_di(
-        IUnitOfWorkFactory,
-        SqlAlchemyUnitOfWorkFactory(setup_database_engine(di[Configuration]), di[Configuration]),
-    )
+    engine = setup_database_engine(di[Configuration])
+    _set_di(IUnitOfWorkFactory, SqlAlchemyUnitOfWorkFactory(engine, di[Configuration]))
+    _set_di(INotificationListener, PostgresNotificationListener(engine))
 
     # Register object storage repository and file service
     _set_di(IObjectStorageRepository, S3ObjectStorageRepository(di[Configuration]))
@@ -121,6 +121,10 @@ class AuthConfiguration(BaseModel):
     oidc: OidcConfiguration = Field(default_factory=OidcConfiguration)
     basic: BasicAuthConfiguration = Field(default_factory=BasicAuthConfiguration)
 
+    # Authenticated users keyed by token hash, entries are dropped on user update/delete and never outlive the token
+    user_cache_size: int = 10_000
+    user_cache_ttl_sec: int = int(timedelta(minutes=5).total_seconds())
+
     @model_validator(mode="after")
     def validate_auth(self):
         if self.disable_auth:
@@ -146,6 +150,9 @@ class ObjectStorageConfiguration(BaseModel):
     use_ssl: bool = False
     storage_limit_per_user_bytes: int = 1 * (1024 * 1024 * 1024)  # 1GiB
     max_single_file_size: int = 100 * (1024 * 1024)  # 100 MiB
+    max_pool_connections: int = 50
+    multipart_part_size_bytes: int = Field(default=8 * (1024 * 1024), ge=5 * (1024 * 1024))  # S3 minimum is 5 MiB
+    multipart_concurrency: int = Field(default=4, ge=1)
 
 
 class PersistenceConfiguration(BaseModel):
@@ -178,6 +185,17 @@ class PersistenceConfiguration(BaseModel):
 
 class VectorStoresConfiguration(BaseModel):
     storage_limit_per_user_bytes: int = 1 * (1024 * 1024 * 1024)  # 1GiB
+    hnsw_ef_search: int = Field(default=40, ge=1, le=1000)  # default size of the HNSW candidate list
+    # Keep scanning the HNSW index until enough rows pass the vector_store_id / metadata filters, turned off at startup
+    # when the installed pgvector is older than 0.8
+    hnsw_iterative_scan: Literal["off", "relaxed_order", "strict_order"] = "relaxed_order"
+    hnsw_max_scan_tuples: int = Field(default=20_000, ge=1)
+    dedicated_partition_min_usage_bytes: int = 64 * (1024 * 1024)  # 64MiB
+    bulk_ingestion_batch_size: int = Field(default=5_000, ge=1)  # items loaded using a single COPY statement
+    index_build_maintenance_work_mem: str = "256MB"  # used when building HNSW indexes of dedicated partitions
+    # Hybrid search fuses this many best vector and lexical matches using reciprocal rank fusion with constant k
+    hybrid_search_candidates: int = Field(default=40, ge=1, le=1000)
+    hybrid_search_rrf_k: int = Field(default=60, ge=1)
 
 
 class TelemetryConfiguration(BaseModel):
@@ -235,6 +253,16 @@ class DoclingExtractionConfiguration(BaseModel):
     enabled: bool = False
     docling_service_url: str = "http://docling-serve:15001"
     processing_timeout_sec: int = int(timedelta(minutes=5).total_seconds())
+    # Text extracted from identical files is reused, bump after upgrading docling to extract files again
+    extraction_version: str = "1"
+
+    # Conversions submitted to docling at the same time by a single server replica
+    max_concurrent_requests: int = Field(default=4, ge=1)
+    # New conversions wait while docling reports this many tasks queued ahead of ours (shared by all replicas)
+    max_queue_depth: int = Field(default=8, ge=1)
+    status_poll_interval_sec: float = Field(default=5, gt=0)
+    # Extraction jobs processed at the same time, uploads of finished conversions overlap with running ones
+    worker_concurrency: int = Field(default=10, ge=1)
 
 
 class ContextConfiguration(BaseModel):
@@ -245,6 +273,41 @@ class A2AProxyConfiguration(BaseModel):
     # Expires a2a_request_tasks and a2a_request_contexts (WARNING: has security implications!)
     requests_expire_after_days: int = 14
 
+    # Providers confirmed as running skip the deployment check for this long (must be well below auto_stop_timeout)
+    readiness_cache_ttl_sec: int = 15
+    # Provider and request last_accessed_at updates are coalesced and written in batches
+    last_accessed_flush_interval_sec: int = 5
+    # Already verified (user, task/context) ownership pairs
+    ownership_cache_size: int = 100_000
+    ownership_cache_ttl_sec: int = int(timedelta(minutes=5).total_seconds())
+
+    # Connection pool shared by all proxied requests to a single provider
+    client_max_connections: int = 100
+    client_max_keepalive_connections: int = 20
+    client_keepalive_expiry_sec: float = 60
+    client_idle_expire_after_sec: int = int(timedelta(minutes=10).total_seconds())
+    client_http2: bool = False  # requires the "h2" package, agents served by plain uvicorn speak only HTTP/1.1
+
+
+class ModelProvidersConfiguration(BaseModel):
+    # Decrypted provider API keys, entries are also dropped when the provider is deleted
+    api_key_cache_ttl_sec: int = int(timedelta(minutes=5).total_seconds())
+
+    # Connection pool shared by all proxied requests to a single model provider
+    client_max_connections: int = 100
+    client_max_keepalive_connections: int = 20
+    client_keepalive_expiry_sec: float = 60
+    client_timeout_sec: float = timedelta(minutes=30).total_seconds()
+
+    # Embeddings keyed by model and a hash of the input text, only misses are sent to the provider
+    embeddings_cache_enabled: bool = False
+    embeddings_cache_size: int = 100_000
+    embeddings_cache_ttl_sec: int = int(timedelta(days=1).total_seconds())
+
+    # Model id to provider routing index, rebuilt in the background from the provider model listings
+    model_index_refresh_interval_sec: int = int(timedelta(minutes=5).total_seconds())
+    model_index_min_refresh_interval_sec: float = 5
+
 
 class FeatureConfiguration(BaseModel):
     generate_conversation_title: bool = True
@@ -282,6 +345,7 @@ class Configuration(BaseSettings):
     text_extraction: DoclingExtractionConfiguration = Field(default_factory=DoclingExtractionConfiguration)
     context: ContextConfiguration = Field(default_factory=ContextConfiguration)
     a2a_proxy: A2AProxyConfiguration = Field(default_factory=A2AProxyConfiguration)
+    model_providers: ModelProvidersConfiguration = Field(default_factory=ModelProvidersConfiguration)
     connector: ConnectorConfiguration = Field(default_factory=ConnectorConfiguration)
     k8s_namespace: str | None = None
     k8s_kubeconfig: Path | None = None
@@ -24,3 +24,9 @@ SELF_REGISTRATION_EXTENSION_URI: Final[str] = (
 )
 
 MODEL_API_KEY_SECRET_NAME = "MODEL_API_KEY"
+
+# Postgres NOTIFY channel, payload is the id of an updated or deleted user
+USER_CHANGED_CHANNEL: Final[str] = "user_changed"
+
+# Postgres NOTIFY channel, payload is the id of a created, updated or deleted model provider
+MODEL_PROVIDER_CHANGED_CHANNEL: Final[str] = "model_provider_changed"
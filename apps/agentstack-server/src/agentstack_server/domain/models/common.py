@@ -1,11 +1,12 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+from enum import StrEnum
 from textwrap import dedent
-from typing import Annotated
+from typing import Annotated, Self
 from uuid import UUID
 
-from pydantic import AfterValidator, BaseModel, Field, computed_field
+from pydantic import AfterValidator, BaseModel, Field, model_validator
 
 
 def validate_metadata(metadata: dict[str, str | None]) -> dict[str, str | None]:
@@ -43,12 +44,20 @@ MetadataPatch = Annotated[
 ]
 
 
+class TotalCount(StrEnum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
 class PaginatedResult[T](BaseModel):
     items: list[T]
     total_count: int
     has_more: bool = False
-
-    @computed_field
-    @property
-    def next_page_token(self) -> UUID | None:
-        return getattr(self.items[-1], "id", None) if self.items else None
+    next_page_token: str | None = None
+
+    @model_validator(mode="after")
+    def _default_next_page_token(self) -> Self:
+        # Results that are not cursor-paginated use the id of the last item, which is also accepted as a page token
+        if self.next_page_token is None and self.items and isinstance(id := getattr(self.items[-1], "id", None), UUID):
+            self.next_page_token = str(id)
+        return self
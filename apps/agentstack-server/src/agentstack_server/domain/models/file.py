@@ -25,6 +25,7 @@ class ExtractionStatus(StrEnum):
 
 class ExtractionMetadata(BaseModel, extra="allow"):
     backend: str
+    version: str | None = None
 
 
 class FileMetadata(BaseModel, extra="allow"):
@@ -33,11 +34,24 @@ class FileMetadata(BaseModel, extra="allow"):
     content_length: int
 
 
+class FileReadOptions(BaseModel):
+    """Byte range and preconditions of a file read, with the semantics of the corresponding HTTP headers."""
+
+    range: str | None = Field(default=None, pattern=r"^bytes=")
+    if_match: str | None = None
+    if_none_match: str | None = None
+    if_modified_since: AwareDatetime | None = None
+    if_unmodified_since: AwareDatetime | None = None
+
+
 class AsyncFile(BaseModel):
     filename: str
     content_type: str
     read: Callable[[int], Awaitable[bytes]]
     size: int | None = None
+    etag: str | None = None
+    last_modified: AwareDatetime | None = None
+    content_range: str | None = None  # set when only a part of the file is read
 
 
 class File(BaseModel):
@@ -50,6 +64,13 @@ class File(BaseModel):
     file_type: FileType = FileType.USER_UPLOAD
     parent_file_id: UUID | None = None
     context_id: UUID | None = None
+    content_hash: str | None = Field(default=None, description="SHA-256 of the file content")
+    storage_object_id: UUID | None = Field(default=None, exclude=True)
+
+    @property
+    def object_id(self) -> UUID:
+        """Object storage key, files with the same content share a single object."""
+        return self.storage_object_id or self.id
 
 
 class TextExtraction(BaseModel):
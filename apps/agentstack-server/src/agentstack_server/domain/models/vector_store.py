@@ -2,18 +2,30 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from enum import StrEnum
-from typing import Literal
+from typing import Annotated, Any, Literal
 from uuid import UUID, uuid4
 
-from pydantic import AwareDatetime, BaseModel, Field
+import numpy as np
+from pydantic import (
+    AwareDatetime,
+    BaseModel,
+    Field,
+    FieldSerializationInfo,
+    PlainSerializer,
+    PlainValidator,
+    ValidationInfo,
+    WithJsonSchema,
+)
 
 from agentstack_server.domain.models.common import Metadata
+from agentstack_server.utils.embeddings import EmbeddingEncoding, decode_embedding, encode_embedding
 from agentstack_server.utils.utils import utc_now
 
 
 class VectorStoreStats(BaseModel):
     usage_bytes: int
     num_documents: int
+    partition: str | None = None
 
 
 class VectorStore(BaseModel):
@@ -51,6 +63,54 @@ class DocumentType(StrEnum):
     EXTERNAL = "external"
 
 
+class VectorDistanceMetric(StrEnum):
+    """Distance function used to rank vector search results."""
+
+    COSINE = "cosine"
+    L2 = "l2"
+    INNER_PRODUCT = "inner_product"
+
+
+class VectorSearchMode(StrEnum):
+    """How search results are matched to the query."""
+
+    VECTOR = "vector"  # embedding distance to query_vector
+    LEXICAL = "lexical"  # full-text match of query_text, no embedding needed
+    HYBRID = "hybrid"  # reciprocal rank fusion of the vector and lexical results
+
+
+def _decode_embedding(value: Any, info: ValidationInfo) -> np.ndarray:
+    if isinstance(value, str | bytes | memoryview):
+        embedding = decode_embedding(value, (info.context or {}).get("encoding_format", EmbeddingEncoding.BASE64))
+    else:
+        try:
+            embedding = np.asarray(value, dtype=np.float32) if not isinstance(value, np.ndarray) else value
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid embedding: {e}") from e
+    if embedding.ndim != 1 or embedding.dtype.kind != "f":
+        raise ValueError("Embedding must be a list of floats")
+    return embedding
+
+
+def _encode_embedding(embedding: np.ndarray, info: FieldSerializationInfo) -> str | list[float]:
+    return encode_embedding(embedding, (info.context or {}).get("encoding_format", EmbeddingEncoding.FLOAT))
+
+
+# Embeddings are kept in numpy arrays from decoding the request to binding the HALFVEC parameters
+Embedding = Annotated[
+    np.ndarray,
+    PlainValidator(_decode_embedding),
+    PlainSerializer(_encode_embedding, when_used="json"),
+    WithJsonSchema({"type": "array", "items": {"type": "number"}}),
+    Field(
+        description=(
+            "List of floats or a base64 encoded buffer of little-endian float32 "
+            "(float16 when encoding_format is base64_float16)"
+        )
+    ),
+]
+
+
 class VectorStoreDocumentInfo(BaseModel):
     id: str
     usage_bytes: int = None
@@ -64,7 +124,7 @@ class VectorStoreItem(BaseModel):
     document_type: DocumentType = DocumentType.PLATFORM_FILE
     model_id: str | Literal["platform"] = "platform"
     text: str
-    embedding: list[float]
+    embedding: Embedding
     metadata: Metadata | None = None
 
 
@@ -73,3 +133,11 @@ class VectorStoreSearchResult(BaseModel):
 
     item: VectorStoreItem
     score: float
+
+
+class VectorStoreIngestionStats(BaseModel):
+    """Result of adding items to a vector store."""
+
+    items: int
+    elapsed_sec: float
+    rows_per_second: float
@@ -1,6 +1,7 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
-from datetime import timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
@@ -18,6 +19,13 @@ class IA2ARequestRepository(Protocol):
         allow_task_creation: bool = False,
     ) -> None: ...
 
+    async def update_last_accessed(
+        self,
+        *,
+        tasks: Mapping[str, datetime] | None = None,
+        contexts: Mapping[str, datetime] | None = None,
+    ) -> None: ...
+
     async def get_task(self, *, task_id: str, user_id: UUID) -> A2ARequestTask: ...
 
     async def delete_tasks(self, *, older_than: timedelta) -> int: ...
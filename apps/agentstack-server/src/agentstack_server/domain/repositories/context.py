@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.context import Context, ContextHistoryItem, TitleGenerationState
 
 
@@ -22,11 +22,12 @@ class IContextRepository(Protocol):
         user_id: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         order: str = "desc",
         order_by: str = "created_at",
         include_empty: bool = True,
         last_active_before: datetime | None = None,
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult: ...
 
     async def create(self, *, context: Context) -> None: ...
@@ -38,12 +39,19 @@ class IContextRepository(Protocol):
         self, *, context_id: UUID, title: str | None = None, generation_state: TitleGenerationState
     ) -> None: ...
     async def add_history_item(self, *, context_id: UUID, history_item: ContextHistoryItem) -> None: ...
+    async def get_history_item(self, *, context_id: UUID, history_item_id: UUID) -> ContextHistoryItem: ...
+    async def stream_history(
+        self, *, context_id: UUID, after: ContextHistoryItem | None = None
+    ) -> AsyncIterator[ContextHistoryItem]:
+        yield ...  # type: ignore
+
     async def list_history(
         self,
         *,
         context_id: UUID,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         limit: int = 20,
         order_by: str = "created_at",
         order="desc",
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult[ContextHistoryItem]: ...
@@ -1,15 +1,23 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable, Sequence
 from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import Protocol, runtime_checkable
+from typing import Protocol, Self, runtime_checkable
 from uuid import UUID
 
 from pydantic import AnyUrl, HttpUrl
 
-from agentstack_server.domain.models.file import AsyncFile, File, FileMetadata, FileType, TextExtraction
+from agentstack_server.domain.models.file import (
+    AsyncFile,
+    ExtractionMetadata,
+    File,
+    FileMetadata,
+    FileReadOptions,
+    FileType,
+    TextExtraction,
+)
 
 
 class IFileRepository(Protocol):
@@ -27,10 +35,20 @@ class IFileRepository(Protocol):
         context_id: UUID | None = None,
         file_type: FileType | None = None,
     ) -> File: ...
+    async def get_many(
+        self, *, file_ids: Sequence[UUID], user_id: UUID | None = None, context_id: UUID | None = None
+    ) -> Sequence[File]: ...
     async def delete(
         self, *, file_id: UUID | None = None, user_id: UUID | None = None, context_id: UUID | None = None
     ) -> int: ...
 
+    # Shared storage objects
+    async def find_storage_object(self, *, content_hash: str) -> UUID | None: ...
+    async def list_storage_object_ids(
+        self, *, file_id: UUID | None = None, context_id: UUID | None = None
+    ) -> Sequence[UUID]: ...
+    async def filter_unreferenced_objects(self, *, object_ids: Iterable[UUID]) -> Sequence[UUID]: ...
+
     # Text extraction methods
     async def create_extraction(self, *, extraction: TextExtraction) -> None: ...
     async def get_extraction_by_file_id(
@@ -38,6 +56,7 @@ class IFileRepository(Protocol):
     ) -> TextExtraction: ...
     async def update_extraction(self, *, extraction: TextExtraction) -> None: ...
     async def delete_extraction(self, *, extraction_id: UUID) -> int: ...
+    async def find_extracted_file(self, *, content_hash: str, metadata: ExtractionMetadata) -> File | None: ...
 
 
 @runtime_checkable
@@ -45,16 +64,26 @@ class IObjectStorageRepository(Protocol):
     async def upload_file(self, *, file_id: UUID, file: AsyncFile) -> int: ...
 
     @asynccontextmanager
-    async def get_file(self, *, file_id: UUID) -> AsyncIterator[AsyncFile]:
+    async def get_file(self, *, file_id: UUID, options: FileReadOptions | None = None) -> AsyncIterator[AsyncFile]:
         yield  # type: ignore
 
     async def delete_files(self, *, file_ids: list[UUID]) -> None: ...
     async def get_file_url(self, *, file_id: UUID) -> HttpUrl: ...
     async def get_file_metadata(self, *, file_id: UUID) -> FileMetadata: ...
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
 
 
 @runtime_checkable
 class ITextExtractionBackend(Protocol):
+    @property
+    def metadata(self) -> ExtractionMetadata:
+        """Identifies the backend and its version, extracted text is reused only for equal metadata."""
+        ...
+
     @asynccontextmanager
     async def extract_text(self, *, file_url: AnyUrl, timeout: timedelta | None = None) -> AsyncIterator[AsyncFile]:  # noqa: ASYNC109
         yield ...  # pyright: ignore [reportReturnType]
+
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None: ...
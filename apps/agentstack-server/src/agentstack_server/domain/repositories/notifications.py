@@ -0,0 +1,15 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from collections.abc import Callable
+from typing import Protocol, Self
+
+# Called with the notification payload, or None when notifications may have been missed (e.g. lost connection)
+type NotificationCallback = Callable[[str | None], None]
+
+
+class INotificationListener(Protocol):
+    def subscribe(self, channel: str, callback: NotificationCallback) -> None: ...
+
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
@@ -1,11 +1,11 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
-from agentstack_server.domain.models.provider import Provider, ProviderType, UnmanagedState
+from agentstack_server.domain.models.provider import Provider, ProviderLocation, ProviderType, UnmanagedState
 
 
 @runtime_checkable
@@ -24,6 +24,7 @@ class IProviderRepository(Protocol):
     async def update(self, *, provider: Provider) -> None: ...
 
     async def get(self, *, provider_id: UUID, user_id: UUID | None = None) -> Provider: ...
+    async def get_by_source(self, *, source: ProviderLocation) -> Provider: ...
     async def delete(self, *, provider_id: UUID, user_id: UUID | None = None) -> int: ...
     async def update_unmanaged_state(self, provider_id: UUID, state: UnmanagedState) -> None: ...
-    async def update_last_accessed(self, *, provider_id: UUID) -> None: ...
+    async def update_last_accessed(self, *, provider_ids: Iterable[UUID]) -> None: ...
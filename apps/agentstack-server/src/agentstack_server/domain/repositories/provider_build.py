@@ -5,7 +5,7 @@ from collections.abc import AsyncIterator
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.provider_build import BuildState, ProviderBuild
 
 
@@ -20,12 +20,13 @@ class IProviderBuildRepository(Protocol):
         self,
         *,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         order: str = "desc",
         order_by: str = "created_at",
         status: BuildState | None = None,
         user_id: UUID | None = None,
         exclude_user_id: UUID | None = None,
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult[ProviderBuild]: ...
 
     async def create(self, *, provider_build: ProviderBuild) -> None: ...
@@ -5,7 +5,11 @@ from collections.abc import AsyncIterator, Iterable, Sequence
 from typing import Protocol
 from uuid import UUID
 
+import numpy as np
+
+from agentstack_server.domain.models.common import Metadata
 from agentstack_server.domain.models.vector_store import (
+    VectorDistanceMetric,
     VectorStore,
     VectorStoreDocument,
     VectorStoreDocumentInfo,
@@ -17,7 +21,9 @@ from agentstack_server.domain.models.vector_store import (
 class IVectorStoreRepository(Protocol):
     """Interface for vector store repository operations."""
 
-    async def list(self, *, user_id: UUID | None = None, context_id: UUID | None = None) -> AsyncIterator[VectorStore]:
+    async def list(
+        self, *, user_id: UUID | None = None, context_id: UUID | None = None, min_usage_bytes: int | None = None
+    ) -> AsyncIterator[VectorStore]:
         yield ...  # type: ignore
 
     async def create(self, *, vector_store: VectorStore) -> None: ...
@@ -28,6 +34,7 @@ class IVectorStoreRepository(Protocol):
         self, *, vector_store_id: UUID | None = None, user_id: UUID | None = None, context_id: UUID | None = None
     ) -> int: ...
     async def update_last_accessed(self, *, vector_store_ids: Iterable[UUID]) -> None: ...
+    async def update_partition(self, *, vector_store_id: UUID, partition: str) -> None: ...
     async def upsert_documents(self, *, documents: Iterable[VectorStoreDocument]) -> None: ...
     async def total_usage(self, *, user_id: UUID | None = None) -> int: ...
 
@@ -38,11 +45,48 @@ class IVectorStoreRepository(Protocol):
 
 
 class IVectorDatabaseRepository(Protocol):
-    async def create_collection(self, collection_id: UUID, dimension: int): ...
+    async def get_extension_version(self) -> str | None: ...
+    async def create_collection(self, collection_id: UUID, dimension: int) -> str: ...
     async def delete_collection(self, collection_id: UUID, dimension: int): ...
+    async def lock_collection(self, collection_id: UUID, *, exclusive: bool = False) -> None: ...
+    async def exclude_from_shared_partition(self, collection_id: UUID, dimension: int) -> bool: ...
+    async def include_in_shared_partition(self, collection_id: UUID, dimension: int) -> None: ...
+    async def create_dedicated_partition(self, collection_id: UUID, dimension: int) -> str: ...
+    async def drop_orphaned_partitions(self) -> list[str]: ...
     async def add_items(self, collection_id: UUID, items: Sequence[VectorStoreItem]) -> None: ...
+    async def stage_items(self, collection_id: UUID, items: Sequence[VectorStoreItem]) -> None: ...
+    async def insert_staged_items(self, collection_id: UUID, dimension: int, *, dedicated_partition: bool) -> None: ...
     def estimate_size(self, items: Sequence[VectorStoreItem]) -> list[VectorStoreDocumentInfo]: ...
     async def delete_documents(self, collection_id: UUID, dimension: int, document_ids: Iterable[str]) -> int: ...
     async def similarity_search(
-        self, collection_id: UUID, query_vector: Sequence[float], limit: int = 10
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float] | np.ndarray,
+        limit: int = 10,
+        *,
+        metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        ef_search: int | None = None,
+        iterative_scan: bool = True,
+        metadata_filter: Metadata | None = None,
+    ) -> Iterable[VectorStoreSearchResult]: ...
+    async def text_search(
+        self,
+        collection_id: UUID,
+        dimension: int,
+        query_text: str,
+        limit: int = 10,
+        *,
+        metadata_filter: Metadata | None = None,
+    ) -> Iterable[VectorStoreSearchResult]: ...
+    async def hybrid_search(
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float] | np.ndarray,
+        query_text: str,
+        limit: int = 10,
+        *,
+        metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        ef_search: int | None = None,
+        iterative_scan: bool = True,
+        metadata_filter: Metadata | None = None,
     ) -> Iterable[VectorStoreSearchResult]: ...
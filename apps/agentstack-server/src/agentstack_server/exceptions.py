@@ -100,6 +100,20 @@ class MissingConfigurationError(Exception):
         self.status_code = status_code
 
 
+class InvalidPageTokenError(PlatformError):
+    def __init__(self, page_token: str, status_code: int = status.HTTP_400_BAD_REQUEST):
+        super().__init__(f"Invalid page token: {page_token}", status_code)
+
+
+class FileReadConditionError(PlatformError):
+    """File content was not returned because of the read range or preconditions (304, 412 or 416)."""
+
+    def __init__(self, file_id: UUID, status_code: int, etag: str | None = None, last_modified: str | None = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        super().__init__(f"Conditional read of file {file_id} returned status {status_code}", status_code)
+
+
 class UsageLimitExceededError(PlatformError):
     def __init__(self, message: str, status_code: int = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE):
         super().__init__(message, status_code)
@@ -0,0 +1,190 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import timedelta
+from typing import Any, Self
+from uuid import UUID
+
+import httpx
+import kr8s
+
+from agentstack_server.domain.models.provider import ProviderDeploymentState
+from agentstack_server.utils.utils import cancel_task
+
+logger = logging.getLogger(__name__)
+
+
+def deployment_state(status: Mapping[str, Any] | None) -> ProviderDeploymentState:
+    status = status or {}
+    if status.get("availableReplicas", 0) > 0:
+        return ProviderDeploymentState.RUNNING
+    elif status.get("replicas", 0) == 0:
+        return ProviderDeploymentState.READY
+    else:
+        return ProviderDeploymentState.STARTING
+
+
+class DeploymentStateInformer:
+    """
+    In-memory view of provider deployment states fed by a Kubernetes watch.
+
+    Follows the client-go informer protocol: list once, then watch from the list resourceVersion (bookmarks keep it
+    fresh), re-list when the watch falls out of the etcd window (410 Gone) and periodically to correct any drift.
+    Until the first list completes (or after the watch fails) the view is not synced and callers should fall back to
+    querying the API server directly.
+    """
+
+    WATCH_TIMEOUT = timedelta(minutes=5)
+    RESYNC_INTERVAL = timedelta(minutes=10)
+    RETRY_DELAY = timedelta(seconds=5)
+
+    def __init__(
+        self,
+        api_factory: Callable[[], Awaitable[kr8s.asyncio.Api]],
+        label_selector: str,
+        provider_id_from_name: Callable[[str], UUID],
+    ):
+        self._api_factory = api_factory
+        self._label_selector = label_selector
+        self._provider_id_from_name = provider_id_from_name
+        self._states: dict[UUID, ProviderDeploymentState] = {}
+        # (uid, status.observedGeneration) of the last seen deployment, tells apart a replaced or rescaled deployment
+        self._versions: dict[UUID, tuple[str, int]] = {}
+        self._changed = asyncio.Condition()
+        self._synced = False
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    def get(self, provider_id: UUID) -> ProviderDeploymentState:
+        return self._states.get(provider_id, ProviderDeploymentState.MISSING)
+
+    async def wait_for(
+        self,
+        provider_id: UUID,
+        states: Iterable[ProviderDeploymentState],
+        timeout: timedelta,  # noqa: ASYNC109 (mirrors the kubernetes wait timeout)
+        min_version: tuple[str, int] | None = None,
+    ) -> None:
+        """
+        Wait until the deployment is in one of the states. With min_version (uid, generation) the state must come from
+        that deployment with the generation observed by the controller, not from a replaced or outdated one.
+        """
+        states = set(states)
+
+        def _reached() -> bool:
+            if self.get(provider_id) not in states:
+                return False
+            if min_version is None:
+                return True
+            uid, generation = self._versions.get(provider_id, ("", 0))
+            return uid == min_version[0] and generation >= min_version[1]
+
+        async with asyncio.timeout(timeout.total_seconds()), self._changed:
+            await self._changed.wait_for(_reached)
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await cancel_task(self._task)
+        self._task = None
+        self._synced = False
+
+    def _parse_provider_id(self, deployment: Mapping[str, Any]) -> UUID | None:
+        try:
+            return self._provider_id_from_name(deployment["metadata"]["name"])
+        except ValueError:
+            return None
+
+    async def _update(self, deployments: dict[UUID, Mapping[str, Any] | None], *, replace: bool = False) -> None:
+        async with self._changed:
+            if replace:
+                self._states, self._versions = {}, {}
+            for provider_id, deployment in deployments.items():
+                if deployment is None:
+                    self._states.pop(provider_id, None)
+                    self._versions.pop(provider_id, None)
+                else:
+                    status = deployment.get("status") or {}
+                    self._states[provider_id] = deployment_state(status)
+                    self._versions[provider_id] = (
+                        deployment["metadata"].get("uid", ""),
+                        status.get("observedGeneration", 0),
+                    )
+            self._changed.notify_all()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                api = await self._api_factory()
+                resource_version = await self._list(api)
+                resync_at = time.monotonic() + self.RESYNC_INTERVAL.total_seconds()
+                while resource_version and time.monotonic() < resync_at:
+                    resource_version = await self._watch(api, resource_version)
+            except Exception as ex:
+                self._synced = False
+                logger.warning(f"Deployment watch failed, retrying in {self.RETRY_DELAY}: {ex!r}")
+                await asyncio.sleep(self.RETRY_DELAY.total_seconds())
+
+    async def _list(self, api: kr8s.asyncio.Api) -> str:
+        async with api.call_api(
+            "GET",
+            version="apps/v1",
+            url="deployments",
+            namespace=api.namespace,
+            params={"labelSelector": self._label_selector},
+        ) as response:
+            deployment_list = response.json()
+
+        deployments = {}
+        for deployment in deployment_list["items"]:
+            if provider_id := self._parse_provider_id(deployment):
+                deployments[provider_id] = deployment
+        await self._update(deployments, replace=True)
+        self._synced = True
+        return deployment_list["metadata"]["resourceVersion"]
+
+    async def _watch(self, api: kr8s.asyncio.Api, resource_version: str) -> str | None:
+        """Apply watch events until the server closes the stream, returns None if a re-list is required."""
+        async with api.call_api(
+            "GET",
+            version="apps/v1",
+            url="deployments",
+            namespace=api.namespace,
+            params={
+                "labelSelector": self._label_selector,
+                "watch": "true",
+                "resourceVersion": resource_version,
+                "allowWatchBookmarks": "true",
+                "timeoutSeconds": int(self.WATCH_TIMEOUT.total_seconds()),
+            },
+            stream=True,
+            timeout=httpx.Timeout(10, read=self.WATCH_TIMEOUT.total_seconds() + 30),
+        ) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                deployment = event["object"]
+                match event["type"]:
+                    case "ADDED" | "MODIFIED":
+                        if provider_id := self._parse_provider_id(deployment):
+                            await self._update({provider_id: deployment})
+                    case "DELETED":
+                        if provider_id := self._parse_provider_id(deployment):
+                            await self._update({provider_id: None})
+                    case "ERROR":
+                        if deployment.get("code") == 410:  # resourceVersion too old
+                            return None
+                        raise RuntimeError(f"Deployment watch error: {deployment.get('message')}")
+                resource_version = deployment["metadata"]["resourceVersion"]  # including BOOKMARK events
+        return resource_version
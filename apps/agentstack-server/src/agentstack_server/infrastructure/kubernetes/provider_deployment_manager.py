@@ -13,7 +13,7 @@ from contextlib import asynccontextmanager, suppress
 from datetime import timedelta
 from enum import StrEnum
 from pathlib import Path
-from typing import Any, Final
+from typing import Any, Final, Self
 from uuid import UUID
 
 import anyio
@@ -27,6 +27,7 @@ from pydantic import HttpUrl
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_delay, wait_fixed
 
 from agentstack_server.domain.models.provider import Provider, ProviderDeploymentState
+from agentstack_server.infrastructure.kubernetes.deployment_informer import DeploymentStateInformer, deployment_state
 from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager, global_provider_variables
 from agentstack_server.utils.logs_container import LogsContainer, ProcessLogMessage, ProcessLogType
 from agentstack_server.utils.utils import extract_messages
@@ -59,6 +60,20 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
         self._create_lock = asyncio.Lock()
         self._template_dir = anyio.Path(manifest_template_dir or DEFAULT_TEMPLATE_DIR)
         self._templates: dict[TemplateKind, str] = {}
+        # (uid, generation) of deployments created or scaled up by this manager, see wait_for_startup
+        self._rollouts: dict[UUID, tuple[str, int]] = {}
+        self._informer = DeploymentStateInformer(
+            api_factory,
+            label_selector="managedBy=agentstack",
+            provider_id_from_name=lambda name: self._get_provider_id_from_name(name, TemplateKind.DEPLOY),
+        )
+
+    async def __aenter__(self) -> Self:
+        await self._informer.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._informer.__aexit__(exc_type, exc, tb)
 
     @asynccontextmanager
     async def api(self) -> AsyncIterator[kr8s.asyncio.Api]:
@@ -71,6 +86,9 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
         template = self._templates[kind]
         return yaml.safe_load(Template(template).render(**variables))
 
+    def _track_rollout(self, provider_id: UUID, deployment: APIObject) -> None:
+        self._rollouts[provider_id] = (deployment.metadata.uid, deployment.metadata.generation)
+
     def _get_k8s_name(self, provider_id: UUID, kind: TemplateKind | None = None):
         return f"agentstack-provider-{provider_id}" + (f"-{kind}" if kind else "")
 
@@ -126,7 +144,8 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
                     existing_deployment = await Deployment.get(deployment.metadata.name, api=api)
                     if existing_deployment.metadata.labels["deployment-hash"] == deployment_hash:
                         if existing_deployment.replicas == 0:
-                            await deployment.scale(1)
+                            await existing_deployment.scale(1)
+                            self._track_rollout(provider.id, existing_deployment)
                             return True
                         return False  # Deployment was not modified
                     logger.info(f"Recreating deployment {deployment.metadata.name} due to configuration change")
@@ -137,6 +156,7 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
                     await secret.create()
                     await service.create()
                     await deployment.create()
+                    self._track_rollout(provider.id, deployment)
                     await deployment.adopt(service)
                     await deployment.adopt(secret)
                 except Exception as ex:
@@ -191,51 +211,63 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
         async with self.api() as api:
             deploy = await Deployment.get(name=self._get_k8s_name(provider_id, TemplateKind.DEPLOY), api=api)
             await deploy.scale(1)
+            self._track_rollout(provider_id, deploy)
 
     async def wait_for_startup(self, *, provider_id: UUID, timeout: timedelta) -> None:  # noqa: ASYNC109 (the timeout actually corresponds to kubernetes timeout)
-        async with self.api() as api:
-            deployment = await Deployment.get(name=self._get_k8s_name(provider_id, kind=TemplateKind.DEPLOY), api=api)
-            await deployment.wait("condition=Available", timeout=int(timeout.total_seconds()))
-            # For some reason the first request sometimes doesn't come through
-            # (the service does not route immediately after deploy is available?)
-            async for attempt in AsyncRetrying(
-                stop=stop_after_delay(timedelta(seconds=10)),
-                wait=wait_fixed(timedelta(seconds=0.5)),
-                retry=retry_if_exception_type(HTTPError),
-                reraise=True,
-            ):
-                with attempt:
-                    async with AsyncClient(
-                        base_url=str(await self.get_provider_url(provider_id=provider_id))
-                    ) as client:
-                        resp = await client.get(AGENT_CARD_WELL_KNOWN_PATH, timeout=2)
-                        resp.raise_for_status()
+        if self._informer.synced:
+            # Right after create_or_replace the informer may still report the previous deployment as running
+            await self._informer.wait_for(
+                provider_id,
+                {ProviderDeploymentState.RUNNING},
+                timeout=timeout,
+                min_version=self._rollouts.get(provider_id),
+            )
+        else:
+            async with self.api() as api:
+                deployment = await Deployment.get(
+                    name=self._get_k8s_name(provider_id, kind=TemplateKind.DEPLOY), api=api
+                )
+                await deployment.wait("condition=Available", timeout=int(timeout.total_seconds()))
+        self._rollouts.pop(provider_id, None)
+        # For some reason the first request sometimes doesn't come through
+        # (the service does not route immediately after deploy is available?)
+        async for attempt in AsyncRetrying(
+            stop=stop_after_delay(timedelta(seconds=10)),
+            wait=wait_fixed(timedelta(seconds=0.5)),
+            retry=retry_if_exception_type(HTTPError),
+            reraise=True,
+        ):
+            with attempt:
+                async with AsyncClient(base_url=str(await self.get_provider_url(provider_id=provider_id))) as client:
+                    resp = await client.get(AGENT_CARD_WELL_KNOWN_PATH, timeout=2)
+                    resp.raise_for_status()
 
     async def state(self, *, provider_ids: list[UUID]) -> list[ProviderDeploymentState]:
+        if self._informer.synced:
+            return [self._informer.get(provider_id) for provider_id in provider_ids]
         async with self.api() as api:
             deployments = {
                 self._get_provider_id_from_name(deployment.metadata.name, TemplateKind.DEPLOY): deployment
                 async for deployment in kr8s.asyncio.get(
                     kind="deployment",
                     label_selector={"managedBy": "agentstack"},
+                    # Filter by name on the server when asking for a single provider instead of listing all
+                    field_selector=(
+                        {"metadata.name": self._get_k8s_name(provider_ids[0], TemplateKind.DEPLOY)}
+                        if len(provider_ids) == 1
+                        else None
+                    ),
                     api=api,
                 )
             }
             provider_ids_set = set(provider_ids)
             deployments = {provider_id: d for provider_id, d in deployments.items() if provider_id in provider_ids_set}
-            states = []
-            for provider_id in provider_ids:
-                deployment = deployments.get(provider_id)
-                if not deployment:
-                    state = ProviderDeploymentState.MISSING
-                elif deployment.status.get("availableReplicas", 0) > 0:
-                    state = ProviderDeploymentState.RUNNING
-                elif deployment.status.get("replicas", 0) == 0:
-                    state = ProviderDeploymentState.READY
-                else:
-                    state = ProviderDeploymentState.STARTING
-                states.append(state)
-            return states
+            return [
+                deployment_state(deployment.status)
+                if (deployment := deployments.get(provider_id))
+                else ProviderDeploymentState.MISSING
+                for provider_id in provider_ids
+            ]
 
     async def get_provider_url(self, *, provider_id: UUID) -> HttpUrl:
         return HttpUrl(f"http://{self._get_k8s_name(provider_id, TemplateKind.SVC)}:8000")
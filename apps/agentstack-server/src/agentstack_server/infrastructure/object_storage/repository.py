@@ -1,22 +1,27 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
 from collections.abc import AsyncIterator
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from typing import Any
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Self
 from uuid import UUID
 
 import aioboto3
 import aioboto3.s3.inject
+from aiobotocore.config import AioConfig
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
+from fastapi import status
 from kink import inject
 from pydantic import HttpUrl
 
 from agentstack_server.configuration import Configuration
-from agentstack_server.domain.models.file import AsyncFile, FileMetadata
+from agentstack_server.domain.models.file import AsyncFile, FileMetadata, FileReadOptions
 from agentstack_server.domain.repositories.file import IObjectStorageRepository
-from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.exceptions import EntityNotFoundError, FileReadConditionError
+from agentstack_server.utils.utils import filter_dict
 
 logger = logging.getLogger(__name__)
 
@@ -27,105 +32,172 @@ class S3ObjectStorageRepository(IObjectStorageRepository):
 
     def __init__(self, configuration: Configuration):
         self.config = configuration.object_storage
-
-    def _get_client(self) -> AbstractAsyncContextManager[Any]:
-        session = aioboto3.Session()
-        return session.client(  # pyright: ignore [reportReturnType]
-            "s3",
-            endpoint_url=str(self.config.endpoint_url),
-            aws_access_key_id=self.config.access_key_id.get_secret_value(),
-            aws_secret_access_key=self.config.access_key_secret.get_secret_value(),
-            region_name=self.config.region,
-            use_ssl=self.config.use_ssl,
+        self._session = aioboto3.Session()
+        self._client: Any = None
+        self._client_exit_stack: AsyncExitStack | None = None
+        self._client_lock = asyncio.Lock()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=self.config.multipart_part_size_bytes,
+            multipart_chunksize=self.config.multipart_part_size_bytes,
+            max_concurrency=self.config.multipart_concurrency,
+            max_io_queue=self.config.multipart_concurrency,  # bounds the parts buffered in memory
         )
 
+    async def __aenter__(self) -> Self:
+        await self._get_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        async with self._client_lock:
+            if self._client_exit_stack:
+                await self._client_exit_stack.aclose()
+            self._client, self._client_exit_stack = None, None
+
+    async def _get_client(self) -> Any:
+        """Shared client (and connection pool), created on first use if the repository was not entered."""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    exit_stack = AsyncExitStack()
+                    self._client = await exit_stack.enter_async_context(
+                        self._session.client(  # pyright: ignore [reportArgumentType]
+                            "s3",
+                            endpoint_url=str(self.config.endpoint_url),
+                            aws_access_key_id=self.config.access_key_id.get_secret_value(),
+                            aws_secret_access_key=self.config.access_key_secret.get_secret_value(),
+                            region_name=self.config.region,
+                            use_ssl=self.config.use_ssl,
+                            config=AioConfig(max_pool_connections=self.config.max_pool_connections),
+                        )
+                    )
+                    self._client_exit_stack = exit_stack
+        return self._client
+
     def _get_object_key(self, file_id: UUID) -> str:
         return f"files/{file_id}"
 
     async def upload_file(self, *, file_id: UUID, file: AsyncFile) -> int:
-        object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            await client.upload_fileobj(
-                file,
-                self.config.bucket_name,
-                object_key,
-                ExtraArgs={"ContentType": file.content_type, "Metadata": {"filename": file.filename}},
-            )
-            result = await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-            return result["ContentLength"]
+        client = await self._get_client()
+        size = 0
+
+        async def read(amount: int) -> bytes:
+            nonlocal size
+            chunk = await file.read(amount)
+            size += len(chunk)
+            return chunk
+
+        await client.upload_fileobj(
+            file.model_copy(update={"read": read}),
+            self.config.bucket_name,
+            self._get_object_key(file_id),
+            ExtraArgs={"ContentType": file.content_type, "Metadata": {"filename": file.filename}},
+            Config=self._transfer_config,
+        )
+        return size
 
     @asynccontextmanager
-    async def get_file(self, *, file_id: UUID) -> AsyncIterator[AsyncFile]:
+    async def get_file(self, *, file_id: UUID, options: FileReadOptions | None = None) -> AsyncIterator[AsyncFile]:
         object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            try:
-                response = await client.get_object(Bucket=self.config.bucket_name, Key=object_key)
-
-                async def read(amount: int = 8192) -> bytes:
-                    return await response["Body"].read(amount)
-
-                yield AsyncFile(
-                    filename=response["Metadata"]["filename"], content_type=response["ContentType"], read=read
-                )
-
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
+        client = await self._get_client()
+        options = options or FileReadOptions()
+        request_args = filter_dict(
+            {
+                "Range": options.range,
+                "IfMatch": options.if_match,
+                "IfNoneMatch": options.if_none_match,
+                "IfModifiedSince": options.if_modified_since,
+                "IfUnmodifiedSince": options.if_unmodified_since,
+            }
+        )
+        try:
+            response = await client.get_object(Bucket=self.config.bucket_name, Key=object_key, **request_args)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                raise EntityNotFoundError(entity="file", id=file_id) from e
+            response_metadata = e.response.get("ResponseMetadata", {})
+            status_code = response_metadata.get("HTTPStatusCode")
+            if status_code in {
+                status.HTTP_304_NOT_MODIFIED,
+                status.HTTP_412_PRECONDITION_FAILED,
+                status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            }:
+                headers = response_metadata.get("HTTPHeaders", {})
+                raise FileReadConditionError(
+                    file_id, status_code, etag=headers.get("etag"), last_modified=headers.get("last-modified")
+                ) from e
+            raise
+
+        # Release the connection back to the pool even if the body is not read to the end
+        # StreamingBody.__aenter__ returns the raw aiohttp response, keep reading through the StreamingBody
+        body = response["Body"]
+        async with body:
+
+            async def read(amount: int = 8192) -> bytes:
+                return await body.read(amount)
+
+            yield AsyncFile(
+                filename=response["Metadata"]["filename"],
+                content_type=response["ContentType"],
+                read=read,
+                size=response.get("ContentLength"),
+                etag=response.get("ETag"),
+                last_modified=response.get("LastModified"),
+                content_range=response.get("ContentRange"),
+            )
 
     async def delete_files(self, *, file_ids: list[UUID]) -> None:
         if not file_ids:
             return
 
-        async with self._get_client() as client:
-            # S3 delete_objects supports up to 1000 objects per request
-            chunk_size = 1000
-            for i in range(0, len(file_ids), chunk_size):
-                chunk = file_ids[i : i + chunk_size]
-                objects_to_delete = [{"Key": self._get_object_key(file_id)} for file_id in chunk]
+        client = await self._get_client()
+        # S3 delete_objects supports up to 1000 objects per request
+        chunk_size = 1000
+        for i in range(0, len(file_ids), chunk_size):
+            chunk = file_ids[i : i + chunk_size]
+            objects_to_delete = [{"Key": self._get_object_key(file_id)} for file_id in chunk]
 
-                try:
-                    response = await client.delete_objects(
-                        Bucket=self.config.bucket_name, Delete={"Objects": objects_to_delete}
-                    )
+            try:
+                response = await client.delete_objects(
+                    Bucket=self.config.bucket_name, Delete={"Objects": objects_to_delete}
+                )
 
-                    # Raise if there are any errors from the bulk delete
-                    if response.get("Errors"):
-                        error_messages = [f"{error['Key']}: {error['Message']}" for error in response["Errors"]]
-                        raise RuntimeError(f"Failed to delete some files: {'; '.join(error_messages)}")
+                # Raise if there are any errors from the bulk delete
+                if response.get("Errors"):
+                    error_messages = [f"{error['Key']}: {error['Message']}" for error in response["Errors"]]
+                    raise RuntimeError(f"Failed to delete some files: {'; '.join(error_messages)}")
 
-                except ClientError as e:
-                    logger.error(f"Error bulk deleting files: {e}")
-                    raise
+            except ClientError as e:
+                logger.error(f"Error bulk deleting files: {e}")
+                raise
 
     async def get_file_url(self, *, file_id: UUID) -> HttpUrl:
         object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            try:
-                await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-                url = await client.generate_presigned_url(
-                    "get_object",
-                    Params={"Bucket": self.config.bucket_name, "Key": object_key},
-                    ExpiresIn=3600,  # 1 hour
-                )
-                return HttpUrl(url)
+        client = await self._get_client()
+        try:
+            await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
+            url = await client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.config.bucket_name, "Key": object_key},
+                ExpiresIn=3600,  # 1 hour
+            )
+            return HttpUrl(url)
 
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
+                raise EntityNotFoundError(entity="file", id=file_id) from e
+            raise
 
     async def get_file_metadata(self, *, file_id: UUID) -> FileMetadata:
         object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            try:
-                response = await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-                return FileMetadata(
-                    content_type=response.get("ContentType", ""),
-                    filename=response.get("Metadata", {}).get("filename", ""),
-                    content_length=response.get("ContentLength", 0),
-                )
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
+        client = await self._get_client()
+        try:
+            response = await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
+            return FileMetadata(
+                content_type=response.get("ContentType", ""),
+                filename=response.get("Metadata", {}).get("filename", ""),
+                content_length=response.get("ContentLength", 0),
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
+                raise EntityNotFoundError(entity="file", id=file_id) from e
+            raise
@@ -0,0 +1,48 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""use cosine operator class for vector hnsw indexes
+
+Revision ID: 2446c33b8c49
+Revises: 214ed3790c6d
+Create Date: 2025-11-10 10:12:41.519284
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "2446c33b8c49"
+down_revision: str | None = "214ed3790c6d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _recreate_vector_indexes(opclass: str) -> None:
+    # collections_dim_* tables are created on demand by the vector database repository, not by migrations
+    schema = get_configuration().persistence.vector_db_schema
+    tables = op.get_bind().execute(
+        sa.text("SELECT tablename FROM pg_tables WHERE schemaname = :schema AND tablename LIKE 'collections_dim_%'"),
+        {"schema": schema},
+    )
+    for (table,) in tables.fetchall():
+        op.execute(f'DROP INDEX IF EXISTS "{schema}"."{table}_vector_index"')
+        op.execute(
+            f'CREATE INDEX "{table}_vector_index" ON "{schema}"."{table}" '
+            f"USING hnsw (embedding {opclass}) WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_vector_indexes("halfvec_cosine_ops")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_vector_indexes("halfvec_l2_ops")
@@ -0,0 +1,37 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""context history cursor index
+
+Revision ID: 3e8f0b6a9c21
+Revises: 7a3c1e9d4b52
+Create Date: 2025-11-17 09:41:06.214870
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8f0b6a9c21"
+down_revision: str | None = "7a3c1e9d4b52"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_context_history_context_id_created_at_id",
+        "context_history",
+        ["context_id", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("idx_context_history_context_id", table_name="context_history")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("idx_context_history_context_id", "context_history", ["context_id"], unique=False)
+    op.drop_index("idx_context_history_context_id_created_at_id", table_name="context_history")
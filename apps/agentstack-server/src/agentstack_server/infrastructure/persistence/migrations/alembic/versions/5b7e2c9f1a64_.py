@@ -0,0 +1,40 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""content addressed file storage
+
+Revision ID: 5b7e2c9f1a64
+Revises: 9d2a47c1e8b3
+Create Date: 2025-11-20 10:41:27.318205
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2c9f1a64"
+down_revision: str | None = "9d2a47c1e8b3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("files", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.add_column("files", sa.Column("storage_object_id", sa.UUID(), nullable=True))
+    # existing files are stored under their own id
+    op.execute("UPDATE files SET storage_object_id = id")
+    op.alter_column("files", "storage_object_id", nullable=False)
+    op.create_index("idx_files_content_hash", "files", ["content_hash"], unique=False)
+    op.create_index("idx_files_storage_object_id", "files", ["storage_object_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_files_storage_object_id", table_name="files")
+    op.drop_index("idx_files_content_hash", table_name="files")
+    op.drop_column("files", "storage_object_id")
+    op.drop_column("files", "content_hash")
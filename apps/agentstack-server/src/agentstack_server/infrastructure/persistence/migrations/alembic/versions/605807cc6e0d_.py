@@ -0,0 +1,144 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""partition vector collections by vector store
+
+Revision ID: 605807cc6e0d
+Revises: 2446c33b8c49
+Create Date: 2025-11-12 09:41:07.118052
+
+"""
+
+from collections import defaultdict
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "605807cc6e0d"
+down_revision: str | None = "2446c33b8c49"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copies of the constants in infrastructure/vector_database/vector_db.py at the time of this migration
+SUPPORTED_DIMENSIONS = [64, 128, 256, 312, 384, 512, 768, 896, 1024, 1536, 1792, 2048, 2304, 2560, 3072, 3584, 4000]
+SHARED_PARTITIONS = 16
+COLUMNS = "id, vector_store_id, vector_store_document_id, text, embedding, metadata"
+
+
+def _supported_dimension(dimension: int) -> int:
+    return max((dim for dim in SUPPORTED_DIMENSIONS if dim <= dimension), default=SUPPORTED_DIMENSIONS[0])
+
+
+def _collection_tables(schema: str, relkind: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relkind = :relkind AND c.relname ~ '^collections_dim_[0-9]+$'"
+        ),
+        {"schema": schema, "relkind": relkind},
+    )
+    return list(result.scalars())
+
+
+def _create_table(schema: str, table: str, partition_by: str | None) -> None:
+    dimension = int(table.removeprefix("collections_dim_"))
+    op.execute(
+        f'CREATE TABLE "{schema}"."{table}" ('
+        "id UUID NOT NULL, "
+        "vector_store_id UUID NOT NULL, "
+        "vector_store_document_id VARCHAR(256) NOT NULL, "
+        "text TEXT NOT NULL, "
+        f"embedding HALFVEC({dimension}) NOT NULL, "
+        "metadata JSONB, "
+        "PRIMARY KEY (id, vector_store_id), "
+        "CONSTRAINT fk_collections_to_documents FOREIGN KEY (vector_store_document_id, vector_store_id) "
+        "REFERENCES vector_store_documents (id, vector_store_id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED"
+        f"){f' PARTITION BY {partition_by}' if partition_by else ''}"
+    )
+
+
+def _create_indexes(schema: str, table: str) -> None:
+    op.execute(
+        f'CREATE INDEX "{table}_vector_index" ON "{schema}"."{table}" '
+        "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)"
+    )
+    op.execute(
+        f'CREATE INDEX "{table}_vector_store_id_index" ON "{schema}"."{table}" '
+        "(vector_store_id, vector_store_document_id)"
+    )
+
+
+def _rename_to_legacy(schema: str, table: str) -> str:
+    legacy = f"{table}_legacy"
+    op.execute(f'ALTER TABLE "{schema}"."{table}" RENAME TO "{legacy}"')
+    op.execute(f'ALTER INDEX "{schema}"."{table}_pkey" RENAME TO "{legacy}_pkey"')
+    op.execute(f'DROP INDEX "{schema}"."{table}_vector_index"')
+    op.execute(f'DROP INDEX "{schema}"."{table}_vector_store_id_index"')
+    return legacy
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    op.add_column("vector_stores", sa.Column("partition", sa.String(length=63), nullable=True))
+
+    for table in _collection_tables(schema, relkind="r"):
+        legacy = _rename_to_legacy(schema, table)
+        _create_table(schema, table, partition_by="LIST (vector_store_id)")
+        op.execute(
+            f'CREATE TABLE "{schema}"."{table}_shared" PARTITION OF "{schema}"."{table}" '
+            "DEFAULT PARTITION BY HASH (vector_store_id)"
+        )
+        for remainder in range(SHARED_PARTITIONS):
+            op.execute(
+                f'CREATE TABLE "{schema}"."{table}_shared_{remainder}" PARTITION OF "{schema}"."{table}_shared" '
+                f"FOR VALUES WITH (MODULUS {SHARED_PARTITIONS}, REMAINDER {remainder})"
+            )
+        op.execute(f'INSERT INTO "{schema}"."{table}" ({COLUMNS}) SELECT {COLUMNS} FROM "{schema}"."{legacy}"')
+        op.execute(f'DROP TABLE "{schema}"."{legacy}"')
+        # Indexes are created after the data is copied so that each partition's HNSW graph is built in bulk
+        _create_indexes(schema, table)
+
+    vector_stores_by_table = defaultdict(list)
+    for id, dimension in op.get_bind().execute(sa.text("SELECT id, dimension FROM vector_stores")):
+        vector_stores_by_table[f"collections_dim_{_supported_dimension(dimension)}"].append(id)
+    for table in set(_collection_tables(schema, relkind="p")) & vector_stores_by_table.keys():
+        op.get_bind().execute(
+            sa.text(
+                "UPDATE vector_stores SET partition = :partition || '_' || remainder "
+                "FROM generate_series(0, :modulus - 1) AS remainder "
+                "WHERE vector_stores.id = ANY(:ids) "
+                "AND satisfies_hash_partition("
+                "CAST(:qualified_partition AS regclass), :modulus, remainder, vector_stores.id)"
+            ),
+            {
+                "partition": f"{table}_shared",
+                "qualified_partition": f'"{schema}"."{table}_shared"',
+                "modulus": SHARED_PARTITIONS,
+                "ids": vector_stores_by_table[table],
+            },
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _collection_tables(schema, relkind="p"):
+        op.execute(f'ALTER TABLE "{schema}"."{table}" RENAME TO "{table}_partitioned"')
+        op.execute(f'ALTER INDEX "{schema}"."{table}_pkey" RENAME TO "{table}_partitioned_pkey"')
+        op.execute(f'ALTER INDEX "{schema}"."{table}_vector_index" RENAME TO "{table}_partitioned_vector_index"')
+        op.execute(
+            f'ALTER INDEX "{schema}"."{table}_vector_store_id_index" '
+            f'RENAME TO "{table}_partitioned_vector_store_id_index"'
+        )
+        _create_table(schema, table, partition_by=None)
+        op.execute(
+            f'INSERT INTO "{schema}"."{table}" ({COLUMNS}) SELECT {COLUMNS} FROM "{schema}"."{table}_partitioned"'
+        )
+        op.execute(f'DROP TABLE "{schema}"."{table}_partitioned" CASCADE')
+        _create_indexes(schema, table)
+    op.drop_column("vector_stores", "partition")
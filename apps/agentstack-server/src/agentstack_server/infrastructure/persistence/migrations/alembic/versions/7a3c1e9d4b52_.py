@@ -0,0 +1,47 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""notify user changes
+
+Revision ID: 7a3c1e9d4b52
+Revises: 605807cc6e0d
+Create Date: 2025-11-14 10:12:43.508311
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3c1e9d4b52"
+down_revision: str | None = "605807cc6e0d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of USER_CHANGED_CHANNEL in domain/constants.py at the time of this migration
+USER_CHANGED_CHANNEL = "user_changed"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"""
+        CREATE FUNCTION notify_user_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('{USER_CHANGED_CHANNEL}', OLD.id::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER users_notify_changed AFTER UPDATE OR DELETE ON users "
+        "FOR EACH ROW EXECUTE FUNCTION notify_user_changed()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_changed()")
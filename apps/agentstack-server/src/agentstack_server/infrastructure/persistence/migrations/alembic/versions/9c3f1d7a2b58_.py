@@ -0,0 +1,57 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""add full-text search column to vector collections
+
+Revision ID: 9c3f1d7a2b58
+Revises: e4a61c0b7d95
+Create Date: 2025-11-26 14:07:33.521894
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "9c3f1d7a2b58"
+down_revision: str | None = "e4a61c0b7d95"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of TEXT_SEARCH_CONFIG in infrastructure/vector_database/vector_db.py at the time of this migration
+TEXT_SEARCH_CONFIG = "simple"
+
+
+def _collection_tables(schema: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relkind = 'p' AND c.relname ~ '^collections_dim_[0-9]+$'"
+        ),
+        {"schema": schema},
+    )
+    return list(result.scalars())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _collection_tables(schema):
+        # the column and index are propagated to all partitions, existing rows are rewritten to compute the column
+        op.execute(
+            f'ALTER TABLE "{schema}"."{table}" ADD COLUMN text_search tsvector '
+            f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', text)) STORED"
+        )
+        op.execute(f'CREATE INDEX "{table}_text_search_index" ON "{schema}"."{table}" USING gin (text_search)')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _collection_tables(schema):
+        op.execute(f'DROP INDEX IF EXISTS "{schema}"."{table}_text_search_index"')
+        op.execute(f'ALTER TABLE "{schema}"."{table}" DROP COLUMN IF EXISTS text_search')
@@ -0,0 +1,39 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""keyset pagination indexes
+
+Revision ID: 9d2a47c1e8b3
+Revises: 3e8f0b6a9c21
+Create Date: 2025-11-18 14:05:52.730114
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2a47c1e8b3"
+down_revision: str | None = "3e8f0b6a9c21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "idx_contexts_created_by_created_at_id", "contexts", ["created_by", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "idx_provider_builds_created_by_created_at_id",
+        "provider_builds",
+        ["created_by", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_provider_builds_created_by_created_at_id", table_name="provider_builds")
+    op.drop_index("idx_contexts_created_by_created_at_id", table_name="contexts")
@@ -0,0 +1,51 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+"""notify model provider changes
+
+Revision ID: e4a61c0b7d95
+Revises: 5b7e2c9f1a64
+Create Date: 2025-11-24 09:18:52.640137
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a61c0b7d95"
+down_revision: str | None = "5b7e2c9f1a64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of MODEL_PROVIDER_CHANGED_CHANNEL in domain/constants.py at the time of this migration
+MODEL_PROVIDER_CHANGED_CHANNEL = "model_provider_changed"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"""
+        CREATE FUNCTION notify_model_provider_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('{MODEL_PROVIDER_CHANGED_CHANNEL}', OLD.id::text);
+            ELSE
+                PERFORM pg_notify('{MODEL_PROVIDER_CHANGED_CHANNEL}', NEW.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER model_providers_notify_changed AFTER INSERT OR UPDATE OR DELETE ON model_providers "
+        "FOR EACH ROW EXECUTE FUNCTION notify_model_provider_changed()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS model_providers_notify_changed ON model_providers")
+    op.execute("DROP FUNCTION IF EXISTS notify_model_provider_changed()")
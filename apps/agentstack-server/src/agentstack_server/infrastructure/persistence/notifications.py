@@ -0,0 +1,77 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import suppress
+from datetime import timedelta
+from typing import Self
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from agentstack_server.domain.repositories.notifications import INotificationListener, NotificationCallback
+from agentstack_server.utils.utils import cancel_task
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresNotificationListener(INotificationListener):
+    """Dispatches Postgres NOTIFY messages to subscribers, listening on a single dedicated connection."""
+
+    RECONNECT_DELAY = timedelta(seconds=5)
+    HEALTHCHECK_INTERVAL = timedelta(seconds=30)
+
+    def __init__(self, engine: AsyncEngine):
+        self._engine = engine
+        self._subscribers: dict[str, list[NotificationCallback]] = defaultdict(list)
+        self._task: asyncio.Task[None] | None = None
+
+    def subscribe(self, channel: str, callback: NotificationCallback) -> None:
+        if self._task:
+            raise RuntimeError("Subscribe before the listener is started")
+        self._subscribers[channel].append(callback)
+
+    async def __aenter__(self) -> Self:
+        self._task = asyncio.create_task(self._listen())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await cancel_task(self._task)
+        self._task = None
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for callback in self._subscribers.get(channel, []):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception(f"Notification callback for channel {channel} failed")
+
+    def _reset(self) -> None:
+        for channel in self._subscribers:
+            self._dispatch(channel, None)
+
+    def _on_notification(self, _connection, _pid: int, channel: str, payload: str) -> None:
+        self._dispatch(channel, payload)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._engine.connect() as connection:
+                    try:
+                        driver_connection = (await connection.get_raw_connection()).driver_connection
+                        assert driver_connection is not None
+                        for channel in self._subscribers:
+                            await driver_connection.add_listener(channel, self._on_notification)
+                        self._reset()  # notifications sent before the listener was attached are lost
+                        while True:
+                            await asyncio.sleep(self.HEALTHCHECK_INTERVAL.total_seconds())
+                            await driver_connection.execute("SELECT 1")
+                    finally:
+                        # never return a connection with active listeners to the pool
+                        with suppress(Exception):
+                            await connection.invalidate()
+            except Exception as ex:
+                logger.warning(f"Notification listener disconnected: {ex!r}")
+            self._reset()
+            await asyncio.sleep(self.RECONNECT_DELAY.total_seconds())
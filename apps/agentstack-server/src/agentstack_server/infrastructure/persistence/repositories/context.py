@@ -17,12 +17,13 @@ from sqlalchemy import (
     Table,
     delete,
     select,
+    tuple_,
     update,
 )
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.common import Metadata, PaginatedResult
+from agentstack_server.domain.models.common import Metadata, PaginatedResult, TotalCount
 from agentstack_server.domain.models.context import Context, ContextHistoryItem, TitleGenerationState
 from agentstack_server.domain.repositories.context import IContextRepository
 from agentstack_server.exceptions import EntityNotFoundError
@@ -40,6 +41,7 @@ contexts_table = Table(
     Column("created_by", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
     Column("provider_id", ForeignKey("providers.id", ondelete="CASCADE"), nullable=True),
     Column("metadata", JSON, nullable=True),
+    Index("idx_contexts_created_by_created_at_id", "created_by", "created_at", "id"),
 )
 
 context_history_table = Table(
@@ -49,7 +51,7 @@ context_history_table = Table(
     Column("context_id", ForeignKey("contexts.id", ondelete="CASCADE"), nullable=False),
     Column("created_at", DateTime(timezone=True), nullable=False),
     Column("data", JSON, nullable=False),
-    Index("idx_context_history_context_id", "context_id"),
+    Index("idx_context_history_context_id_created_at_id", "context_id", "created_at", "id"),
 )
 
 
@@ -77,11 +79,12 @@ class SqlAlchemyContextRepository(IContextRepository):
         user_id: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         order: str = "desc",
         order_by: str = "created_at",
         include_empty: bool = True,
         last_active_before: datetime | None = None,
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult:
         query = contexts_table.select()
         if user_id is not None:
@@ -105,12 +108,14 @@ class SqlAlchemyContextRepository(IContextRepository):
             after_cursor=page_token,
             order=order,
             order_column=getattr(contexts_table.c, order_by),
+            total_count=total_count,
         )
 
         return PaginatedResult(
             items=[self._row_to_context(row) for row in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_page_token,
         )
 
     async def create(self, *, context: Context) -> None:
@@ -191,10 +196,11 @@ class SqlAlchemyContextRepository(IContextRepository):
         self,
         *,
         context_id: UUID,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         limit: int = 20,
         order_by: str = "created_at",
         order="desc",
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult[ContextHistoryItem]:
         query = context_history_table.select().where(context_history_table.c.context_id == context_id)
         result = await cursor_paginate(
@@ -205,13 +211,39 @@ class SqlAlchemyContextRepository(IContextRepository):
             order_column=getattr(context_history_table.c, order_by),
             order=order,
             limit=limit,
+            total_count=total_count,
         )
         return PaginatedResult(
             items=[self._row_to_context_history_item(item) for item in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_page_token,
         )
 
+    async def get_history_item(self, *, context_id: UUID, history_item_id: UUID) -> ContextHistoryItem:
+        query = context_history_table.select().where(
+            context_history_table.c.context_id == context_id, context_history_table.c.id == history_item_id
+        )
+        result = await self._connection.execute(query)
+        if not (row := result.fetchone()):
+            raise EntityNotFoundError(entity="context_history_item", id=history_item_id)
+        return self._row_to_context_history_item(row)
+
+    async def stream_history(
+        self, *, context_id: UUID, after: ContextHistoryItem | None = None
+    ) -> AsyncIterator[ContextHistoryItem]:
+        query = (
+            context_history_table.select()
+            .where(context_history_table.c.context_id == context_id)
+            .order_by(context_history_table.c.created_at, context_history_table.c.id)
+        )
+        if after:
+            query = query.where(
+                tuple_(context_history_table.c.created_at, context_history_table.c.id) > (after.created_at, after.id)
+            )
+        async for row in await self._connection.stream(query):
+            yield self._row_to_context_history_item(row)
+
     def _row_to_context_history_item(self, row: Row) -> ContextHistoryItem:
         return ContextHistoryItem(
             id=row.id,
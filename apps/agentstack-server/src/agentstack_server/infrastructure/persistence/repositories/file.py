@@ -1,7 +1,7 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable, Sequence
 from typing import Any, cast
 from uuid import UUID
 
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Row,
     String,
@@ -22,7 +23,7 @@ from sqlalchemy import (
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.file import ExtractionStatus, File, FileType, TextExtraction
+from agentstack_server.domain.models.file import ExtractionMetadata, ExtractionStatus, File, FileType, TextExtraction
 from agentstack_server.domain.repositories.file import IFileRepository
 from agentstack_server.exceptions import EntityNotFoundError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
@@ -40,6 +41,10 @@ files_table = Table(
     Column("file_type", sql_enum(FileType, name="file_type"), nullable=False),
     Column("parent_file_id", ForeignKey("files.id", ondelete="CASCADE"), nullable=True),
     Column("context_id", ForeignKey("contexts.id", ondelete="CASCADE"), nullable=True),
+    Column("content_hash", String(64), nullable=True),
+    Column("storage_object_id", SQL_UUID, nullable=False),
+    Index("idx_files_content_hash", "content_hash"),
+    Index("idx_files_storage_object_id", "storage_object_id"),
 )
 
 text_extractions_table = Table(
@@ -82,6 +87,8 @@ class SqlAlchemyFileRepository(IFileRepository):
             "file_type": file.file_type,
             "parent_file_id": file.parent_file_id,
             "context_id": file.context_id,
+            "content_hash": file.content_hash,
+            "storage_object_id": file.object_id,
         }
 
     def _to_file(self, row: Row):
@@ -96,6 +103,8 @@ class SqlAlchemyFileRepository(IFileRepository):
                 "file_type": row.file_type,
                 "parent_file_id": row.parent_file_id,
                 "context_id": row.context_id,
+                "content_hash": row.content_hash,
+                "storage_object_id": row.storage_object_id,
             }
         )
 
@@ -125,6 +134,21 @@ class SqlAlchemyFileRepository(IFileRepository):
             raise EntityNotFoundError(entity="file", id=file_id)
         return self._to_file(row)
 
+    async def get_many(
+        self, *, file_ids: Sequence[UUID], user_id: UUID | None = None, context_id: UUID | None = None
+    ) -> Sequence[File]:
+        """Return files that exist (and match the filters), in the order of file_ids."""
+        if not file_ids:
+            return []
+        query = files_table.select().where(files_table.c.id.in_(file_ids))
+        if user_id:
+            query = query.where(files_table.c.created_by == user_id)
+        if context_id:
+            query = query.where(files_table.c.context_id == context_id)
+        result = await self.connection.execute(query)
+        files = {file.id: file for file in map(self._to_file, result.fetchall())}
+        return [files[file_id] for file_id in dict.fromkeys(file_ids) if file_id in files]
+
     async def delete(
         self, *, file_id: UUID | None = None, user_id: UUID | None = None, context_id: UUID | None = None
     ) -> int:
@@ -148,6 +172,35 @@ class SqlAlchemyFileRepository(IFileRepository):
             raise EntityNotFoundError("file", file_id or "file to delete")
         return result.rowcount
 
+    async def find_storage_object(self, *, content_hash: str) -> UUID | None:
+        """Object with the given content, the referencing row is locked so that the object is not deleted."""
+        query = (
+            select(files_table.c.storage_object_id)
+            .where(files_table.c.content_hash == content_hash)
+            .limit(1)
+            .with_for_update(read=True)
+        )
+        return await self.connection.scalar(query)
+
+    async def list_storage_object_ids(
+        self, *, file_id: UUID | None = None, context_id: UUID | None = None
+    ) -> Sequence[UUID]:
+        """Objects of the matching files including their extracted text files."""
+        query = select(files_table.c.storage_object_id).distinct()
+        if file_id is not None:
+            query = query.where((files_table.c.id == file_id) | (files_table.c.parent_file_id == file_id))
+        if context_id is not None:
+            query = query.where(files_table.c.context_id == context_id)
+        return (await self.connection.scalars(query)).all()
+
+    async def filter_unreferenced_objects(self, *, object_ids: Iterable[UUID]) -> Sequence[UUID]:
+        object_ids = set(object_ids)
+        if not object_ids:
+            return []
+        query = select(files_table.c.storage_object_id).where(files_table.c.storage_object_id.in_(object_ids))
+        referenced = set((await self.connection.scalars(query)).all())
+        return list(object_ids - referenced)
+
     async def list(self, *, user_id: UUID | None = None, context_id: UUID | None = None) -> AsyncIterator[File]:
         query = files_table.select().where(files_table.c.file_type == FileType.USER_UPLOAD)
         if user_id:
@@ -221,6 +274,28 @@ class SqlAlchemyFileRepository(IFileRepository):
         )
         await self.connection.execute(query)
 
+    async def find_extracted_file(self, *, content_hash: str, metadata: ExtractionMetadata) -> File | None:
+        """Text file of a completed extraction of the same content, locked so that its object is not deleted."""
+        source_files = files_table.alias("source_files")
+        query = (
+            select(files_table)
+            .select_from(
+                text_extractions_table.join(source_files, text_extractions_table.c.file_id == source_files.c.id).join(
+                    files_table, text_extractions_table.c.extracted_file_id == files_table.c.id
+                )
+            )
+            .where(
+                source_files.c.content_hash == content_hash,
+                text_extractions_table.c.status == ExtractionStatus.COMPLETED,
+                text_extractions_table.c.extraction_metadata["backend"].as_string() == metadata.backend,
+                text_extractions_table.c.extraction_metadata["version"].as_string() == metadata.version,
+            )
+            .limit(1)
+            .with_for_update(read=True, of=files_table)
+        )
+        result = await self.connection.execute(query)
+        return self._to_file(row) if (row := result.fetchone()) else None
+
     async def delete_extraction(self, *, extraction_id: UUID) -> int:
         query = text_extractions_table.delete().where(text_extractions_table.c.id == extraction_id)
         result = await self.connection.execute(query)
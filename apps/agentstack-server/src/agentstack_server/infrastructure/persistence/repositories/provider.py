@@ -1,7 +1,7 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterable
 from datetime import timedelta
 from typing import Any
 from uuid import UUID
@@ -12,7 +12,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import delete, select
 
-from agentstack_server.domain.models.provider import Provider, ProviderType, UnmanagedState
+from agentstack_server.domain.models.provider import Provider, ProviderLocation, ProviderType, UnmanagedState
 from agentstack_server.domain.repositories.provider import IProviderRepository
 from agentstack_server.exceptions import DuplicateEntityError, EntityNotFoundError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
@@ -104,8 +104,16 @@ class SqlAlchemyProviderRepository(IProviderRepository):
 
         return self._to_provider(row)
 
-    async def update_last_accessed(self, *, provider_id: UUID) -> None:
-        query = providers_table.update().where(providers_table.c.id == provider_id).values(last_active_at=utc_now())
+    async def get_by_source(self, *, source: ProviderLocation) -> Provider:
+        query = select(providers_table).where(providers_table.c.source == str(source.root))
+        result = await self.connection.execute(query)
+        if not (row := result.fetchone()):
+            raise EntityNotFoundError(entity="provider", id=str(source.root))
+
+        return self._to_provider(row)
+
+    async def update_last_accessed(self, *, provider_ids: Iterable[UUID]) -> None:
+        query = providers_table.update().where(providers_table.c.id.in_(provider_ids)).values(last_active_at=utc_now())
         await self.connection.execute(query)
 
     async def delete(self, *, provider_id: UUID, user_id: UUID | None = None) -> int:
@@ -5,12 +5,12 @@ from collections.abc import AsyncIterator
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Row, String, Table, Text
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Row, String, Table, Text
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import select
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.provider_build import BuildState, ProviderBuild
 from agentstack_server.domain.repositories.provider_build import IProviderBuildRepository
 from agentstack_server.exceptions import EntityNotFoundError
@@ -31,6 +31,7 @@ provider_builds_table = Table(
     Column("on_complete", JSON, nullable=False),
     Column("error_message", Text, nullable=True),
     Column("destination", String(512), nullable=False),
+    Index("idx_provider_builds_created_by_created_at_id", "created_by", "created_at", "id"),
 )
 
 
@@ -117,12 +118,13 @@ class SqlAlchemyProviderBuildRepository(IProviderBuildRepository):
         self,
         *,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: str | None = None,
         order: str = "desc",
         order_by: str = "created_at",
         status: BuildState | None = None,
         user_id: UUID | None = None,
         exclude_user_id: UUID | None = None,
+        total_count: TotalCount = TotalCount.ESTIMATE,
     ) -> PaginatedResult[ProviderBuild]:
         query = provider_builds_table.select()
         if user_id:
@@ -140,10 +142,12 @@ class SqlAlchemyProviderBuildRepository(IProviderBuildRepository):
             after_cursor=page_token,
             order=order,
             order_column=getattr(provider_builds_table.c, order_by),
+            total_count=total_count,
         )
 
         return PaginatedResult(
             items=[self._to_provider_build(row) for row in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_page_token,
         )
@@ -1,12 +1,14 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
-from datetime import timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import batched
 from uuid import UUID
 
 from kink import inject
 from sqlalchemy import UUID as SQL_UUID
-from sqlalchemy import Boolean, Column, DateTime, Row, String, Table, bindparam, text
+from sqlalchemy import Boolean, Column, DateTime, Row, String, Table, bindparam, column, func, text, values
 from sqlalchemy.ext.asyncio import AsyncConnection
 
 from agentstack_server.domain.models.a2a_request import A2ARequestTask
@@ -36,8 +38,55 @@ a2a_request_contexts_table = Table(
 )
 
 
+_track_request_ids_ownership_query = text("""
+    WITH task_insert AS (
+             INSERT INTO a2a_request_tasks (task_id, created_by, provider_id, created_at, last_accessed_at)
+                 SELECT :task_id, :user_id, :provider_id, :now, :now
+                 WHERE :task_id IS NOT NULL AND :allow_task_creation = true
+                 ON CONFLICT (task_id) DO NOTHING
+                 RETURNING true as inserted),
+         task_update AS (
+             UPDATE a2a_request_tasks
+                 SET last_accessed_at = :now
+                 WHERE task_id = :task_id AND created_by = :user_id
+                 RETURNING true as updated),
+         context_insert AS (
+             INSERT INTO a2a_request_contexts (context_id, created_by, provider_id, created_at, last_accessed_at)
+                 SELECT :context_id, :user_id, :provider_id, :now, :now
+                 WHERE :context_id IS NOT NULL
+                 ON CONFLICT (context_id) DO NOTHING
+                 RETURNING true as inserted),
+         context_update AS (
+             UPDATE a2a_request_contexts
+                 SET last_accessed_at = :now
+                 WHERE context_id = :context_id AND created_by = :user_id
+                 RETURNING true as updated)
+    SELECT CASE
+               WHEN :task_id IS NULL THEN true
+               WHEN EXISTS (SELECT 1 FROM task_insert) THEN true
+               WHEN EXISTS (SELECT 1 FROM task_update) THEN true
+               ELSE false
+               END as task_authorized,
+           CASE
+               WHEN :context_id IS NULL THEN true
+               WHEN EXISTS (SELECT 1 FROM context_insert) THEN true
+               WHEN EXISTS (SELECT 1 FROM context_update) THEN true
+               ELSE false
+               END as context_authorized
+""").bindparams(
+    bindparam("task_id", type_=String),
+    bindparam("context_id", type_=String),
+    bindparam("user_id", type_=SQL_UUID()),
+    bindparam("provider_id", type_=SQL_UUID()),
+    bindparam("allow_task_creation", type_=Boolean),
+    bindparam("now", type_=DateTime(timezone=True)),
+)
+
+
 @inject
 class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
+    LAST_ACCESSED_BATCH_SIZE = 1000
+
     def __init__(self, connection: AsyncConnection):
         self._connection = connection
 
@@ -73,63 +122,16 @@ class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
         # - Existing owned: Updates last_accessed_at and returns true
         # - Existing owned by OTHER user: ON CONFLICT WHERE clause prevents update, returns false
 
-        now = utc_now()
-
-        query = text("""
-                     WITH task_insert AS (
-                              INSERT INTO a2a_request_tasks (task_id, created_by, provider_id, created_at, last_accessed_at)
-                                  SELECT :task_id, :user_id, :provider_id, :now, :now
-                                  WHERE :task_id IS NOT NULL AND :allow_task_creation = true
-                                  ON CONFLICT (task_id) DO NOTHING
-                                  RETURNING true as inserted),
-                          task_update AS (
-                              UPDATE a2a_request_tasks
-                                  SET last_accessed_at = :now
-                                  WHERE task_id = :task_id AND created_by = :user_id
-                                  RETURNING true as updated),
-                          context_insert AS (
-                              INSERT INTO a2a_request_contexts (context_id, created_by, provider_id, created_at, last_accessed_at)
-                                  SELECT :context_id, :user_id, :provider_id, :now, :now
-                                  WHERE :context_id IS NOT NULL
-                                  ON CONFLICT (context_id) DO NOTHING
-                                  RETURNING true as inserted),
-                          context_update AS (
-                              UPDATE a2a_request_contexts
-                                  SET last_accessed_at = :now
-                                  WHERE context_id = :context_id AND created_by = :user_id
-                                  RETURNING true as updated)
-                     SELECT CASE
-                                WHEN :task_id IS NULL THEN true
-                                WHEN EXISTS (SELECT 1 FROM task_insert) THEN true
-                                WHEN EXISTS (SELECT 1 FROM task_update) THEN true
-                                ELSE false
-                                END as task_authorized,
-                            CASE
-                                WHEN :context_id IS NULL THEN true
-                                WHEN EXISTS (SELECT 1 FROM context_insert) THEN true
-                                WHEN EXISTS (SELECT 1 FROM context_update) THEN true
-                                ELSE false
-                                END as context_authorized
-                     """).bindparams(
-            bindparam("task_id", type_=String),
-            bindparam("context_id", type_=String),
-            bindparam("user_id", type_=SQL_UUID()),
-            bindparam("provider_id", type_=SQL_UUID()),
-            bindparam("allow_task_creation", type_=Boolean),
-            bindparam("now", type_=DateTime(timezone=True)),
-        )
-
         result = await self._connection.execute(
-            query,
+            _track_request_ids_ownership_query,
             {
                 "task_id": task_id,
                 "context_id": context_id,
                 "user_id": user_id,
                 "provider_id": provider_id,
                 "allow_task_creation": allow_task_creation,
-                "now": now,
+                "now": utc_now(),
             },
-            execution_options={"compiled_cache": None},
         )
 
         if not (row := result.first()):
@@ -141,6 +143,28 @@ class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
             assert context_id
             raise ForbiddenUpdateError(entity="a2a_request_context", id=context_id)
 
+    async def update_last_accessed(
+        self,
+        *,
+        tasks: Mapping[str, datetime] | None = None,
+        contexts: Mapping[str, datetime] | None = None,
+    ) -> None:
+        """Bulk update last_accessed_at of already verified tasks and contexts using UPDATE ... FROM (VALUES ...)."""
+        for table, id_column, accessed in (
+            (a2a_request_tasks_table, "task_id", tasks),
+            (a2a_request_contexts_table, "context_id", contexts),
+        ):
+            for chunk in batched((accessed or {}).items(), self.LAST_ACCESSED_BATCH_SIZE, strict=False):
+                batch = values(
+                    column(id_column, String), column("accessed_at", DateTime(timezone=True)), name="batch"
+                ).data(list(chunk))
+                query = (
+                    table.update()
+                    .where(table.c[id_column] == batch.c[id_column])
+                    .values(last_accessed_at=func.greatest(table.c.last_accessed_at, batch.c.accessed_at))
+                )
+                await self._connection.execute(query)
+
     async def get_task(self, *, task_id: str, user_id: UUID) -> A2ARequestTask:
         """Get a task by task_id if owned by the user."""
         query = a2a_request_tasks_table.select().where(
@@ -1,23 +1,78 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import base64
+import functools
+import json
 from collections.abc import Sequence
 from enum import StrEnum
-from typing import NamedTuple
+from typing import Any, NamedTuple
 from uuid import UUID
 
-from sqlalchemy import Column, Enum, Row, Select, func, select
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import ClauseElement, Column, Enum, Executable, Row, Select, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from agentstack_server.domain.models.common import TotalCount
+from agentstack_server.exceptions import InvalidPageTokenError
 
 
 def sql_enum(enum: type[StrEnum], **kwargs) -> Enum:
     return Enum(enum, values_callable=lambda x: [e.value for e in x], **kwargs)
 
 
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a select, bind parameters are processed as in the wrapped statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+async def estimate_count(connection: AsyncConnection, query: Select) -> int:
+    """
+    Row count estimated by the planner from table statistics, respecting the query filters. Falls back to an exact
+    count if the planner returns no plan.
+    """
+    plan = (await connection.execute(Explain(query))).scalar()
+    plan = json.loads(plan) if isinstance(plan, str | bytes) else plan
+    if not plan:
+        count_query = select(func.count()).select_from(query.subquery())
+        return (await connection.execute(count_query)).scalar() or 0
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+@functools.cache
+def _type_adapter(python_type: type) -> TypeAdapter:
+    return TypeAdapter(python_type)
+
+
+def encode_page_token(order_value: Any, id: UUID) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([order_value, id])).rstrip(b"=").decode()
+
+
+def decode_page_token(page_token: str, order_column: Column) -> tuple[Any, UUID]:
+    try:
+        order_value, id = orjson.loads(base64.urlsafe_b64decode(page_token + "=" * (-len(page_token) % 4)))
+        return _type_adapter(order_column.type.python_type).validate_python(order_value), UUID(id)
+    except (ValueError, TypeError, ValidationError) as ex:
+        raise InvalidPageTokenError(page_token) from ex
+
+
 class CursorPaginationResult(NamedTuple):
     items: Sequence[Row]
     total_count: int
     has_more: bool
+    next_page_token: str | None
 
 
 async def cursor_paginate(
@@ -26,45 +81,40 @@ async def cursor_paginate(
     order_column: Column,
     id_column: Column,
     limit: int,
-    after_cursor: UUID | None = None,
+    after_cursor: str | UUID | None = None,
     order: str = "desc",
+    total_count: TotalCount = TotalCount.ESTIMATE,
 ) -> CursorPaginationResult:
     """
-    Implements cursor-based pagination for non-unique columns.
+    Implements keyset pagination for non-unique columns.
 
-    For non-unique columns, we use a composite cursor approach:
-    - Primary cursor: the order column value
-    - Secondary cursor: the ID for tie-breaking
+    The page token encodes the (order column value, id) pair of the last returned row, so the next page is a single
+    range scan over an index on (<filter columns>, order column, id), with the id breaking ties in the order column.
+    Plain UUID tokens (the id of the last row) are still accepted and resolved with an extra lookup.
 
-    This ensures stable, consistent pagination even when multiple rows
-    have the same value in the order column.
+    The total count of the remaining rows is either exact (a full count query) or estimated by the planner. If the
+    page holds all remaining rows the count is known without any query.
     """
 
-    # Apply cursor filtering if after_cursor is provided
-    if after_cursor:
-        # Get the cursor row's order column value and ID
+    if isinstance(after_cursor, str):
+        try:
+            after_cursor = UUID(after_cursor)
+        except ValueError:
+            cursor = decode_page_token(after_cursor, order_column)
+        else:
+            cursor_query = select(order_column, id_column).where(id_column == after_cursor)
+            cursor = (await connection.execute(cursor_query)).fetchone()
+    elif after_cursor:
         cursor_query = select(order_column, id_column).where(id_column == after_cursor)
-        cursor_result = await connection.execute(cursor_query)
-        cursor_row = cursor_result.fetchone()
-
-        if cursor_row:
-            cursor_order_value = cursor_row[0]  # order column value
-            cursor_id = cursor_row[1]  # ID value
-
-            if order == "desc":
-                # For descending: include rows where order_col < cursor_value
-                # OR (order_col = cursor_value AND id < cursor_id)
-                query = query.where(
-                    (order_column < cursor_order_value)
-                    | ((order_column == cursor_order_value) & (id_column < cursor_id))
-                )
-            else:
-                # For ascending: include rows where order_col > cursor_value
-                # OR (order_col = cursor_value AND id > cursor_id)
-                query = query.where(
-                    (order_column > cursor_order_value)
-                    | ((order_column == cursor_order_value) & (id_column > cursor_id))
-                )
+        cursor = (await connection.execute(cursor_query)).fetchone()
+    else:
+        cursor = None
+
+    if cursor:
+        keyset = tuple_(order_column, id_column)
+        query = query.where(keyset < tuple(cursor) if order == "desc" else keyset > tuple(cursor))
+
+    count_query_base = query
 
     # Apply ordering with tie-breaking by ID
     if order == "desc":
@@ -73,19 +123,18 @@ async def cursor_paginate(
         query = query.order_by(order_column.asc(), id_column.asc())
 
     # Fetch one more than limit to determine if there are more results
-    count_query_base = query.order_by(None)
-    query = query.limit(limit + 1)
-
-    # Execute query
-    result = await connection.execute(query)
-    rows = result.fetchall()
-
+    rows = (await connection.execute(query.limit(limit + 1))).fetchall()
     has_more = len(rows) > limit
+    rows = rows[:limit]
 
-    # Reset the limit and order for count query
-    count_query = select(func.count()).select_from(count_query_base.subquery())
-
-    count_result = await connection.execute(count_query)
-    total_count = count_result.scalar() or 0
+    if not has_more:
+        count = len(rows)
+    elif total_count == TotalCount.EXACT:
+        count_query = select(func.count()).select_from(count_query_base.subquery())
+        count = (await connection.execute(count_query)).scalar() or 0
+    else:
+        count = max(await estimate_count(connection, count_query_base), len(rows) + 1)
 
-    return CursorPaginationResult(items=rows[:limit], total_count=total_count, has_more=has_more)
+    last_row = rows[-1]._mapping if rows else None
+    next_page_token = encode_page_token(last_row[order_column], last_row[id_column]) if last_row else None
+    return CursorPaginationResult(items=rows, total_count=count, has_more=has_more, next_page_token=next_page_token)
@@ -43,6 +43,7 @@ vector_stores_table = Table(
     Column("last_active_at", DateTime(timezone=True), nullable=False),
     Column("created_by", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
     Column("context_id", ForeignKey("contexts.id", ondelete="CASCADE"), nullable=True),
+    Column("partition", String(63), nullable=True),
 )
 
 vector_store_documents_table = Table(
@@ -75,6 +76,7 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             "stats": {
                 "usage_bytes": row.total_usage_bytes,
                 "num_documents": row.num_documents,
+                "partition": row.partition,
             },
         }
         return VectorStore.model_validate(data)
@@ -103,7 +105,9 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
         )
         await self.connection.execute(query)
 
-    async def list(self, *, user_id: UUID | None = None, context_id: UUID | None = None) -> AsyncIterator[VectorStore]:
+    async def list(
+        self, *, user_id: UUID | None = None, context_id: UUID | None = None, min_usage_bytes: int | None = None
+    ) -> AsyncIterator[VectorStore]:
         query = select(
             vector_stores_table,
             func.coalesce(func.sum(vector_store_documents_table.c.usage_bytes), 0).label("total_usage_bytes"),
@@ -120,6 +124,10 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
 
         # Group by all columns of the vector_stores_table to collapse the joined rows
         query = query.group_by(*vector_stores_table.c)
+        if min_usage_bytes is not None:
+            query = query.having(
+                func.coalesce(func.sum(vector_store_documents_table.c.usage_bytes), 0) >= min_usage_bytes
+            )
 
         async for row in await self.connection.stream(query):
             yield self._to_vector_store(row)
@@ -186,6 +194,12 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
         )
         await self.connection.execute(query)
 
+    async def update_partition(self, *, vector_store_id: UUID, partition: str) -> None:
+        query = (
+            vector_stores_table.update().where(vector_stores_table.c.id == vector_store_id).values(partition=partition)
+        )
+        await self.connection.execute(query)
+
     async def upsert_documents(self, *, documents: Iterable[VectorStoreDocument]) -> None:
         # Update the last accessed timestamp
         query = insert(vector_store_documents_table).values(
@@ -78,7 +78,9 @@ class SQLAlchemyUnitOfWork(IUnitOfWork):
             self.users = SqlAlchemyUserRepository(self._connection)
             self.vector_stores = SqlAlchemyVectorStoreRepository(self._connection)
             self.vector_database = VectorDatabaseRepository(
-                self._connection, schema_name=self._config.persistence.vector_db_schema
+                self._connection,
+                schema_name=self._config.persistence.vector_db_schema,
+                configuration=self._config.vector_stores,
             )
             self.user_feedback = SqlAlchemyUserFeedbackRepository(self._connection)
             self.connectors = SqlAlchemyConnectorRepository(self._connection)
@@ -1,37 +1,83 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import timedelta
+from typing import Any, Self
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Timeout
 from pydantic import AnyUrl
 
 from agentstack_server.configuration import DoclingExtractionConfiguration
-from agentstack_server.domain.models.file import AsyncFile
+from agentstack_server.domain.models.file import AsyncFile, ExtractionMetadata
 from agentstack_server.domain.repositories.file import ITextExtractionBackend
 from agentstack_server.utils.utils import extract_string_value_stream
 
+logger = logging.getLogger(__name__)
+
 
 class DoclingTextExtractionBackend(ITextExtractionBackend):
+    """
+    Converts files using the asynchronous docling-serve API over a shared HTTP client.
+
+    At most max_concurrent_requests conversions are in flight per replica, new conversions are not submitted while
+    docling reports max_queue_depth or more tasks queued ahead of the ones being polled.
+    """
+
     def __init__(self, config: DoclingExtractionConfiguration):
         self._config = config
         self._enabled = config.enabled
+        self._client: AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+        self._queue_positions: dict[str, int] = {}
+        self._queue_changed = asyncio.Condition()
 
-    @asynccontextmanager
-    async def extract_text(self, *, file_url: AnyUrl, timeout: timedelta | None = None) -> AsyncIterator[AsyncFile]:  # noqa: ASYNC109
-        if not self._enabled:
-            raise RuntimeError(
-                "Docling extraction backend is not enabled, please check the documentation how to enable it"
+    @property
+    def metadata(self) -> ExtractionMetadata:
+        return ExtractionMetadata(backend=self._config.backend, version=self._config.extraction_version)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = AsyncClient(
+                base_url=str(self._config.docling_service_url),
+                # long polling holds the connection for up to status_poll_interval_sec
+                timeout=Timeout(30, read=self._config.status_poll_interval_sec + 30),
+                limits=Limits(max_connections=2 * self._config.max_concurrent_requests),
+            )
+        return self._client
+
+    async def _set_queue_position(self, task_id: str, position: int | None) -> None:
+        async with self._queue_changed:
+            if position is None:
+                self._queue_positions.pop(task_id, None)
+            else:
+                self._queue_positions[task_id] = position
+            self._queue_changed.notify_all()
+
+    async def _wait_for_queue_capacity(self) -> None:
+        async with self._queue_changed:
+            await self._queue_changed.wait_for(
+                lambda: max(self._queue_positions.values(), default=0) < self._config.max_queue_depth
             )
 
-        timeout = timeout or timedelta(minutes=5)
-        async with (
-            AsyncClient(base_url=str(self._config.docling_service_url), timeout=timeout.seconds) as client,
-            client.stream(
-                "POST",
-                "/v1/convert/source",
+    async def _convert(self, *, file_url: AnyUrl, timeout: timedelta) -> str:  # noqa: ASYNC109
+        """Submit the conversion and wait until it finishes, returns the docling task id."""
+        client = self._get_client()
+        async with self._semaphore:
+            await self._wait_for_queue_capacity()
+            response = await client.post(
+                "/v1/convert/source/async",
                 json={
                     "options": {
                         "to_formats": ["md"],
@@ -40,8 +86,35 @@ class DoclingTextExtractionBackend(ITextExtractionBackend):
                     },
                     "sources": [{"kind": "http", "url": str(file_url)}],
                 },
-            ) as response,
-        ):
+            )
+            response.raise_for_status()
+            task: dict[str, Any] = response.json()
+            task_id = task["task_id"]
+            try:
+                async with asyncio.timeout(timeout.total_seconds()):
+                    while task["task_status"] not in {"success", "failure"}:
+                        await self._set_queue_position(task_id, task.get("task_position") or 0)
+                        response = await client.get(
+                            f"/v1/status/poll/{task_id}", params={"wait": self._config.status_poll_interval_sec}
+                        )
+                        response.raise_for_status()
+                        task = response.json()
+            finally:
+                await self._set_queue_position(task_id, None)
+        if task["task_status"] == "failure":
+            raise RuntimeError(f"Docling conversion failed: {task.get('task_meta') or task_id}")
+        return task_id
+
+    @asynccontextmanager
+    async def extract_text(self, *, file_url: AnyUrl, timeout: timedelta | None = None) -> AsyncIterator[AsyncFile]:  # noqa: ASYNC109
+        if not self._enabled:
+            raise RuntimeError(
+                "Docling extraction backend is not enabled, please check the documentation how to enable it"
+            )
+
+        timeout = timeout or timedelta(seconds=self._config.processing_timeout_sec)
+        task_id = await self._convert(file_url=file_url, timeout=timeout)
+        async with self._get_client().stream("GET", f"/v1/result/{task_id}") as response:
             response.raise_for_status()
 
             md_stream = None
@@ -49,9 +122,9 @@ class DoclingTextExtractionBackend(ITextExtractionBackend):
             async def read(chunk_size: int = 1024) -> bytes:
                 nonlocal md_stream
                 if not md_stream:
-                    md_stream = extract_string_value_stream(response.aiter_text, "md_content", chunk_size)
-                async for text_chunk in md_stream:
-                    return text_chunk.encode("utf-8")
+                    md_stream = extract_string_value_stream(response.aiter_bytes, "md_content", chunk_size)
+                async for md_chunk in md_stream:
+                    return md_chunk
                 return b""
 
             yield AsyncFile(
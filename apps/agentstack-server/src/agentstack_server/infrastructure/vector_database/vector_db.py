@@ -2,13 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+import logging
 from collections import defaultdict
 from collections.abc import Iterable, Sequence
 from uuid import UUID
 
+import asyncpg
+import numpy as np
+from pgvector import HalfVector
 from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import (
     Column,
+    ColumnElement,
+    Computed,
     ForeignKeyConstraint,
     Index,
     MetaData,
@@ -17,12 +23,22 @@ from sqlalchemy import (
     String,
     Table,
     Text,
+    event,
+    func,
+    inspect,
+    literal_column,
+    select,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, insert
 from sqlalchemy.dialects.postgresql import UUID as SQL_UUID
-from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
 
+from agentstack_server.configuration import VectorStoresConfiguration
+from agentstack_server.domain.models.common import Metadata
 from agentstack_server.domain.models.vector_store import (
+    VectorDistanceMetric,
     VectorStoreDocumentInfo,
     VectorStoreItem,
     VectorStoreSearchResult,
@@ -30,22 +46,103 @@ from agentstack_server.domain.models.vector_store import (
 from agentstack_server.domain.repositories.vector_store import IVectorDatabaseRepository
 from agentstack_server.infrastructure.persistence.repositories.vector_store import (
     vector_store_documents_table,
+    vector_stores_table,
 )
 
+logger = logging.getLogger(__name__)
+
 # Common dimensions that we'll support
 # From MTEB leaderboard sorted unique dimensions up to 4000:
 # https://huggingface.co/spaces/mteb/leaderboard
 # len(SUPPORTED_DIMENSIONS) is the upper limit on the number of tables we'll create in the database
 SUPPORTED_DIMENSIONS = [64, 128, 256, 312, 384, 512, 768, 896, 1024, 1536, 1792, 2048, 2304, 2560, 3072, 3584, 4000]
 
+# Each collections_dim_{N} table is list-partitioned by vector_store_id. Large vector stores get a dedicated partition
+# (collections_dim_{N}_{vector_store_id.hex}), all other stores share the default partition which is further split into
+# hash buckets (collections_dim_{N}_shared_{remainder}). Every partition has its own, smaller HNSW graph.
+# Changing SHARED_PARTITIONS requires a migration that rebuilds the shared partitions.
+SHARED_PARTITIONS = 16
+
+_COPY_COLUMNS = ["id", "vector_store_id", "vector_store_document_id", "text", "embedding", "metadata"]
+
+# Text search configuration of the generated text_search column, "simple" does no stemming or stop words so that exact
+# terms (error codes, identifiers) match in any language. Changing it requires a migration that regenerates the column.
+TEXT_SEARCH_CONFIG = "simple"
+
+# Partition DDL waits at most this long for locks of the shared partition, so that it does not queue up searches behind
+# a long running query. Operations that time out are retried by the next rebalance_partitions run.
+_PARTITION_LOCK_TIMEOUT = "5s"
+
 
 metadata = MetaData()
 
 
+class _BinaryHalfVec(HALFVEC):
+    """HALFVEC bound from numpy arrays in the binary format, requires the codec set up by register_vector_codecs."""
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            vector = value if isinstance(value, HalfVector) else HalfVector(value)
+            if self.dim is not None and vector.dimensions() != self.dim:
+                raise ValueError(f"expected {self.dim} dimensions, not {vector.dimensions()}")
+            return vector
+
+        return process
+
+
+async def _register_halfvec_codec(connection: asyncpg.Connection) -> None:
+    schema = await connection.fetchval(
+        "SELECT nspname FROM pg_type JOIN pg_namespace ON pg_namespace.oid = typnamespace WHERE typname = 'halfvec'"
+    )
+    if schema is None:
+        return  # the extension is created by migrations
+    await connection.set_type_codec(
+        "halfvec",
+        schema=schema,
+        encoder=HalfVector._to_db_binary,
+        decoder=HalfVector._from_db_binary,
+        format="binary",
+    )
+
+
+def register_vector_codecs(engine: AsyncEngine) -> AsyncEngine:
+    """Exchange HALFVEC values in the binary format on every connection of the engine, used by the repository."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _connection_record):
+        dbapi_connection.run_async(_register_halfvec_codec)
+
+    return engine
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[VectorStoreSearchResult]], k: int, limit: int
+) -> list[VectorStoreSearchResult]:
+    """Merge ranked result lists, each item is scored by the sum of 1 / (k + rank) over the lists containing it."""
+    scores: dict[UUID, float] = defaultdict(float)
+    items: dict[UUID, VectorStoreItem] = {}
+    for ranking in rankings:
+        for rank, result in enumerate(ranking, start=1):
+            scores[result.item.id] += 1.0 / (k + rank)
+            items.setdefault(result.item.id, result.item)
+    best = sorted(scores, key=lambda item_id: scores[item_id], reverse=True)[:limit]
+    return [VectorStoreSearchResult(item=items[item_id], score=scores[item_id]) for item_id in best]
+
+
 class VectorDatabaseRepository(IVectorDatabaseRepository):
-    def __init__(self, connection: AsyncConnection, schema_name: str):
+    def __init__(self, connection: AsyncConnection, schema_name: str, configuration: VectorStoresConfiguration):
         self.connection = connection
         self.schema_name = schema_name
+        self._configuration = configuration
+        self._staging_tables: set[str] = set()
+
+    async def get_extension_version(self) -> str | None:
+        """Return the installed pgvector version."""
+        return await self.connection.scalar(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
 
     def _get_table(self, dimension: int) -> Table:
         table_name = f"collections_dim_{dimension}"
@@ -68,17 +165,21 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
                 ondelete="CASCADE",
             ),
             Column("text", Text, nullable=False),
-            Column("embedding", HALFVEC(dimension), nullable=False),
+            Column("embedding", _BinaryHalfVec(dimension), nullable=False),
             Column("metadata", JSONB, nullable=True),
+            Column("text_search", TSVECTOR, Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', text)", persisted=True)),
             Index(
                 f"{table_name}_vector_index",
                 "embedding",
                 postgresql_using="hnsw",
                 postgresql_with={"m": 16, "ef_construction": 64},
-                postgresql_ops={"embedding": "halfvec_l2_ops"},
+                # Must match the operator used by the default (cosine) search, otherwise the index is never used
+                postgresql_ops={"embedding": "halfvec_cosine_ops"},
             ),
             Index(f"{table_name}_vector_store_id_index", "vector_store_id", "vector_store_document_id"),
+            Index(f"{table_name}_text_search_index", "text_search", postgresql_using="gin"),
             schema=self.schema_name,
+            postgresql_partition_by="LIST (vector_store_id)",
         )
 
     def _get_supported_dimension(self, dimension: int) -> int:
@@ -89,15 +190,261 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
             new_dimension = supported_dim
         return new_dimension
 
-    async def create_collection(self, collection_id: UUID, dimension: int):
+    def _shared_partition_name(self, table: Table) -> str:
+        return f"{table.name}_shared"
+
+    def _dedicated_partition_name(self, table: Table, collection_id: UUID) -> str:
+        return f"{table.name}_{collection_id.hex}"
+
+    def _exclusion_constraint_name(self, collection_id: UUID) -> str:
+        return f"exclude_{collection_id.hex}"
+
+    async def _set_lock_timeout(self) -> None:
+        await self.connection.execute(select(func.set_config("lock_timeout", _PARTITION_LOCK_TIMEOUT, True)))
+
+    async def _create_table(self, table: Table) -> None:
+        if await self.connection.run_sync(lambda conn: inspect(conn).has_table(table.name, schema=self.schema_name)):
+            return
+        await self.connection.run_sync(table.create)
+        shared_partition = self._shared_partition_name(table)
+        await self.connection.execute(
+            text(
+                f'CREATE TABLE "{self.schema_name}"."{shared_partition}" '
+                f'PARTITION OF "{self.schema_name}"."{table.name}" '
+                "DEFAULT PARTITION BY HASH (vector_store_id)"
+            )
+        )
+        for remainder in range(SHARED_PARTITIONS):
+            await self.connection.execute(
+                text(
+                    f'CREATE TABLE "{self.schema_name}"."{shared_partition}_{remainder}" '
+                    f'PARTITION OF "{self.schema_name}"."{shared_partition}" '
+                    f"FOR VALUES WITH (MODULUS {SHARED_PARTITIONS}, REMAINDER {remainder})"
+                )
+            )
+
+    async def _get_partition(self, table: Table, collection_id: UUID) -> str:
+        dedicated_partition = self._dedicated_partition_name(table, collection_id)
+        if await self._partition_exists(dedicated_partition):
+            return dedicated_partition
+        shared_partition = self._shared_partition_name(table)
+        result = await self.connection.execute(
+            text(
+                "SELECT remainder FROM generate_series(0, :modulus - 1) AS remainder "
+                "WHERE satisfies_hash_partition("
+                "CAST(:partition AS regclass), :modulus, remainder, CAST(:collection_id AS uuid))"
+            ),
+            {
+                "modulus": SHARED_PARTITIONS,
+                "partition": f'"{self.schema_name}"."{shared_partition}"',
+                "collection_id": collection_id,
+            },
+        )
+        return f"{shared_partition}_{result.scalar_one()}"
+
+    async def _partition_exists(self, partition: str) -> bool:
+        result = await self.connection.execute(select(func.to_regclass(f'"{self.schema_name}"."{partition}"')))
+        return result.scalar() is not None
+
+    async def create_collection(self, collection_id: UUID, dimension: int) -> str:
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
-        await self.connection.run_sync(table.create, checkfirst=True)
+        await self._create_table(table)
+        return await self._get_partition(table, collection_id)
 
     async def delete_collection(self, collection_id: UUID, dimension: int) -> None:
+        """
+        Empty the dedicated partition of the collection, items in shared partitions are deleted by CASCADE.
+
+        Dropping or detaching a partition locks the whole collections table and DETACH PARTITION CONCURRENTLY is not
+        available for tables with a default partition. TRUNCATE only locks the partition, the empty partition is then
+        dropped by drop_orphaned_partitions.
+        """
+        supported_dimension = self._get_supported_dimension(dimension)
+        table = self._get_table(supported_dimension)
+        dedicated_partition = self._dedicated_partition_name(table, collection_id)
+        if await self._partition_exists(dedicated_partition):
+            await self.connection.execute(text(f'TRUNCATE "{self.schema_name}"."{dedicated_partition}"'))
+
+    async def lock_collection(self, collection_id: UUID, *, exclusive: bool = False) -> None:
+        """
+        Lock the collection until the end of the transaction. Items are added and deleted under a shared lock, moving
+        the collection to a dedicated partition takes the exclusive lock so that writes wait until the move is committed.
+        The advisory lock does not block reads or updates of the vector_stores row.
+        """
+        key = int.from_bytes(collection_id.bytes[:8], signed=True)
+        lock = func.pg_advisory_xact_lock if exclusive else func.pg_advisory_xact_lock_shared
+        await self.connection.execute(select(lock(key)))
+
+    async def exclude_from_shared_partition(self, collection_id: UUID, dimension: int) -> bool:
+        """
+        Prepare moving the collection to a dedicated partition, must be committed before create_dedicated_partition.
+
+        Adds a NOT VALID check excluding the collection to the shared partition. The check is validated when the
+        dedicated partition is created, without blocking the shared partition, and lets ATTACH PARTITION skip scanning
+        the shared partition while holding its exclusive lock. Until then, items of the collection cannot be inserted
+        into the shared partition, the transaction moving the collection must hold the exclusive lock_collection from
+        before this check is committed until the partition is attached. Returns False if the collection already has a
+        dedicated partition or if the shared partition could not be locked in time.
+        """
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
-        await self.connection.run_sync(table.drop, checkfirst=True)
+        if await self._partition_exists(self._dedicated_partition_name(table, collection_id)):
+            return False
+        if await self._has_exclusion_constraint(table, collection_id):
+            return True  # left over by a move whose check could not be dropped
+        constraint = self._exclusion_constraint_name(collection_id)
+        try:
+            async with self.connection.begin_nested():
+                await self._set_lock_timeout()
+                await self.connection.execute(
+                    text(
+                        f'ALTER TABLE "{self.schema_name}"."{self._shared_partition_name(table)}" '
+                        f"ADD CONSTRAINT \"{constraint}\" CHECK (vector_store_id <> '{collection_id}') NOT VALID"
+                    )
+                )
+        except DBAPIError as ex:
+            logger.warning(f"Shared partition of {table.name} not excluded for collection {collection_id}: {ex}")
+            return False
+        return True
+
+    async def include_in_shared_partition(self, collection_id: UUID, dimension: int) -> None:
+        """
+        Drop the check added by exclude_from_shared_partition when creating the dedicated partition failed. If the
+        shared partition cannot be locked in time, the check is left for the next move of the collection.
+        """
+        supported_dimension = self._get_supported_dimension(dimension)
+        table = self._get_table(supported_dimension)
+        try:
+            async with self.connection.begin_nested():
+                await self._set_lock_timeout()
+                await self.connection.execute(
+                    text(
+                        f'ALTER TABLE "{self.schema_name}"."{self._shared_partition_name(table)}" '
+                        f'DROP CONSTRAINT IF EXISTS "{self._exclusion_constraint_name(collection_id)}"'
+                    )
+                )
+        except DBAPIError as ex:
+            logger.warning(f"Shared partition of {table.name} not included for collection {collection_id}: {ex}")
+
+    async def _has_exclusion_constraint(self, table: Table, collection_id: UUID) -> bool:
+        result = await self.connection.execute(
+            text("SELECT 1 FROM pg_constraint WHERE conrelid = CAST(:partition AS regclass) AND conname = :constraint"),
+            {
+                "partition": f'"{self.schema_name}"."{self._shared_partition_name(table)}"',
+                "constraint": self._exclusion_constraint_name(collection_id),
+            },
+        )
+        return result.scalar() is not None
+
+    async def create_dedicated_partition(self, collection_id: UUID, dimension: int) -> str:
+        """Move items of the collection from the shared partition to a new dedicated partition (idempotent)."""
+        supported_dimension = self._get_supported_dimension(dimension)
+        table = self._get_table(supported_dimension)
+        dedicated_partition = self._dedicated_partition_name(table, collection_id)
+        if not await self._partition_exists(dedicated_partition):
+            await self._create_dedicated_partition(table, collection_id)
+        return dedicated_partition
+
+    async def _create_dedicated_partition(self, table: Table, collection_id: UUID, staging_table: str | None = None):
+        # A failed move releases its locks of the shared partition right away, the exclusion check can then be dropped
+        # by another transaction while this one still holds lock_collection
+        async with self.connection.begin_nested():
+            await self._move_to_dedicated_partition(table, collection_id, staging_table)
+
+    async def _move_to_dedicated_partition(self, table: Table, collection_id: UUID, staging_table: str | None):
+        schema, shared_partition = self.schema_name, self._shared_partition_name(table)
+        dedicated_partition = self._dedicated_partition_name(table, collection_id)
+        columns = ", ".join(_COPY_COLUMNS)
+        # Fill and index the partition before attaching it, indexes (including HNSW) are built in bulk without locking
+        # the collections table. The check lets ATTACH PARTITION skip validating the rows of the new partition.
+        await self.connection.execute(
+            text(
+                f'CREATE TABLE "{schema}"."{dedicated_partition}" '
+                f'(LIKE "{schema}"."{table.name}" INCLUDING DEFAULTS INCLUDING GENERATED, '
+                f"CHECK (vector_store_id = '{collection_id}'))"
+            )
+        )
+        await self.connection.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{schema}"."{shared_partition}" WHERE vector_store_id = :collection_id '
+                f'RETURNING *) INSERT INTO "{schema}"."{dedicated_partition}" ({columns}) SELECT {columns} FROM moved'
+            ),
+            {"collection_id": collection_id},
+        )
+        if staging_table:
+            await self.connection.execute(
+                text(
+                    f'INSERT INTO "{schema}"."{dedicated_partition}" ({columns}) '
+                    f'SELECT {columns} FROM "{staging_table}"'
+                )
+            )
+        await self.connection.execute(
+            select(func.set_config("maintenance_work_mem", self._configuration.index_build_maintenance_work_mem, True))
+        )
+        # Must match the indexes of _get_table, ATTACH PARTITION then reuses them instead of building new ones
+        partition = f'"{schema}"."{dedicated_partition}"'
+        for statement in (
+            f"ALTER TABLE {partition} ADD PRIMARY KEY (id, vector_store_id)",
+            f"CREATE INDEX ON {partition} USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)",
+            f"CREATE INDEX ON {partition} (vector_store_id, vector_store_document_id)",
+            f"CREATE INDEX ON {partition} USING gin (text_search)",
+        ):
+            await self.connection.execute(text(statement))
+
+        exclusion_constraint = None
+        if await self._has_exclusion_constraint(table, collection_id):
+            # Scans the shared partition holding a lock which does not block reads and writes, see
+            # exclude_from_shared_partition. Without the check, ATTACH PARTITION scans it under an exclusive lock.
+            exclusion_constraint = self._exclusion_constraint_name(collection_id)
+            await self.connection.execute(
+                text(f'ALTER TABLE "{schema}"."{shared_partition}" VALIDATE CONSTRAINT "{exclusion_constraint}"')
+            )
+        await self.connection.execute(
+            text(
+                f'ALTER TABLE "{schema}"."{table.name}" ATTACH PARTITION {partition} '
+                f"FOR VALUES IN ('{collection_id}')"
+            )
+        )
+        if exclusion_constraint:
+            # The partition bounds exclude the collection from now on, the shared partition is already locked by attach
+            await self.connection.execute(
+                text(f'ALTER TABLE "{schema}"."{shared_partition}" DROP CONSTRAINT "{exclusion_constraint}"')
+            )
+
+    async def drop_orphaned_partitions(self) -> list[str]:
+        """
+        Drop dedicated partitions of deleted vector stores. Partitions which cannot be locked in time are left for the
+        next run, dropping a partition locks the whole collections table and must not wait behind long searches.
+        """
+        query = text(
+            "SELECT child.relname, parent.relname AS parent FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_namespace ON pg_namespace.oid = parent.relnamespace "
+            "WHERE pg_namespace.nspname = :schema AND parent.relname ~ '^collections_dim_[0-9]+$'"
+        )
+        dedicated_partitions = {
+            UUID(row.relname.removeprefix(f"{row.parent}_")): row.relname
+            for row in await self.connection.execute(query, {"schema": self.schema_name})
+            if row.relname != f"{row.parent}_shared"
+        }
+        if not dedicated_partitions:
+            return []
+        result = await self.connection.execute(
+            select(vector_stores_table.c.id).where(vector_stores_table.c.id.in_(dedicated_partitions))
+        )
+        orphaned_partitions = [dedicated_partitions[id] for id in dedicated_partitions.keys() - set(result.scalars())]
+        dropped_partitions = []
+        for partition in orphaned_partitions:
+            try:
+                async with self.connection.begin_nested():
+                    await self._set_lock_timeout()
+                    await self.connection.execute(text(f'DROP TABLE IF EXISTS "{self.schema_name}"."{partition}"'))
+                dropped_partitions.append(partition)
+            except DBAPIError as ex:
+                logger.warning(f"Orphaned partition {partition} not dropped: {ex}")
+        return dropped_partitions
 
     def _get_item_size(self, item: VectorStoreItem) -> int:
         """Approximate size of a single item in bytes."""
@@ -107,7 +454,7 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
             + len(item.document_type.encode("utf-8"))
             + len(item.model_id.encode("utf-8"))
             + len(item.text.encode("utf-8"))
-            + len(json.dumps(item.metadata).encode("utf-8"))
+            + sum(len(key.encode("utf-8")) + len(value.encode("utf-8")) for key, value in (item.metadata or {}).items())
             + len(item.embedding) * 2
         )
 
@@ -139,6 +486,63 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
         )
         await self.connection.execute(query)
 
+    def _to_copy_record(self, collection_id: UUID, item: VectorStoreItem) -> tuple:
+        return (
+            item.id,
+            collection_id,
+            item.document_id,
+            item.text,
+            HalfVector(item.embedding),
+            json.dumps(item.metadata) if item.metadata is not None else None,
+        )
+
+    async def stage_items(self, collection_id: UUID, items: Sequence[VectorStoreItem]) -> None:
+        """Load items using COPY into an unindexed temporary table, see insert_staged_items."""
+        if not items:
+            return
+        supported_dimension = self._get_supported_dimension(len(items[0].embedding))
+        table = self._get_table(supported_dimension)
+        staging_table = f"staging_{table.name}"
+        if staging_table not in self._staging_tables:
+            await self.connection.execute(
+                text(
+                    f'CREATE TEMPORARY TABLE "{staging_table}" '
+                    f'(LIKE "{self.schema_name}"."{table.name}" INCLUDING DEFAULTS) ON COMMIT DROP'
+                )
+            )
+            self._staging_tables.add(staging_table)
+
+        # Binary COPY, embeddings are sent as raw float16 buffers
+        raw_connection = await self.connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(  # pyright: ignore [reportOptionalMemberAccess]
+            staging_table, records=[self._to_copy_record(collection_id, item) for item in items], columns=_COPY_COLUMNS
+        )
+
+    async def insert_staged_items(self, collection_id: UUID, dimension: int, *, dedicated_partition: bool) -> None:
+        """
+        Move staged items to the collection. Unless the collection already has a dedicated partition, a new dedicated
+        partition is built in bulk with dedicated_partition=True, otherwise items are inserted into the existing indexes.
+        """
+        supported_dimension = self._get_supported_dimension(dimension)
+        table = self._get_table(supported_dimension)
+        staging_table = f"staging_{table.name}"
+        if staging_table not in self._staging_tables:
+            return
+        if dedicated_partition and not await self._partition_exists(
+            self._dedicated_partition_name(table, collection_id)
+        ):
+            await self._create_dedicated_partition(table, collection_id, staging_table=staging_table)
+        else:
+            columns = ", ".join(_COPY_COLUMNS)
+            await self.connection.execute(
+                text(
+                    f'INSERT INTO "{self.schema_name}"."{table.name}" ({columns}) '
+                    f'SELECT {columns} FROM "{staging_table}"'
+                )
+            )
+        await self.connection.execute(text(f'DROP TABLE "{staging_table}"'))
+        self._staging_tables.remove(staging_table)
+
     async def delete_documents(self, collection_id: UUID, dimension: int, document_ids: Iterable[str]) -> int:
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
@@ -148,40 +552,143 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
         result = await self.connection.execute(query)
         return result.rowcount
 
+    def _select_items(self, table: Table):
+        # the generated text_search column is only used for matching
+        return select(*(column for column in table.c if column.name != "text_search"))
+
     def _to_item(self, row: Row) -> VectorStoreItem:
         return VectorStoreItem(
             id=row.id,
             document_id=row.vector_store_document_id,
-            embedding=row.embedding.to_list(),
+            embedding=row.embedding.to_numpy(),
             text=row.text,
             metadata=row.metadata,
         )
 
-    def _to_search_result(self, row: Row) -> VectorStoreSearchResult:
+    def _distance(
+        self, table: Table, query_vector: Sequence[float] | np.ndarray, metric: VectorDistanceMetric
+    ) -> ColumnElement:
+        match metric:
+            case VectorDistanceMetric.COSINE:
+                return table.c.embedding.cosine_distance(query_vector)
+            case VectorDistanceMetric.L2:
+                return table.c.embedding.l2_distance(query_vector)
+            case VectorDistanceMetric.INNER_PRODUCT:
+                return table.c.embedding.max_inner_product(query_vector)
+
+    def _to_score(self, distance: float, metric: VectorDistanceMetric) -> float:
+        match metric:
+            case VectorDistanceMetric.COSINE:
+                return 1.0 - distance
+            case VectorDistanceMetric.L2:
+                return 1.0 / (1.0 + distance)
+            case VectorDistanceMetric.INNER_PRODUCT:
+                # pgvector's <#> operator returns the negative inner product
+                return -distance
+
+    def _to_search_result(self, row: Row, metric: VectorDistanceMetric) -> VectorStoreSearchResult:
         """Convert a database row to a VectorStoreSearchResult with score."""
-        item = self._to_item(row)
-        # Convert cosine distance to similarity score (1 - distance)
-        score = 1.0 - row.distance
-        return VectorStoreSearchResult(item=item, score=score)
+        return VectorStoreSearchResult(item=self._to_item(row), score=self._to_score(row.distance, metric))
+
+    async def _configure_index_scan(self, ef_search: int | None, iterative_scan: bool) -> None:
+        """Set HNSW scan parameters for the current transaction only."""
+        settings = {"hnsw.ef_search": str(ef_search or self._configuration.hnsw_ef_search)}
+        if iterative_scan and self._configuration.hnsw_iterative_scan != "off":
+            settings["hnsw.iterative_scan"] = self._configuration.hnsw_iterative_scan
+            settings["hnsw.max_scan_tuples"] = str(self._configuration.hnsw_max_scan_tuples)
+        await self.connection.execute(select(*(func.set_config(name, value, True) for name, value in settings.items())))
 
     async def similarity_search(
         self,
         collection_id: UUID,
-        query_vector: Sequence[float],
+        query_vector: Sequence[float] | np.ndarray,
         limit: int = 10,
+        *,
+        metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        ef_search: int | None = None,
+        iterative_scan: bool = True,
+        metadata_filter: Metadata | None = None,
     ) -> Iterable[VectorStoreSearchResult]:
         dimension = len(query_vector)
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
+        await self._configure_index_scan(ef_search, iterative_scan)
 
-        # Select all columns plus the distance as a named column
+        distance = self._distance(table, query_vector, metric)
         query = (
-            table.select()
-            .add_columns(table.c.embedding.cosine_distance(query_vector).label("distance"))
+            self._select_items(table)
+            .add_columns(distance.label("distance"))
             .where(table.c.vector_store_id == collection_id)
-            .order_by(table.c.embedding.cosine_distance(query_vector))
+            .order_by(distance)
             .limit(limit)
         )
+        if metadata_filter:
+            query = query.where(table.c.metadata.contains(metadata_filter))
+
+        rows = (await self.connection.execute(query)).fetchall()
+        # Iterative scans in relaxed_order mode may return results slightly out of order
+        rows = sorted(rows, key=lambda row: row.distance)
+        return [self._to_search_result(row, metric) for row in rows]
+
+    async def text_search(
+        self,
+        collection_id: UUID,
+        dimension: int,
+        query_text: str,
+        limit: int = 10,
+        *,
+        metadata_filter: Metadata | None = None,
+    ) -> Iterable[VectorStoreSearchResult]:
+        """
+        Full-text search using the GIN index, query_text supports the web search syntax ("quoted phrases", or, -word).
+        Scores are ts_rank_cd cover density ranks normalized by document length, comparable only within one query.
+        """
+        supported_dimension = self._get_supported_dimension(dimension)
+        table = self._get_table(supported_dimension)
 
-        rows = await self.connection.execute(query)
-        return [self._to_search_result(row) for row in rows.fetchall()]
+        ts_query = func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), query_text)
+        # normalization 1 divides the rank by 1 + log(document length) so that long chunks do not dominate
+        rank = func.ts_rank_cd(table.c.text_search, ts_query, 1)
+        query = (
+            self._select_items(table)
+            .add_columns(rank.label("rank"))
+            .where(table.c.vector_store_id == collection_id)
+            .where(table.c.text_search.bool_op("@@")(ts_query))
+            .order_by(rank.desc(), table.c.id)
+            .limit(limit)
+        )
+        if metadata_filter:
+            query = query.where(table.c.metadata.contains(metadata_filter))
+
+        rows = (await self.connection.execute(query)).fetchall()
+        return [VectorStoreSearchResult(item=self._to_item(row), score=row.rank) for row in rows]
+
+    async def hybrid_search(
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float] | np.ndarray,
+        query_text: str,
+        limit: int = 10,
+        *,
+        metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        ef_search: int | None = None,
+        iterative_scan: bool = True,
+        metadata_filter: Metadata | None = None,
+    ) -> Iterable[VectorStoreSearchResult]:
+        """Fuse the best vector and full-text matches using reciprocal rank fusion, scores are the fused RRF scores."""
+        candidates = max(limit, self._configuration.hybrid_search_candidates)
+        vector_results = await self.similarity_search(
+            collection_id,
+            query_vector,
+            candidates,
+            metric=metric,
+            ef_search=ef_search,
+            iterative_scan=iterative_scan,
+            metadata_filter=metadata_filter,
+        )
+        text_results = await self.text_search(
+            collection_id, len(query_vector), query_text, candidates, metadata_filter=metadata_filter
+        )
+        return reciprocal_rank_fusion(
+            [list(vector_results), list(text_results)], k=self._configuration.hybrid_search_rrf_k, limit=limit
+        )
@@ -0,0 +1,22 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+import logging
+
+from kink import inject
+from procrastinate import Blueprint
+
+from agentstack_server.jobs.queues import Queues
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
+
+logger = logging.getLogger(__name__)
+
+blueprint = Blueprint()
+
+
+@blueprint.periodic(cron="*/15 * * * *")
+@blueprint.task(queueing_lock="rebalance_vector_store_partitions", queue=str(Queues.CRON_VECTOR_STORE))
+@inject
+async def rebalance_vector_store_partitions(timestamp: int, service: VectorStoreService) -> None:
+    """Move large vector stores to dedicated partitions and drop partitions of deleted vector stores."""
+    stats = await service.rebalance_partitions()
+    logger.info(f"Rebalanced vector store partitions: {stats}")
@@ -11,6 +11,7 @@ from agentstack_server.configuration import Configuration
 from agentstack_server.jobs.crons.cleanup import blueprint as cleanup_crons
 from agentstack_server.jobs.crons.connector import blueprint as connector_crons
 from agentstack_server.jobs.crons.provider import blueprint as provider_crons
+from agentstack_server.jobs.crons.vector_store import blueprint as vector_store_crons
 from agentstack_server.jobs.tasks.context import blueprint as context_tasks
 from agentstack_server.jobs.tasks.file import blueprint as file_tasks
 from agentstack_server.jobs.tasks.mcp import blueprint as mcp_tasks
@@ -54,4 +55,5 @@ def create_app(configuration: Configuration) -> procrastinate.App:
     app.add_tasks_from(blueprint=provider_crons, namespace="cron_provider")
     app.add_tasks_from(blueprint=cleanup_crons, namespace="cron_cleanup")
     app.add_tasks_from(blueprint=connector_crons, namespace="cron_connector")
+    app.add_tasks_from(blueprint=vector_store_crons, namespace="cron_vector_store")
     return app
@@ -10,6 +10,7 @@ class Queues(StrEnum):
     CRON_MCP_PROVIDER = "cron:mcp_provider"
     CRON_PROVIDER = "cron:provider"
     CRON_CONNECTOR = "cron:connector"
+    CRON_VECTOR_STORE = "cron:vector_store"
     # tasks
     GENERATE_CONVERSATION_TITLE = "generate_conversation_title"
     TEXT_EXTRACTION = "text_extraction"
@@ -9,6 +9,7 @@ import procrastinate
 from kink import inject
 from procrastinate.app import WorkerOptions
 
+from agentstack_server.configuration import Configuration
 from agentstack_server.jobs.queues import Queues
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 @inject
-async def run_workers(app: procrastinate.App):
+async def run_workers(app: procrastinate.App, configuration: Configuration):
     worker_options: list[WorkerOptions] = [
         WorkerOptions(
             name="cron_worker",
@@ -25,6 +26,7 @@ async def run_workers(app: procrastinate.App):
                 str(Queues.CRON_CONNECTOR),
                 str(Queues.CRON_CLEANUP),
                 str(Queues.CRON_MCP_PROVIDER),
+                str(Queues.CRON_VECTOR_STORE),
                 str(Queues.TOOLKIT_DELETION),
             ],
             concurrency=10,
@@ -34,7 +36,11 @@ async def run_workers(app: procrastinate.App):
             queues=[str(Queues.GENERATE_CONVERSATION_TITLE)],
             concurrency=10,
         ),
-        WorkerOptions(name="text_extraction_worker", queues=[str(Queues.TEXT_EXTRACTION)], concurrency=5),
+        WorkerOptions(
+            name="text_extraction_worker",
+            queues=[str(Queues.TEXT_EXTRACTION)],
+            concurrency=configuration.text_extraction.worker_concurrency,
+        ),
         WorkerOptions(name="build_provider_worker", queues=[str(Queues.BUILD_PROVIDER)], concurrency=5),
     ]
 
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from datetime import timedelta
-from typing import Protocol
+from typing import Protocol, Self
 from uuid import UUID
 
 from kink import inject
@@ -24,6 +24,9 @@ def global_provider_variables(configuration: Configuration):
 
 
 class IProviderDeploymentManager(Protocol):
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+
     async def create_or_replace(self, *, provider: Provider, env: dict[str, str] | None = None) -> bool: ...
     async def delete(self, *, provider_id: UUID) -> None: ...
     async def remove_orphaned_providers(self, existing_providers: list[UUID]) -> None: ...
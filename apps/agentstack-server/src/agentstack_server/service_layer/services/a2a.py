@@ -1,13 +1,15 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import functools
 import inspect
 import logging
+import time
 import uuid
 from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Callable
 from contextlib import asynccontextmanager
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import NamedTuple, cast
 from urllib.parse import urljoin, urlparse
 from uuid import UUID
@@ -38,26 +40,36 @@ from a2a.types import (
     TransportProtocol,
 )
 from a2a.utils.errors import ServerError
+from cachetools import TTLCache
 from kink import inject
+from opentelemetry.metrics import get_meter
 from pydantic import HttpUrl
 from structlog.contextvars import bind_contextvars, unbind_contextvars
 
-from agentstack_server.configuration import Configuration
+from agentstack_server.configuration import A2AProxyConfiguration, Configuration
 from agentstack_server.domain.models.provider import (
     NetworkProviderLocation,
     Provider,
     ProviderDeploymentState,
 )
 from agentstack_server.domain.models.user import User
+from agentstack_server.domain.repositories.env import EnvStoreEntity
 from agentstack_server.exceptions import EntityNotFoundError, ForbiddenUpdateError
 from agentstack_server.service_layer.deployment_manager import (
     IProviderDeploymentManager,
 )
 from agentstack_server.service_layer.services.users import UserService
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.telemetry import INSTRUMENTATION_NAME
+from agentstack_server.utils.utils import cancel_task, extract_messages, utc_now
 
 logger = logging.getLogger(__name__)
 
+_meter = get_meter(INSTRUMENTATION_NAME)
+_client_pool_hits = _meter.create_counter("a2a_proxy_client_pool_hits", description="Reused provider clients")
+_client_pool_misses = _meter.create_counter("a2a_proxy_client_pool_misses", description="Created provider clients")
+_client_pool_evictions = _meter.create_counter("a2a_proxy_client_pool_evictions", description="Closed provider clients")
+
 _SUPPORTED_TRANSPORTS = {TransportProtocol.http_json, TransportProtocol.jsonrpc}
 
 
@@ -128,55 +140,199 @@ def _handle_exception[T: Callable](fn: T) -> T:
     return _fn_iter if inspect.isasyncgenfunction(fn) else _fn  # pyright: ignore [reportReturnType]
 
 
-class ProxyRequestHandler(RequestHandler):
-    def __init__(
-        self,
-        agent_card: AgentCard,
-        provider_id: UUID,
-        uow: IUnitOfWorkFactory,
-        user: User,
-    ):
-        self._agent_card = agent_card
-        self._provider_id = provider_id
-        self._user = user
-        self._uow = uow
+class _ProviderClient:
+    def __init__(self, httpx_client: httpx.AsyncClient):
+        self.httpx_client = httpx_client
+        self.transport: ClientTransport | None = None
+        self.transport_key: tuple[str, str | None] | None = None
+        self.leases = 0
+        self.last_used_at = time.monotonic()
+        self.evicted = False
+
+
+class A2AClientPool:
+    """Long-lived httpx clients (one connection pool per provider) shared by all proxied requests."""
+
+    def __init__(self, configuration: A2AProxyConfiguration):
+        self._config = configuration
+        self._clients: dict[UUID, _ProviderClient] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _create_httpx_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=timedelta(hours=1).total_seconds(),
+            http2=self._config.client_http2,
+            limits=httpx.Limits(
+                max_connections=self._config.client_max_connections,
+                max_keepalive_connections=self._config.client_max_keepalive_connections,
+                keepalive_expiry=self._config.client_keepalive_expiry_sec,
+            ),
+        )
 
     @asynccontextmanager
-    async def _client_transport(self) -> AsyncIterator[ClientTransport]:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=timedelta(hours=1).total_seconds()) as httpx_client:
-            client: BaseClient = cast(
+    async def transport(self, *, provider_id: UUID, agent_card: AgentCard) -> AsyncIterator[ClientTransport]:
+        await self._evict_idle()
+
+        if client := self._clients.get(provider_id):
+            _client_pool_hits.add(1)
+        else:
+            _client_pool_misses.add(1)
+            client = self._clients[provider_id] = _ProviderClient(self._create_httpx_client())
+
+        transport_key = (agent_card.url, agent_card.preferred_transport)
+        if client.transport is None or client.transport_key != transport_key:
+            base_client = cast(
                 BaseClient,
-                ClientFactory(config=ClientConfig(httpx_client=httpx_client)).create(card=self._agent_card),
+                ClientFactory(config=ClientConfig(httpx_client=client.httpx_client)).create(card=agent_card),
             )
-            yield client._transport
+            client.transport, client.transport_key = base_client._transport, transport_key
 
-    async def _check_task(self, task_id: str):
+        client.leases += 1
+        try:
+            yield client.transport
+        finally:
+            client.leases -= 1
+            client.last_used_at = time.monotonic()
+            if client.evicted and not client.leases:
+                await client.httpx_client.aclose()
+
+    async def evict(self, *, provider_id: UUID) -> None:
+        if client := self._clients.pop(provider_id, None):
+            await self._close(client)
+
+    async def _evict_idle(self) -> None:
+        expire_before = time.monotonic() - self._config.client_idle_expire_after_sec
+        for provider_id, client in list(self._clients.items()):
+            if not client.leases and client.last_used_at < expire_before:
+                await self.evict(provider_id=provider_id)
+
+    async def _close(self, client: _ProviderClient) -> None:
+        _client_pool_evictions.add(1)
+        client.evicted = True
+        if not client.leases:  # clients with active requests are closed when the last lease is released
+            await client.httpx_client.aclose()
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await self._close(client)
+
+
+class A2ARequestTracker:
+    """
+    Ownership of A2A task and context ids.
+
+    Pairs (user, task/context) verified by the authoritative ownership query are cached, repeated requests only record
+    the access time which is written in bulk by flush().
+    """
+
+    def __init__(self, uow: IUnitOfWorkFactory, configuration: A2AProxyConfiguration):
+        self._uow = uow
+        self._verified: TTLCache[tuple[UUID, str, str], bool] = TTLCache(
+            maxsize=configuration.ownership_cache_size, ttl=configuration.ownership_cache_ttl_sec
+        )
+        self._accessed_tasks: dict[str, datetime] = {}
+        self._accessed_contexts: dict[str, datetime] = {}
+
+    async def check_task(self, *, user_id: UUID, task_id: str) -> None:
+        if (user_id, "task", task_id) in self._verified:
+            return
         async with self._uow() as uow:
-            await uow.a2a_requests.get_task(task_id=task_id, user_id=self._user.id)
+            await uow.a2a_requests.get_task(task_id=task_id, user_id=user_id)
+        self._verified[user_id, "task", task_id] = True
 
-    async def _check_and_record_request(
+    async def track(
         self,
+        *,
+        user_id: UUID,
+        provider_id: UUID,
         task_id: str | None = None,
         context_id: str | None = None,
         allow_task_creation: bool = False,
-    ):
+    ) -> None:
+        keys = [(user_id, kind, id) for kind, id in (("task", task_id), ("context", context_id)) if id]
+        if all(key in self._verified for key in keys):
+            now = utc_now()
+            if task_id:
+                self._accessed_tasks[task_id] = now
+            if context_id:
+                self._accessed_contexts[context_id] = now
+            return
+
         async with self._uow() as uow:
             # Consider: a bit paranoid check
             # if context_id:
             #     with suppress(ValueError, EntityNotFoundError):
             #         context_uuid = UUID(context_id)
             #         context = await uow.contexts.get(context_id=context_uuid)
-            #         if context.created_by != self._user.id:
+            #         if context.created_by != user_id:
             #             # attempt to claim context owned by another user
             #             raise ForbiddenUpdateError(entity="a2a_request_context", id=context_id)
             await uow.a2a_requests.track_request_ids_ownership(
-                user_id=self._user.id,
-                provider_id=self._provider_id,
+                user_id=user_id,
+                provider_id=provider_id,
                 task_id=task_id,
                 context_id=context_id,
                 allow_task_creation=allow_task_creation,
             )
             await uow.commit()
+        for key in keys:
+            self._verified[key] = True
+
+    async def flush(self) -> None:
+        tasks, self._accessed_tasks = self._accessed_tasks, {}
+        contexts, self._accessed_contexts = self._accessed_contexts, {}
+        if not tasks and not contexts:
+            return
+        try:
+            async with self._uow() as uow:
+                await uow.a2a_requests.update_last_accessed(tasks=tasks, contexts=contexts)
+                await uow.commit()
+        except Exception as ex:
+            self._accessed_tasks = tasks | self._accessed_tasks
+            self._accessed_contexts = contexts | self._accessed_contexts
+            logger.warning(f"Failed to update last accessed time of A2A requests: {extract_messages(ex)}")
+
+
+class ProxyRequestHandler(RequestHandler):
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        provider_id: UUID,
+        user: User,
+        client_pool: A2AClientPool,
+        request_tracker: A2ARequestTracker,
+    ):
+        self._agent_card = agent_card
+        self._provider_id = provider_id
+        self._user = user
+        self._client_pool = client_pool
+        self._request_tracker = request_tracker
+
+    @asynccontextmanager
+    async def _client_transport(self) -> AsyncIterator[ClientTransport]:
+        async with self._client_pool.transport(provider_id=self._provider_id, agent_card=self._agent_card) as transport:
+            yield transport
+
+    async def _check_task(self, task_id: str):
+        await self._request_tracker.check_task(user_id=self._user.id, task_id=task_id)
+
+    async def _check_and_record_request(
+        self,
+        task_id: str | None = None,
+        context_id: str | None = None,
+        allow_task_creation: bool = False,
+    ):
+        await self._request_tracker.track(
+            user_id=self._user.id,
+            provider_id=self._provider_id,
+            task_id=task_id,
+            context_id=context_id,
+            allow_task_creation=allow_task_creation,
+        )
 
     def _forward_context(self, context: ServerCallContext | None = None) -> ClientCallContext:
         return ClientCallContext(state={**(context.state if context else {}), "user_id": self._user.id})
@@ -288,6 +444,17 @@ class ProxyRequestHandler(RequestHandler):
         raise NotImplementedError("This is not supported by the client transport yet")
 
 
+class _ReadyProvider(NamedTuple):
+    deployment_key: str
+    url: HttpUrl
+    expires_at: float
+
+
+def _deployment_key(provider: Provider) -> str:
+    """Changes whenever the provider deployment must be re-rendered (env changes are invalidated explicitly)."""
+    return f"{provider.source.root}@{provider.updated_at.isoformat()}"
+
+
 @inject
 class A2AProxyService:
     STARTUP_TIMEOUT = timedelta(minutes=5)
@@ -304,15 +471,39 @@ class A2AProxyService:
         self._user_service = user_service
         self._config = configuration
         self._expire_requests_after = timedelta(days=configuration.a2a_proxy.requests_expire_after_days)
+        self._client_pool = A2AClientPool(configuration.a2a_proxy)
+        self._request_tracker = A2ARequestTracker(uow, configuration.a2a_proxy)
+        self._ready_providers: dict[UUID, _ReadyProvider] = {}
+        self._accessed_providers: set[UUID] = set()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self):
+        self._flush_task = asyncio.create_task(self._flush_last_accessed_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await cancel_task(self._flush_task)
+        await self.flush_last_accessed()
+        await self._client_pool.aclose()
+
+    def invalidate_provider(self, *, provider_id: UUID) -> None:
+        """Force a full deployment check on the next request (provider or its env changed)."""
+        self._ready_providers.pop(provider_id, None)
+
+    async def evict_provider(self, *, provider_id: UUID) -> None:
+        """Drop cached state and pooled connections of a provider that was deleted or scaled down."""
+        self.invalidate_provider(provider_id=provider_id)
+        await self._client_pool.evict(provider_id=provider_id)
 
     async def get_request_handler(self, *, provider: Provider, user: User) -> RequestHandler:
-        url = await self.ensure_agent(provider_id=provider.id)
+        url = await self.ensure_agent(provider=provider)
         agent_card = create_deployment_agent_card(provider.agent_card, deployment_base=str(url))
         return ProxyRequestHandler(
             agent_card=agent_card,
             provider_id=provider.id,
-            uow=self._uow,
             user=user,
+            client_pool=self._client_pool,
+            request_tracker=self._request_tracker,
         )
 
     async def expire_requests(self) -> dict[str, int]:
@@ -322,19 +513,39 @@ class A2AProxyService:
             await uow.commit()
             return {"tasks": n_tasks, "contexts": n_ctx}
 
-    async def ensure_agent(self, *, provider_id: UUID) -> HttpUrl:
+    async def flush_last_accessed(self) -> None:
+        await self._request_tracker.flush()
+        provider_ids, self._accessed_providers = self._accessed_providers, set()
+        if not provider_ids:
+            return
         try:
-            bind_contextvars(provider=provider_id)
-
             async with self._uow() as uow:
-                provider = await uow.providers.get(provider_id=provider_id)
-                await uow.providers.update_last_accessed(provider_id=provider_id)
+                await uow.providers.update_last_accessed(provider_ids=provider_ids)
                 await uow.commit()
+        except Exception as ex:
+            self._accessed_providers |= provider_ids
+            logger.warning(f"Failed to update last accessed time of providers: {extract_messages(ex)}")
+
+    async def _flush_last_accessed_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.a2a_proxy.last_accessed_flush_interval_sec)
+            await self.flush_last_accessed()
+
+    async def ensure_agent(self, *, provider: Provider) -> HttpUrl:
+        try:
+            bind_contextvars(provider=provider.id)
+            self._accessed_providers.add(provider.id)
 
             if not provider.managed:
                 assert isinstance(provider.source, NetworkProviderLocation)
                 return provider.source.a2a_url
 
+            deployment_key = _deployment_key(provider)
+            ready = self._ready_providers.get(provider.id)
+            if ready and ready.deployment_key == deployment_key and ready.expires_at > time.monotonic():
+                return ready.url
+            self.invalidate_provider(provider_id=provider.id)
+
             provider_url = await self._deploy_manager.get_provider_url(provider_id=provider.id)
             [state] = await self._deploy_manager.state(provider_ids=[provider.id])
             should_wait = False
@@ -348,10 +559,6 @@ class A2AProxyService:
                     | ProviderDeploymentState.READY
                 ):
                     async with self._uow() as uow:
-                        from agentstack_server.domain.repositories.env import (
-                            EnvStoreEntity,
-                        )
-
                         env = await uow.env.get_all(
                             parent_entity=EnvStoreEntity.PROVIDER,
                             parent_entity_ids=[provider.id],
@@ -364,6 +571,11 @@ class A2AProxyService:
                 logger.info("Waiting for provider to start up...")
                 await self._deploy_manager.wait_for_startup(provider_id=provider.id, timeout=self.STARTUP_TIMEOUT)
                 logger.info("Provider is ready...")
+            self._ready_providers[provider.id] = _ReadyProvider(
+                deployment_key=deployment_key,
+                url=provider_url,
+                expires_at=time.monotonic() + self._config.a2a_proxy.readiness_cache_ttl_sec,
+            )
             return provider_url
         finally:
             unbind_contextvars("provider")
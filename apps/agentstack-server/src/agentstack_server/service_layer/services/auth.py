@@ -1,11 +1,18 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import logging
+import time
+from uuid import UUID
 
+from cachetools import TTLCache
 from kink import inject
 
 from agentstack_server.configuration import Configuration
+from agentstack_server.domain.constants import USER_CHANGED_CHANNEL
+from agentstack_server.domain.models.permissions import AuthorizedUser
+from agentstack_server.domain.repositories.notifications import INotificationListener
 
 logger = logging.getLogger(__name__)
 
@@ -21,3 +28,48 @@ class AuthService:
             "authorization_servers": [str(p.issuer) for p in self._config.auth.oidc.providers if p.issuer is not None],
             "scopes_supported": list(self._config.auth.oidc.scope),
         }
+
+
+@inject
+class AuthorizedUserCache:
+    """
+    Authenticated users keyed by a hash of their credentials.
+
+    Entries expire with the token and are dropped when the user is updated or deleted (see USER_CHANGED_CHANNEL).
+    """
+
+    def __init__(self, configuration: Configuration, notification_listener: INotificationListener):
+        self._cache: TTLCache[bytes, tuple[AuthorizedUser, float]] = TTLCache(
+            maxsize=configuration.auth.user_cache_size, ttl=configuration.auth.user_cache_ttl_sec
+        )
+        notification_listener.subscribe(USER_CHANGED_CHANNEL, self._on_user_changed)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def key(*credentials: str) -> bytes:
+        return hashlib.sha256("\0".join(credentials).encode()).digest()
+
+    def get(self, key: bytes) -> AuthorizedUser | None:
+        if not (entry := self._cache.get(key)):
+            return None
+        authorized_user, expires_at = entry
+        if expires_at <= time.time():
+            self._cache.pop(key, None)
+            return None
+        return authorized_user.model_copy()  # dependencies set request specific attributes (context_id)
+
+    def set(self, key: bytes, authorized_user: AuthorizedUser, *, expires_at: float | None = None) -> None:
+        self._cache[key] = (authorized_user.model_copy(), expires_at or float("inf"))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        for key, (authorized_user, _) in list(self._cache.items()):
+            if authorized_user.user.id == user_id:
+                self._cache.pop(key, None)
+
+    def _on_user_changed(self, payload: str | None) -> None:
+        if payload is None:
+            self._cache.clear()
+        else:
+            self.invalidate_user(UUID(payload))
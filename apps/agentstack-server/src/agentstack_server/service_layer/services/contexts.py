@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+from collections.abc import AsyncIterator
 from contextlib import suppress
 from datetime import timedelta
 from uuid import UUID
@@ -62,6 +63,7 @@ class ContextService:
                 order=pagination.order,
                 order_by=pagination.order_by,
                 include_empty=include_empty,
+                total_count=pagination.total_count,
             )
 
     async def update(self, *, context_id: UUID, metadata: Metadata | None, user: User) -> Context:
@@ -97,17 +99,19 @@ class ContextService:
             await uow.contexts.get(context_id=context_id, user_id=user.id)
 
             # Files
-            file_ids = [file.id async for file in uow.files.list(user_id=user.id, context_id=context_id)]
+            object_ids = await uow.files.list_storage_object_ids(context_id=context_id)
             # File DB objects are deleted automatically using cascade
 
             # Vector stores
             # deleted automatically using cascade
 
             await uow.contexts.delete(context_id=context_id, user_id=user.id)
+            # objects can be shared with files in other contexts (content deduplication)
+            unreferenced_object_ids = await uow.files.filter_unreferenced_objects(object_ids=object_ids)
             await uow.commit()
 
         # TODO: a cronjob should sweep the files if the deletion fails here
-        await self._object_storage.delete_files(file_ids=file_ids)
+        await self._object_storage.delete_files(file_ids=list(unreferenced_object_ids))
 
     async def expire_resources(self) -> dict[str, int]:
         deleted_stats = {"files": 0, "vector_stores": 0}
@@ -115,7 +119,7 @@ class ContextService:
         has_more = True
 
         while has_more:
-            file_ids = []
+            object_ids = []
             async with self._uow() as uow:
                 # TODO: mark contexts as cleaned up to filter them out in next cleanup
                 page = await uow.contexts.list_paginated(
@@ -125,20 +129,21 @@ class ContextService:
                 )
                 for context in page.items:
                     # Files
-                    file_ids.extend([file.id async for file in uow.files.list(context_id=context.id)])
+                    object_ids.extend(await uow.files.list_storage_object_ids(context_id=context.id))
                     with suppress(EntityNotFoundError):
                         deleted_stats["files"] += await uow.files.delete(context_id=context.id)
 
                     # Vector stores
                     with suppress(EntityNotFoundError):
                         deleted_stats["vector_stores"] += await uow.vector_stores.delete(context_id=context.id)
+                unreferenced_object_ids = await uow.files.filter_unreferenced_objects(object_ids=object_ids)
                 await uow.commit()
 
             page_token = page.next_page_token
             has_more = page.has_more
 
             # TODO: a cronjob should sweep the files if the deletion fails here
-            await self._object_storage.delete_files(file_ids=file_ids)
+            await self._object_storage.delete_files(file_ids=list(unreferenced_object_ids))
 
         return deleted_stats
 
@@ -230,6 +235,23 @@ class ContextService:
             logger.warning(f"Failed to generate title for context {context_id}: {e}")
             raise e
 
+    async def stream_history(
+        self, *, context_id: UUID, user: User, after: UUID | None = None
+    ) -> AsyncIterator[ContextHistoryItem]:
+        """Stream history in chronological order, starting after the given history item."""
+        async with self._uow() as uow:
+            await uow.contexts.get(context_id=context_id, user_id=user.id)
+            cursor = (
+                await uow.contexts.get_history_item(context_id=context_id, history_item_id=after) if after else None
+            )
+
+        async def history_iterator() -> AsyncIterator[ContextHistoryItem]:
+            async with self._uow() as uow:
+                async for item in uow.contexts.stream_history(context_id=context_id, after=cursor):
+                    yield item
+
+        return history_iterator()
+
     async def list_history(
         self, *, context_id: UUID, user: User, pagination: PaginationQuery
     ) -> PaginatedResult[ContextHistoryItem]:
@@ -241,4 +263,5 @@ class ContextService:
                 page_token=pagination.page_token,
                 order=pagination.order,
                 order_by=pagination.order_by,
+                total_count=pagination.total_count,
             )
@@ -1,13 +1,15 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
+import hashlib
 import logging
 from asyncio import CancelledError
-from collections.abc import AsyncIterator, Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager, suppress
 from typing import Annotated
 from uuid import UUID
 
 from kink import inject
+from pydantic import HttpUrl
 from typing_extensions import Doc
 
 from agentstack_server.configuration import Configuration
@@ -16,6 +18,7 @@ from agentstack_server.domain.models.file import (
     ExtractionMetadata,
     ExtractionStatus,
     File,
+    FileReadOptions,
     FileType,
     TextExtraction,
 )
@@ -23,7 +26,7 @@ from agentstack_server.domain.models.user import User
 from agentstack_server.domain.repositories.file import IObjectStorageRepository, ITextExtractionBackend
 from agentstack_server.exceptions import EntityNotFoundError, StorageCapacityExceededError
 from agentstack_server.service_layer.services.users import UserService
-from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.service_layer.unit_of_work import IUnitOfWork, IUnitOfWorkFactory
 
 logger = logging.getLogger(__name__)
 
@@ -56,20 +59,30 @@ class FileService:
             await uow.files.update_extraction(extraction=extraction)
             await uow.commit()
         try:
-            file_url = await self._object_storage.get_file_url(file_id=file_id)
+            file_url = await self._object_storage.get_file_url(file_id=file.object_id)
             error_log.append(f"file url: {file_url}")
             async with self._extraction_backend.extract_text(file_url=file_url) as extracted_file:
-                extracted_db_file = await self.upload_file(
-                    file=extracted_file,
-                    user=user,
-                    file_type=FileType.EXTRACTED_TEXT,
-                    context_id=file.context_id,
-                    parent_file_id=file_id,
+                async with self._uow() as uow:
+                    extracted_db_file, max_size = await self._create_file(
+                        uow=uow,
+                        file=extracted_file,
+                        user=user,
+                        file_type=FileType.EXTRACTED_TEXT,
+                        context_id=file.context_id,
+                        parent_file_id=file_id,
+                    )
+                    await uow.commit()
+
+                async def complete_extraction(uow: IUnitOfWork) -> None:
+                    extraction.set_completed(
+                        extracted_file_id=extracted_db_file.id, metadata=self._extraction_backend.metadata
+                    )
+                    await uow.files.update_extraction(extraction=extraction)
+
+                # the extraction is completed in the same transaction as the extracted file
+                await self._upload_content(
+                    db_file=extracted_db_file, file=extracted_file, max_size=max_size, finalize=complete_extraction
                 )
-            extraction.set_completed(extracted_file_id=extracted_db_file.id)
-            async with self._uow() as uow:
-                await uow.files.update_extraction(extraction=extraction)
-                await uow.commit()
         except CancelledError:
             async with self._uow() as uow:
                 extraction.set_cancelled()
@@ -93,6 +106,24 @@ class FileService:
         context_id: UUID | None = None,
         parent_file_id: UUID | None = None,
     ) -> File:
+        async with self._uow() as uow:
+            db_file, max_size = await self._create_file(
+                uow=uow, file=file, user=user, file_type=file_type, context_id=context_id, parent_file_id=parent_file_id
+            )
+            await uow.commit()
+        return await self._upload_content(db_file=db_file, file=file, max_size=max_size)
+
+    async def _create_file(
+        self,
+        *,
+        uow: IUnitOfWork,
+        file: AsyncFile,
+        user: User,
+        file_type: FileType,
+        context_id: UUID | None,
+        parent_file_id: UUID | None,
+    ) -> tuple[File, int]:
+        """Create an empty file record, returns it with the maximum size of its content."""
         db_file = File(
             filename=file.filename,
             created_by=user.id,
@@ -102,21 +133,42 @@ class FileService:
             file_size_bytes=0,
             context_id=context_id,
         )
-        try:
-            async with self._uow() as uow:
-                total_usage = await uow.files.total_usage(user_id=user.id)
-                file = file.model_copy()
-                max_size = min(self._storage_limit_per_user - total_usage, self._storage_limit_per_file)
-                await uow.files.create(file=db_file)
-                await uow.commit()
+        total_usage = await uow.files.total_usage(user_id=user.id)
+        max_size = min(self._storage_limit_per_user - total_usage, self._storage_limit_per_file)
+        await uow.files.create(file=db_file)
+        return db_file, max_size
 
-            file.read = limit_size_wrapper(read=file.read, max_size=max_size)
+    async def _upload_content(
+        self,
+        *,
+        db_file: File,
+        file: AsyncFile,
+        max_size: int,
+        finalize: Callable[[IUnitOfWork], Awaitable[None]] | None = None,
+    ) -> File:
+        try:
+            content_hash = hashlib.sha256()
+            file = file.model_copy()
+            file.read = hash_wrapper(
+                read=limit_size_wrapper(read=file.read, max_size=max_size), update=content_hash.update
+            )
             db_file.file_size_bytes = await self._object_storage.upload_file(file_id=db_file.id, file=file)
+            db_file.content_hash = content_hash.hexdigest()
 
             async with self._uow() as uow:
+                db_file.storage_object_id = await uow.files.find_storage_object(content_hash=db_file.content_hash)
                 await uow.files.update(file=db_file)
+                if finalize:
+                    await finalize(uow)
                 await uow.commit()
 
+            if db_file.object_id != db_file.id:
+                # The same content is already stored, the uploaded copy is not needed
+                try:
+                    await self._object_storage.delete_files(file_ids=[db_file.id])
+                except Exception as ex:
+                    logger.warning(f"Failed to delete duplicate object of file {db_file.id}: {ex!r}")
+
             return db_file
         except Exception:
             # If the file was uploaded and then the commit failed, delete the file from the object storage.
@@ -135,15 +187,26 @@ class FileService:
         async with self._uow() as uow:
             return await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
 
+    async def get_many(self, *, file_ids: Sequence[UUID], user: User, context_id: UUID | None = None) -> Sequence[File]:
+        async with self._uow() as uow:
+            return await uow.files.get_many(file_ids=file_ids, user_id=user.id, context_id=context_id)
+
     @asynccontextmanager
     async def get_content(
-        self, *, file_id: UUID, user: User, context_id: UUID | None = None
+        self, *, file_id: UUID, user: User, context_id: UUID | None = None, options: FileReadOptions | None = None
     ) -> AsyncIterator[AsyncFile]:
         async with self._uow() as uow:
             # check if the user owns the file
-            await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
-            async with self._object_storage.get_file(file_id=file_id) as file:
-                yield file
+            db_file = await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
+        # do not hold the database connection while the content is streamed
+        async with self._object_storage.get_file(file_id=db_file.object_id, options=options) as file:
+            yield file
+
+    async def get_content_url(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> HttpUrl:
+        async with self._uow() as uow:
+            # check if the user owns the file
+            db_file = await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
+        return await self._object_storage.get_file_url(file_id=db_file.object_id)
 
     async def get_extraction(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> TextExtraction:
         async with self._uow() as uow:
@@ -151,14 +214,20 @@ class FileService:
 
     async def delete(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> None:
         async with self._uow() as uow:
-            if await uow.files.delete(file_id=file_id, user_id=user.id, context_id=context_id):
-                await self._object_storage.delete_files(file_ids=[file_id])
-                await uow.commit()
+            await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
+            object_ids = await uow.files.list_storage_object_ids(file_id=file_id)
+            # extracted text files are deleted automatically using cascade
+            await uow.files.delete(file_id=file_id, user_id=user.id, context_id=context_id)
+            unreferenced_object_ids = await uow.files.filter_unreferenced_objects(object_ids=object_ids)
+            await uow.commit()
+        await self._object_storage.delete_files(file_ids=list(unreferenced_object_ids))
 
     async def create_extraction(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> TextExtraction:
         async with self._uow() as uow:
             # Check user permissions
-            await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id, file_type=FileType.USER_UPLOAD)
+            file = await uow.files.get(
+                file_id=file_id, user_id=user.id, context_id=context_id, file_type=FileType.USER_UPLOAD
+            )
             try:
                 # Check if extraction already exists
                 extraction = await uow.files.get_extraction_by_file_id(file_id=file_id)
@@ -171,13 +240,16 @@ class FileService:
                     case _:
                         raise TypeError(f"Unknown extraction status: {extraction.status}")
             except EntityNotFoundError:
-                file_metadata = await self._object_storage.get_file_metadata(file_id=file_id)
                 extraction = TextExtraction(file_id=file_id)
-                if file_metadata.content_type in {"text/plain", "text/markdown"}:
+                if file.content_type in {"text/plain", "text/markdown"}:
                     extraction.set_completed(
                         extracted_file_id=file_id,  # Point to itself since it's already text
                         metadata=ExtractionMetadata(backend="in-place"),
                     )
+                elif extracted_file := await self._reuse_extracted_file(uow=uow, file=file, user=user):
+                    extraction.set_completed(
+                        extracted_file_id=extracted_file.id, metadata=self._extraction_backend.metadata
+                    )
                 await uow.files.create_extraction(extraction=extraction)
             if extraction.status == ExtractionStatus.PENDING:
                 from agentstack_server.jobs.tasks.file import extract_text
@@ -187,18 +259,55 @@ class FileService:
             await uow.commit()
             return extraction
 
+    async def _reuse_extracted_file(self, *, uow: IUnitOfWork, file: File, user: User) -> File | None:
+        """Share the text extracted from a file with the same content (by any user) instead of extracting again."""
+        if not file.content_hash:
+            return None
+        metadata = self._extraction_backend.metadata
+        if not (cached_file := await uow.files.find_extracted_file(content_hash=file.content_hash, metadata=metadata)):
+            return None
+        extracted_file = File(
+            filename=cached_file.filename,
+            content_type=cached_file.content_type,
+            file_size_bytes=cached_file.file_size_bytes,
+            created_by=user.id,
+            file_type=FileType.EXTRACTED_TEXT,
+            parent_file_id=file.id,
+            context_id=file.context_id,
+            content_hash=cached_file.content_hash,
+            storage_object_id=cached_file.object_id,
+        )
+        await uow.files.create(file=extracted_file)
+        return extracted_file
+
     async def delete_extraction(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> None:
         async with self._uow() as uow:
             extraction = await uow.files.get_extraction_by_file_id(
                 file_id=file_id, user_id=user.id, context_id=context_id
             )
 
+            unreferenced_object_ids = []
             if extraction.extracted_file_id and extraction.extracted_file_id != file_id:
-                await self._object_storage.delete_files(file_ids=[extraction.extracted_file_id])
-                await uow.files.delete(file_id=extraction.extracted_file_id)
+                extracted_file = await uow.files.get(file_id=extraction.extracted_file_id)
+                await uow.files.delete(file_id=extracted_file.id)
+                unreferenced_object_ids = await uow.files.filter_unreferenced_objects(
+                    object_ids=[extracted_file.object_id]
+                )
 
             await uow.files.delete_extraction(extraction_id=extraction.id)
             await uow.commit()
+        await self._object_storage.delete_files(file_ids=list(unreferenced_object_ids))
+
+
+def hash_wrapper(
+    read: Callable[[int], Awaitable[bytes]], update: Callable[[bytes], None]
+) -> Callable[[int], Awaitable[bytes]]:
+    async def _read(size: Annotated[int, Doc("The number of bytes to read from the file.")] = -1) -> bytes:
+        chunk = await read(size)
+        update(chunk)
+        return chunk
+
+    return _read
 
 
 def limit_size_wrapper(
@@ -1,19 +1,32 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
+import asyncio
+import base64
 import difflib
+import hashlib
 import logging
+import time
 from asyncio import TaskGroup
 from collections import defaultdict
+from collections.abc import Sequence
 from contextlib import suppress
-from datetime import timedelta
+from dataclasses import dataclass, field
 from uuid import UUID
 
+import httpx
+import ibm_watsonx_ai
+import ibm_watsonx_ai.foundation_models.embeddings
+import numpy as np
+import openai
 from cachetools import TTLCache
+from fastapi.concurrency import run_in_threadpool
 from httpx import HTTPError
 from kink import inject
+from opentelemetry.metrics import get_meter
 from pydantic import HttpUrl
 
-from agentstack_server.domain.constants import MODEL_API_KEY_SECRET_NAME
+from agentstack_server.configuration import Configuration, ModelProvidersConfiguration
+from agentstack_server.domain.constants import MODEL_API_KEY_SECRET_NAME, MODEL_PROVIDER_CHANGED_CHANNEL
 from agentstack_server.domain.models.model_provider import (
     Model,
     ModelCapability,
@@ -22,18 +35,211 @@ from agentstack_server.domain.models.model_provider import (
     ModelWithScore,
 )
 from agentstack_server.domain.repositories.env import EnvStoreEntity
+from agentstack_server.domain.repositories.notifications import INotificationListener
 from agentstack_server.exceptions import EntityNotFoundError, ModelLoadFailedError
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.telemetry import INSTRUMENTATION_NAME
+from agentstack_server.utils.utils import cancel_task
 
 logger = logging.getLogger(__name__)
 
+_meter = get_meter(INSTRUMENTATION_NAME)
+_embeddings_cache_hits = _meter.create_counter("embeddings_cache_hits", description="Embeddings served from cache")
+_embeddings_cache_misses = _meter.create_counter("embeddings_cache_misses", description="Embeddings sent upstream")
+
+
+@dataclass
+class _WatsonxClient:
+    api_client: ibm_watsonx_ai.APIClient
+    httpx_client: httpx.Client
+    async_httpx_client: httpx.AsyncClient
+    models: dict[str, ibm_watsonx_ai.foundation_models.ModelInference] = field(default_factory=dict)
+    embeddings: dict[str, ibm_watsonx_ai.foundation_models.embeddings.Embeddings] = field(default_factory=dict)
+
+
+class ModelProviderClientPool:
+    """Upstream clients (one connection pool per model provider) shared by all proxied requests."""
+
+    def __init__(self, configuration: ModelProvidersConfiguration):
+        self._config = configuration
+        self._openai_clients: dict[UUID, openai.AsyncOpenAI] = {}
+        self._watsonx_clients: dict[UUID, _WatsonxClient] = {}
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._openai_clients) + len(self._watsonx_clients)
+
+    @property
+    def provider_ids(self) -> set[UUID]:
+        return self._openai_clients.keys() | self._watsonx_clients.keys()
+
+    def _client_options(self) -> dict:
+        return {
+            "timeout": httpx.Timeout(self._config.client_timeout_sec, connect=10),
+            "limits": httpx.Limits(
+                max_connections=self._config.client_max_connections,
+                max_keepalive_connections=self._config.client_max_keepalive_connections,
+                keepalive_expiry=self._config.client_keepalive_expiry_sec,
+            ),
+        }
+
+    def openai_client(self, *, provider: ModelProvider, api_key: str) -> openai.AsyncOpenAI:
+        if client := self._openai_clients.get(provider.id):
+            return client
+        client = self._openai_clients[provider.id] = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=str(provider.base_url),
+            default_headers=({"RITS_API_KEY": api_key} if provider.type == ModelProviderType.RITS else {}),
+            http_client=openai.DefaultAsyncHttpxClient(**self._client_options()),
+        )
+        return client
+
+    async def _watsonx_client(self, *, provider: ModelProvider, api_key: str) -> _WatsonxClient:
+        if client := self._watsonx_clients.get(provider.id):
+            return client
+        async with self._lock:
+            if client := self._watsonx_clients.get(provider.id):
+                return client
+            httpx_client = httpx.Client(**self._client_options())
+            async_httpx_client = httpx.AsyncClient(**self._client_options())
+            # Authenticates against IAM using a blocking request
+            api_client = await run_in_threadpool(
+                ibm_watsonx_ai.APIClient,
+                credentials=ibm_watsonx_ai.Credentials(url=str(provider.base_url), api_key=api_key),
+                project_id=provider.watsonx_project_id,
+                space_id=provider.watsonx_space_id,
+                httpx_client=httpx_client,
+                async_httpx_client=async_httpx_client,
+            )
+            client = self._watsonx_clients[provider.id] = _WatsonxClient(
+                api_client=api_client, httpx_client=httpx_client, async_httpx_client=async_httpx_client
+            )
+            return client
+
+    async def watsonx_model(
+        self, *, provider: ModelProvider, api_key: str, model_id: str
+    ) -> ibm_watsonx_ai.foundation_models.ModelInference:
+        client = await self._watsonx_client(provider=provider, api_key=api_key)
+        if model := client.models.get(model_id):
+            return model
+        # Validates the model against the foundation model specs using a blocking request
+        model = await run_in_threadpool(
+            ibm_watsonx_ai.foundation_models.ModelInference, model_id=model_id, api_client=client.api_client
+        )
+        client.models[model_id] = model
+        return model
+
+    async def watsonx_embeddings(
+        self, *, provider: ModelProvider, api_key: str, model_id: str
+    ) -> ibm_watsonx_ai.foundation_models.embeddings.Embeddings:
+        client = await self._watsonx_client(provider=provider, api_key=api_key)
+        if embeddings := client.embeddings.get(model_id):
+            return embeddings
+        embeddings = await run_in_threadpool(
+            ibm_watsonx_ai.foundation_models.embeddings.Embeddings, model_id=model_id, api_client=client.api_client
+        )
+        client.embeddings[model_id] = embeddings
+        return embeddings
+
+    async def evict(self, *, provider_id: UUID) -> None:
+        if client := self._openai_clients.pop(provider_id, None):
+            await client.close()
+        if watsonx_client := self._watsonx_clients.pop(provider_id, None):
+            await self._close_watsonx(watsonx_client)
+
+    async def _close_watsonx(self, client: _WatsonxClient) -> None:
+        client.httpx_client.close()
+        await client.async_httpx_client.aclose()
+
+    async def aclose(self) -> None:
+        for provider_id in [*self._openai_clients, *self._watsonx_clients]:
+            await self.evict(provider_id=provider_id)
+
+
+class EmbeddingsCache:
+    """
+    Content-addressed cache of embeddings keyed by model and a hash of the input text.
+
+    Vectors are kept as little-endian float32 buffers and returned base64 encoded (the OpenAI wire format).
+    """
+
+    def __init__(self, configuration: ModelProvidersConfiguration):
+        self.enabled = configuration.embeddings_cache_enabled
+        self._cache: TTLCache[bytes, bytes] = TTLCache(
+            maxsize=configuration.embeddings_cache_size, ttl=configuration.embeddings_cache_ttl_sec
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def _key(model_id: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model_id}\0{text}".encode()).digest()
+
+    def get_many(self, *, model_id: str, inputs: Sequence[str]) -> list[str | None]:
+        if not self.enabled:
+            return [None] * len(inputs)
+        result = [
+            base64.b64encode(buffer).decode("ascii") if (buffer := self._cache.get(self._key(model_id, text))) else None
+            for text in inputs
+        ]
+        hits = sum(embedding is not None for embedding in result)
+        _embeddings_cache_hits.add(hits)
+        _embeddings_cache_misses.add(len(result) - hits)
+        return result
+
+    def set_many(self, *, model_id: str, inputs: Sequence[str], embeddings: Sequence[list[float] | str]) -> None:
+        if not self.enabled:
+            return
+        for text, embedding in zip(inputs, embeddings, strict=True):
+            self._cache[self._key(model_id, text)] = (
+                base64.b64decode(embedding) if isinstance(embedding, str) else np.asarray(embedding, "<f4").tobytes()
+            )
+
 
 @inject
 class ModelProviderService:
-    _provider_models: TTLCache[UUID, list[Model]] = TTLCache(maxsize=100, ttl=timedelta(days=1).total_seconds())
+    """
+    Model providers and the routing of model ids to them.
 
-    def __init__(self, uow: IUnitOfWorkFactory):
+    Requests are routed using an index of provider model listings, rebuilt in the background periodically and when a
+    provider changes (see MODEL_PROVIDER_CHANGED_CHANNEL). Providers whose models cannot be listed keep the last known
+    models in the index.
+    """
+
+    def __init__(
+        self,
+        uow: IUnitOfWorkFactory,
+        configuration: Configuration,
+        notification_listener: INotificationListener,
+    ):
         self._uow = uow
+        self._config = configuration.model_providers
+        self._api_keys: TTLCache[UUID, str] = TTLCache(
+            maxsize=1000, ttl=configuration.model_providers.api_key_cache_ttl_sec
+        )
+        self._client_pool = ModelProviderClientPool(configuration.model_providers)
+        self.embeddings_cache = EmbeddingsCache(configuration.model_providers)
+
+        # the index is replaced as a whole, requests never see a partially built one
+        self._model_index: dict[str, tuple[ModelProvider, Model]] = {}
+        self._model_index_refreshed_at: float | None = None
+        self._model_index_lock = asyncio.Lock()
+        self._provider_models: dict[UUID, list[Model]] = {}
+        self._stale_providers: set[UUID] = set()
+        self._refresh_requested = asyncio.Event()
+        self._refresh_task: asyncio.Task[None] | None = None
+        notification_listener.subscribe(MODEL_PROVIDER_CHANGED_CHANNEL, self._on_provider_changed)
+
+    async def __aenter__(self):
+        self._refresh_task = asyncio.create_task(self._refresh_model_index_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._refresh_task:
+            await cancel_task(self._refresh_task)
+            self._refresh_task = None
+        await self._client_pool.aclose()
 
     async def create_provider(
         self,
@@ -55,7 +261,10 @@ class ModelProviderService:
             watsonx_space_id=watsonx_space_id,
         )
         # Check if models are available
-        await self._get_provider_models(provider=model_provider, api_key=api_key, raise_error=True)
+        try:
+            models = await model_provider.load_models(api_key=api_key)
+        except HTTPError as ex:
+            raise ModelLoadFailedError(provider=model_provider, exception=ex) from ex
 
         async with self._uow() as uow:
             await uow.model_providers.create(model_provider=model_provider)
@@ -65,6 +274,8 @@ class ModelProviderService:
                 variables={MODEL_API_KEY_SECRET_NAME: api_key},
             )
             await uow.commit()
+        self._provider_models[model_provider.id] = models
+        self._model_index = {**self._model_index, **{model.id: (model_provider, model) for model in models}}
         return model_provider
 
     async def get_provider(self, *, model_provider_id: UUID) -> ModelProvider:
@@ -73,10 +284,29 @@ class ModelProviderService:
             return await uow.model_providers.get(model_provider_id=model_provider_id)
 
     async def get_provider_by_model_id(self, *, model_id: str) -> ModelProvider:
-        all_models = await self.get_all_models()
-        if model_id not in all_models:
-            raise EntityNotFoundError("model_provider", id=model_id)
-        return all_models[model_id][0]
+        """
+        Route a model id to its provider. Only the initial index build waits for upstream model listings, later
+        refreshes happen in the background.
+        """
+        if entry := (await self._get_model_index()).get(model_id):
+            return entry[0]
+
+        # The index may be stale (new provider or model, failed listing), fall back to the provider of the same type
+        # with unknown models and let the provider validate the model. With several such providers the model cannot
+        # be routed until the index is refreshed.
+        self._refresh_requested.set()
+        provider_type = model_id.partition(":")[0]
+        async with self._uow() as uow:
+            providers = [provider async for provider in uow.model_providers.list()]
+        candidates = [
+            provider
+            for provider in providers
+            if provider.type == provider_type
+            and (provider.id not in self._provider_models or provider.id in self._stale_providers)
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+        raise EntityNotFoundError("model_provider", id=model_id)
 
     async def list_providers(self) -> list[ModelProvider]:
         """List model providers, optionally filtered by capability."""
@@ -89,8 +319,15 @@ class ModelProviderService:
             await uow.model_providers.delete(model_provider_id=model_provider_id)
             await uow.commit()
             self._provider_models.pop(model_provider_id, None)
+            self._model_index = {
+                model_id: entry for model_id, entry in self._model_index.items() if entry[0].id != model_provider_id
+            }
+            self._api_keys.pop(model_provider_id, None)
+            await self._client_pool.evict(provider_id=model_provider_id)
 
     async def get_provider_api_key(self, *, model_provider_id: UUID) -> str:
+        if api_key := self._api_keys.get(model_provider_id):
+            return api_key
         async with self._uow() as uow:
             # Check permissions
             await uow.model_providers.get(model_provider_id=model_provider_id)
@@ -101,40 +338,101 @@ class ModelProviderService:
             )
             if not result:
                 raise EntityNotFoundError("provider_variable", id=MODEL_API_KEY_SECRET_NAME)
+            self._api_keys[model_provider_id] = result
             return result
 
-    async def _get_provider_models(
-        self, provider: ModelProvider, api_key: str, raise_error: bool = False
-    ) -> list[Model]:
+    async def get_openai_client(self, *, provider: ModelProvider) -> openai.AsyncOpenAI:
+        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
+        return self._client_pool.openai_client(provider=provider, api_key=api_key)
+
+    async def get_watsonx_model(
+        self, *, provider: ModelProvider, model_id: str
+    ) -> ibm_watsonx_ai.foundation_models.ModelInference:
+        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
+        return await self._client_pool.watsonx_model(provider=provider, api_key=api_key, model_id=model_id)
+
+    async def get_watsonx_embeddings(
+        self, *, provider: ModelProvider, model_id: str
+    ) -> ibm_watsonx_ai.foundation_models.embeddings.Embeddings:
+        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
+        return await self._client_pool.watsonx_embeddings(provider=provider, api_key=api_key, model_id=model_id)
+
+    def _on_provider_changed(self, payload: str | None) -> None:
+        # the payload is the id of the inserted, updated or deleted provider, do not serve its cached key meanwhile
+        with suppress(ValueError, TypeError):
+            self._api_keys.pop(UUID(payload), None)
+        self._refresh_requested.set()
+
+    async def _refresh_model_index_periodically(self) -> None:
+        self._refresh_requested.set()
+        while True:
+            with suppress(TimeoutError):
+                async with asyncio.timeout(self._config.model_index_refresh_interval_sec):
+                    await self._refresh_requested.wait()
+            self._refresh_requested.clear()
+            try:
+                async with self._model_index_lock:
+                    await self._refresh_model_index()
+            except Exception as ex:
+                logger.warning(f"Failed to refresh model index: {ex!r}")
+            await asyncio.sleep(self._config.model_index_min_refresh_interval_sec)
+
+    async def _load_provider_models(self, provider: ModelProvider, api_key: str) -> list[Model] | None:
         try:
-            if self._provider_models.get(provider.id) is None:
-                self._provider_models[provider.id] = await provider.load_models(api_key=api_key)
-            return self._provider_models[provider.id]
-        except HTTPError as ex:
-            if raise_error:
-                raise ModelLoadFailedError(provider=provider, exception=ex) from ex
-            logger.warning(f"Failed to load models for {provider.type} provider {provider.id}: {ex}")
-        return []
+            models = await provider.load_models(api_key=api_key)
+            self._stale_providers.discard(provider.id)
+            return models
+        except Exception as ex:
+            logger.warning(f"Failed to load models for {provider.type} provider {provider.id}: {ex!r}")
+            self._stale_providers.add(provider.id)
+            return self._provider_models.get(provider.id)
 
-    async def get_all_models(self) -> dict[str, tuple[ModelProvider, Model]]:
+    async def _refresh_model_index(self) -> None:
         async with self._uow() as uow:
             providers = [provider async for provider in uow.model_providers.list()]
             all_env = await uow.env.get_all(
                 parent_entity=EnvStoreEntity.MODEL_PROVIDER, parent_entity_ids=[p.id for p in providers]
             )
         async with TaskGroup() as tg:
-            for provider in providers:
-                tg.create_task(
-                    self._get_provider_models(
+            tasks = {
+                provider.id: tg.create_task(
+                    self._load_provider_models(
                         provider=provider, api_key=all_env[provider.id][MODEL_API_KEY_SECRET_NAME]
                     )
                 )
+                for provider in providers
+            }
 
-        result = {}
-        for provider in providers:
-            for model in self._provider_models.get(provider.id, []):
-                result[model.id] = (provider, model)
-        return result
+        provider_models = {
+            provider_id: models for provider_id, task in tasks.items() if (models := task.result()) is not None
+        }
+        cached_provider_ids = self._provider_models.keys() | self._api_keys.keys() | self._client_pool.provider_ids
+        for provider_id in cached_provider_ids - tasks.keys():  # deleted in another replica
+            self._api_keys.pop(provider_id, None)
+            await self._client_pool.evict(provider_id=provider_id)
+        self._stale_providers &= tasks.keys()
+        self._provider_models = provider_models
+        self._model_index = {
+            model.id: (provider, model) for provider in providers for model in provider_models.get(provider.id, [])
+        }
+        self._model_index_refreshed_at = time.monotonic()
+
+    def _model_index_expired(self) -> bool:
+        if self._model_index_refreshed_at is None:
+            return True
+        # without the background refresh (e.g. in workers) the index is rebuilt on use
+        expires_at = self._model_index_refreshed_at + self._config.model_index_refresh_interval_sec
+        return not self._refresh_task and expires_at < time.monotonic()
+
+    async def _get_model_index(self) -> dict[str, tuple[ModelProvider, Model]]:
+        if self._model_index_expired():
+            async with self._model_index_lock:
+                if self._model_index_expired():
+                    await self._refresh_model_index()
+        return self._model_index
+
+    async def get_all_models(self) -> dict[str, tuple[ModelProvider, Model]]:
+        return await self._get_model_index()
 
     async def match_models(
         self, suggested_models: list[str] | None, capability: ModelCapability, score_cutoff: float = 0.4
@@ -141,6 +141,7 @@ class ProviderBuildService:
                 order=pagination.order,
                 order_by=pagination.order_by,
                 status=status,
+                total_count=pagination.total_count,
             )
 
     async def build_provider(self, provider_build_id: UUID) -> ProviderBuild:
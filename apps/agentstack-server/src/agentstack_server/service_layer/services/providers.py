@@ -12,6 +12,7 @@ from datetime import timedelta
 from uuid import UUID
 
 from a2a.types import AgentCard
+from cachetools import TTLCache
 from fastapi import HTTPException
 from kink import inject
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
@@ -28,10 +29,11 @@ from agentstack_server.domain.models.provider import (
 from agentstack_server.domain.models.registry import RegistryLocation
 from agentstack_server.domain.models.user import User, UserRole
 from agentstack_server.domain.repositories.env import EnvStoreEntity
-from agentstack_server.exceptions import ManifestLoadError
+from agentstack_server.exceptions import EntityNotFoundError, ManifestLoadError
 from agentstack_server.service_layer.deployment_manager import (
     IProviderDeploymentManager,
 )
+from agentstack_server.service_layer.services.a2a import A2AProxyService
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
 from agentstack_server.utils.a2a import get_extension
 from agentstack_server.utils.github import ResolvedGithubUrl
@@ -43,9 +45,21 @@ logger = logging.getLogger(__name__)
 
 @inject
 class ProviderService:
-    def __init__(self, deployment_manager: IProviderDeploymentManager, uow: IUnitOfWorkFactory):
+    PROVIDER_CACHE_TTL = timedelta(seconds=5)
+
+    def __init__(
+        self,
+        deployment_manager: IProviderDeploymentManager,
+        uow: IUnitOfWorkFactory,
+        a2a_proxy: A2AProxyService,
+    ):
         self._uow = uow
         self._deployment_manager = deployment_manager
+        self._a2a_proxy = a2a_proxy
+        # Short-lived view for hot paths (A2A proxy), deployment state changes are picked up after the TTL
+        self._providers: TTLCache[UUID, ProviderWithState] = TTLCache(
+            maxsize=1000, ttl=self.PROVIDER_CACHE_TTL.total_seconds()
+        )
 
     async def create_provider(
         self,
@@ -209,28 +223,34 @@ class ProviderService:
             raise ManifestLoadError(location=location, message=str(ex)) from ex
 
     async def _get_providers_with_state(self, providers: list[Provider]) -> list[ProviderWithState]:
-        result_providers = []
-        provider_states = await self._deployment_manager.state(provider_ids=[provider.id for provider in providers])
+        # Deployment state is only relevant for managed providers, env only for providers declaring variables
+        managed_ids = [provider.id for provider in providers if provider.managed]
+        states = dict(
+            zip(managed_ids, await self._deployment_manager.state(provider_ids=managed_ids), strict=True)
+            if managed_ids
+            else []
+        )
+        env_ids = [provider.id for provider in providers if provider.env]
+        providers_env = {}
+        if env_ids:
+            async with self._uow() as uow:
+                providers_env = await uow.env.get_all(parent_entity=EnvStoreEntity.PROVIDER, parent_entity_ids=env_ids)
 
-        async with self._uow() as uow:
-            provider_ids = [provider.id for provider in providers]
-            providers_env = await uow.env.get_all(parent_entity=EnvStoreEntity.PROVIDER, parent_entity_ids=provider_ids)
-
-            for provider, state in zip(providers, provider_states, strict=False):
-                final_state = state
-                if not provider.managed:
-                    final_state = provider.unmanaged_state if provider.unmanaged_state else UnmanagedState.OFFLINE
-                result_providers.append(
-                    ProviderWithState(
-                        **provider.model_dump(),
-                        state=final_state,
-                        missing_configuration=[
-                            var
-                            for var in provider.check_env(providers_env[provider.id], raise_error=False)
-                            if var.required
-                        ],
-                    )
+        result_providers = []
+        for provider in providers:
+            result_providers.append(
+                ProviderWithState(
+                    **provider.model_dump(),
+                    state=(
+                        states[provider.id] if provider.managed else provider.unmanaged_state or UnmanagedState.OFFLINE
+                    ),
+                    missing_configuration=[
+                        var
+                        for var in provider.check_env(providers_env.get(provider.id), raise_error=False)
+                        if var.required
+                    ],
                 )
+            )
         return result_providers
 
     async def delete_provider(self, *, provider_id: UUID, user: User) -> None:
@@ -241,6 +261,8 @@ class ProviderService:
             if provider.managed:
                 await self._deployment_manager.delete(provider_id=provider_id)
             await uow.commit()
+        self._invalidate_provider(provider_id)
+        await self._a2a_proxy.evict_provider(provider_id=provider_id)
 
     async def scale_down_providers(self):
         active_providers = [
@@ -254,6 +276,8 @@ class ProviderService:
                 if provider.auto_stop_timeout and (provider.last_active_at + provider.auto_stop_timeout) < utc_now():
                     logger.info(f"Scaling down provider: {provider.id}")
                     await self._deployment_manager.scale_down(provider_id=provider.id)
+                    self._invalidate_provider(provider.id)
+                    await self._a2a_proxy.evict_provider(provider_id=provider.id)
             except Exception as ex:
                 errors.append(ex)
         if errors:
@@ -290,14 +314,24 @@ class ProviderService:
     ) -> ProviderWithState:
         if not (bool(provider_id) ^ bool(location)):
             raise ValueError("Either provider_id or location must be provided")
-        providers = [
-            provider
-            for provider in await self.list_providers()
-            if provider.id == provider_id or provider.source == location
-        ]
-        if not providers:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Provider with ID: {provider_id!s} not found")
-        return providers[0]
+        if provider_id and (cached := self._providers.get(provider_id)):
+            return cached
+        try:
+            async with self._uow() as uow:
+                if provider_id:
+                    provider = await uow.providers.get(provider_id=provider_id)
+                else:
+                    provider = await uow.providers.get_by_source(source=location)  # pyright: ignore [reportArgumentType]
+        except EntityNotFoundError as ex:
+            raise HTTPException(
+                status_code=HTTP_404_NOT_FOUND, detail=f"Provider with ID: {provider_id!s} not found"
+            ) from ex
+        [provider_with_state] = await self._get_providers_with_state(providers=[provider])
+        self._providers[provider.id] = provider_with_state
+        return provider_with_state
+
+    def _invalidate_provider(self, provider_id: UUID) -> None:
+        self._providers.pop(provider_id, None)
 
     async def stream_logs(self, provider_id: UUID, user: User) -> Callable[..., AsyncIterator[str]]:
         user_id = user.id if user.role != UserRole.ADMIN else None
@@ -324,6 +358,8 @@ class ProviderService:
         return logs_iterator
 
     async def _rotate_provider(self, provider: Provider, env: dict[str, str]):
+        self._invalidate_provider(provider.id)
+        await self._a2a_proxy.evict_provider(provider_id=provider.id)
         [state] = await self._deployment_manager.state(provider_ids=[provider.id])
         if (
             provider.managed
@@ -363,6 +399,8 @@ class ProviderService:
                     logger.exception(
                         f"Failed to update env, attempting to rollback provider: {provider.id} to previous state"
                     )
+                    self._invalidate_provider(provider.id)
+                    self._a2a_proxy.invalidate_provider(provider_id=provider.id)
                     await self._deployment_manager.create_or_replace(provider=provider, env=orig_env)
                 except Exception:
                     logger.error(f"Failed to rollback provider: {provider.id}")
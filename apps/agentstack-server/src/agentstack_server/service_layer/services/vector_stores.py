@@ -3,22 +3,31 @@
 
 import builtins
 import logging
-from collections.abc import Iterable
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from uuid import UUID
 
+import numpy as np
 from kink import inject
 
 from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.common import Metadata
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.models.vector_store import (
     DocumentType,
+    VectorDistanceMetric,
+    VectorSearchMode,
     VectorStore,
     VectorStoreDocument,
+    VectorStoreIngestionStats,
     VectorStoreItem,
     VectorStoreSearchResult,
+    VectorStoreStats,
 )
 from agentstack_server.exceptions import InvalidVectorDimensionError, StorageCapacityExceededError
-from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.service_layer.unit_of_work import IUnitOfWork, IUnitOfWorkFactory
+from agentstack_server.utils.utils import abatched
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +38,27 @@ class VectorStoreService:
 
     def __init__(self, uow: IUnitOfWorkFactory, configuration: Configuration):
         self._uow = uow
+        self._configuration = configuration.vector_stores
         self._storage_limit_per_user = configuration.vector_stores.storage_limit_per_user_bytes
+        self._dedicated_partition_min_usage = configuration.vector_stores.dedicated_partition_min_usage_bytes
+        self._bulk_ingestion_batch_size = configuration.vector_stores.bulk_ingestion_batch_size
+        self._iterative_scan = configuration.vector_stores.hnsw_iterative_scan != "off"
+
+    async def __aenter__(self):
+        await self._check_iterative_scan_support()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb): ...
+
+    async def _check_iterative_scan_support(self) -> None:
+        """Iterative HNSW scans were added in pgvector 0.8, older versions reject the settings and fail every search."""
+        if not self._iterative_scan:
+            return
+        async with self._uow() as uow:
+            version = await uow.vector_database.get_extension_version()
+        if version is None or tuple(int(part) for part in version.split(".")[:2]) < (0, 8):
+            logger.warning(f"pgvector {version} does not support iterative index scans, turning them off")
+            self._iterative_scan = False
 
     async def list(self, *, user: User) -> list[VectorStore]:
         """List all vector stores for a user."""
@@ -44,8 +73,10 @@ class VectorStoreService:
         )
         async with self._uow() as uow:
             await uow.vector_stores.create(vector_store=vector_store)
-            await uow.vector_database.create_collection(collection_id=vector_store.id, dimension=dimension)
+            partition = await uow.vector_database.create_collection(collection_id=vector_store.id, dimension=dimension)
+            await uow.vector_stores.update_partition(vector_store_id=vector_store.id, partition=partition)
             await uow.commit()
+        vector_store.stats = VectorStoreStats(usage_bytes=0, num_documents=0, partition=partition)
         return vector_store
 
     async def get(self, *, vector_store_id: UUID, user: User, context_id: UUID | None = None) -> VectorStore:
@@ -61,10 +92,66 @@ class VectorStoreService:
     async def delete(self, *, vector_store_id: UUID, user: User, context_id: UUID | None = None) -> None:
         """Delete a vector store by ID."""
         async with self._uow() as uow:
+            vector_store = await uow.vector_stores.get(
+                vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
+            )
+            await uow.vector_database.delete_collection(collection_id=vector_store_id, dimension=vector_store.dimension)
             await uow.vector_stores.delete(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
-            # Records in vector_database are deleted automatically by CASCADE operations in postgres
+            # Records in shared partitions of vector_database are deleted automatically by CASCADE operations
             await uow.commit()
 
+    async def rebalance_partitions(self) -> dict[str, builtins.list[str]]:
+        """
+        Move large vector stores to dedicated partitions and drop partitions of vector stores deleted in bulk.
+        """
+        stats = {"promoted": [], "dropped": []}
+        async with self._uow() as uow:
+            vector_stores = [
+                vector_store
+                async for vector_store in uow.vector_stores.list(min_usage_bytes=self._dedicated_partition_min_usage)
+            ]
+            stats["dropped"] = await uow.vector_database.drop_orphaned_partitions()
+            await uow.commit()
+
+        for vector_store in vector_stores:
+            # Each vector store is moved in a separate transaction to keep the locks short
+            async with self._uow() as uow:
+                await uow.vector_database.lock_collection(collection_id=vector_store.id, exclusive=True)
+                async with self._excluded_from_shared_partition(vector_store) as excluded:
+                    if not excluded:
+                        continue
+                    partition = await uow.vector_database.create_dedicated_partition(
+                        collection_id=vector_store.id, dimension=vector_store.dimension
+                    )
+                    await uow.vector_stores.update_partition(vector_store_id=vector_store.id, partition=partition)
+                    await uow.commit()
+                    stats["promoted"].append(partition)
+        return stats
+
+    @asynccontextmanager
+    async def _excluded_from_shared_partition(self, vector_store: VectorStore) -> AsyncIterator[bool]:
+        """
+        Exclude the vector store from the shared partition while a dedicated partition is created in the block. The
+        exclusion is committed right away by a separate unit of work, the caller must already hold the exclusive
+        collection lock so that writes to the vector store wait for the move instead of failing. Yields False if the
+        vector store already has a dedicated partition or could not be excluded, the block must not move it then.
+        """
+        async with self._uow() as uow:
+            excluded = await uow.vector_database.exclude_from_shared_partition(
+                collection_id=vector_store.id, dimension=vector_store.dimension
+            )
+            await uow.commit()
+        try:
+            yield excluded
+        except BaseException:
+            if excluded:
+                async with self._uow() as uow:
+                    await uow.vector_database.include_in_shared_partition(
+                        collection_id=vector_store.id, dimension=vector_store.dimension
+                    )
+                    await uow.commit()
+            raise
+
     async def list_documents(
         self, *, vector_store_id: UUID, user: User, context_id: UUID | None = None
     ) -> builtins.list[VectorStoreDocument]:
@@ -80,10 +167,43 @@ class VectorStoreService:
         async with self._uow() as uow:
             # check ownership
             await uow.vector_stores.get(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
+            await uow.vector_database.lock_collection(collection_id=vector_store_id)
             await uow.vector_stores.remove_documents(vector_store_id=vector_store_id, document_ids=document_ids)
             # Records in vector_database are deleted automatically by CASCADE operations in postgres
             await uow.commit()
 
+    async def _add_documents(
+        self, uow: IUnitOfWork, *, vector_store: VectorStore, items: builtins.list[VectorStoreItem], total_usage: int
+    ) -> int:
+        """Validate items and upsert their documents, returns usage of the items in bytes."""
+        # Check dimension
+        if any(len(item.embedding) != vector_store.dimension for item in items):
+            raise InvalidVectorDimensionError(
+                f"Vector dimensions must match vector store dimension: {vector_store.dimension}"
+            )
+
+        # Check usage
+        usage_bytes_per_document_id = {d.id: d.usage_bytes for d in uow.vector_database.estimate_size(items)}
+        items_usage = sum(usage_bytes_per_document_id.values())
+        if total_usage + items_usage > self._storage_limit_per_user:
+            # We are a bit more cautious here, the storage may in fact not be exceeded because some documents
+            # or items might already be in the database - the operation below is an upsert, but for simplicity
+            # we check the usage as if all items were new.
+            raise StorageCapacityExceededError(entity="vector_store", max_size=self._storage_limit_per_user)
+
+        await uow.vector_stores.upsert_documents(
+            documents={
+                item.document_id: VectorStoreDocument(
+                    vector_store_id=vector_store.id,
+                    id=item.document_id,
+                    file_id=UUID(item.document_id) if item.document_type == DocumentType.PLATFORM_FILE else None,
+                    usage_bytes=usage_bytes_per_document_id.get(item.document_id),
+                )
+                for item in items
+            }.values()
+        )
+        return items_usage
+
     async def add_items(
         self,
         *,
@@ -91,57 +211,121 @@ class VectorStoreService:
         items: builtins.list[VectorStoreItem],
         user: User,
         context_id: UUID | None = None,
-    ) -> None:
+    ) -> VectorStoreIngestionStats:
+        start = time.perf_counter()
         async with self._uow() as uow:
             # Verify the user owns the vector store
             vector_store = await uow.vector_stores.get(
                 vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
             )
-
-            # Check dimension
-            if any(len(item.embedding) != vector_store.dimension for item in items):
-                raise InvalidVectorDimensionError(
-                    f"Vector dimensions must match vector store dimension: {vector_store.dimension}"
-                )
-
-            # Check usage
-            usage_bytes_per_document_id = {d.id: d.usage_bytes for d in uow.vector_database.estimate_size(items)}
+            # Waits while the vector store is being moved to a dedicated partition
+            await uow.vector_database.lock_collection(collection_id=vector_store_id)
             total_usage = await uow.vector_stores.total_usage(user_id=user.id)
-            if total_usage + sum(usage_bytes_per_document_id.values()) > self._storage_limit_per_user:
-                # We are a bit more cautious here, the storage may in fact not be exceeded because some documents
-                # or items might already be in the database - the operation below is an upsert, but for simplicity
-                # we check the usage as if all items were new.
-                raise StorageCapacityExceededError(entity="vector_store", max_size=self._storage_limit_per_user)
-
-            await uow.vector_stores.upsert_documents(
-                documents={
-                    item.document_id: VectorStoreDocument(
-                        vector_store_id=vector_store_id,
-                        id=item.document_id,
-                        file_id=UUID(item.document_id) if item.document_type == DocumentType.PLATFORM_FILE else None,
-                        usage_bytes=usage_bytes_per_document_id.get(item.document_id),
-                    )
-                    for item in items
-                }.values()
-            )
+            await self._add_documents(uow, vector_store=vector_store, items=items, total_usage=total_usage)
             await uow.vector_database.add_items(collection_id=vector_store_id, items=items)
             await uow.commit()
+        return self._ingestion_stats(items=len(items), start=start)
+
+    async def bulk_add_items(
+        self,
+        *,
+        vector_store_id: UUID,
+        items: AsyncIterable[VectorStoreItem],
+        user: User,
+        context_id: UUID | None = None,
+    ) -> VectorStoreIngestionStats:
+        """
+        Stream items into the vector store in batches loaded by COPY. Indexes are updated once all items are loaded,
+        vector stores that grow large enough are moved to a dedicated partition with indexes built in bulk. Other writes
+        to the vector store wait until the ingestion is committed.
+        """
+        start, num_items = time.perf_counter(), 0
+        async with self._uow() as uow:
+            vector_store = await uow.vector_stores.get(
+                vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
+            )
+            # Locked before any item is written, the vector store may be moved to a dedicated partition
+            await uow.vector_database.lock_collection(collection_id=vector_store_id, exclusive=True)
+            total_usage = await uow.vector_stores.total_usage(user_id=user.id)
+            vector_store_usage = vector_store.stats.usage_bytes if vector_store.stats else 0
+            async for batch in abatched(items, self._bulk_ingestion_batch_size):
+                items_usage = await self._add_documents(
+                    uow, vector_store=vector_store, items=batch, total_usage=total_usage
+                )
+                await uow.vector_database.stage_items(collection_id=vector_store_id, items=batch)
+                total_usage += items_usage
+                vector_store_usage += items_usage
+                num_items += len(batch)
+            if vector_store_usage < self._dedicated_partition_min_usage:
+                await uow.vector_database.insert_staged_items(
+                    collection_id=vector_store_id, dimension=vector_store.dimension, dedicated_partition=False
+                )
+                await uow.commit()
+            else:
+                async with self._excluded_from_shared_partition(vector_store) as excluded:
+                    await uow.vector_database.insert_staged_items(
+                        collection_id=vector_store_id, dimension=vector_store.dimension, dedicated_partition=excluded
+                    )
+                    await uow.commit()
+        return self._ingestion_stats(items=num_items, start=start)
+
+    def _ingestion_stats(self, *, items: int, start: float) -> VectorStoreIngestionStats:
+        elapsed_sec = time.perf_counter() - start
+        return VectorStoreIngestionStats(
+            items=items, elapsed_sec=elapsed_sec, rows_per_second=items / elapsed_sec if elapsed_sec else 0
+        )
 
     async def search(
         self,
         *,
         vector_store_id: UUID,
-        query_vector: builtins.list[float],
+        query_vector: np.ndarray | None = None,
+        query_text: str | None = None,
+        mode: VectorSearchMode = VectorSearchMode.VECTOR,
         limit: int = 10,
+        metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        ef_search: int | None = None,
+        metadata_filter: Metadata | None = None,
         user: User,
         context_id: UUID | None = None,
     ) -> builtins.list[VectorStoreSearchResult]:
         """
-        Search a vector store using a query vector and return results with similarity scores.
+        Search a vector store by query vector, full-text query or both and return results with scores.
         """
         async with self._uow() as uow:
-            await uow.vector_stores.get(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
-            results = await uow.vector_database.similarity_search(
-                collection_id=vector_store_id, query_vector=query_vector, limit=limit
+            vector_store = await uow.vector_stores.get(
+                vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
             )
+            match mode:
+                case VectorSearchMode.VECTOR if query_vector is not None:
+                    results = await uow.vector_database.similarity_search(
+                        collection_id=vector_store_id,
+                        query_vector=query_vector,
+                        limit=limit,
+                        metric=metric,
+                        ef_search=ef_search,
+                        iterative_scan=self._iterative_scan,
+                        metadata_filter=metadata_filter,
+                    )
+                case VectorSearchMode.LEXICAL if query_text:
+                    results = await uow.vector_database.text_search(
+                        collection_id=vector_store_id,
+                        dimension=vector_store.dimension,
+                        query_text=query_text,
+                        limit=limit,
+                        metadata_filter=metadata_filter,
+                    )
+                case VectorSearchMode.HYBRID if query_vector is not None and query_text:
+                    results = await uow.vector_database.hybrid_search(
+                        collection_id=vector_store_id,
+                        query_vector=query_vector,
+                        query_text=query_text,
+                        limit=limit,
+                        metric=metric,
+                        ef_search=ef_search,
+                        iterative_scan=self._iterative_scan,
+                        metadata_filter=metadata_filter,
+                    )
+                case _:
+                    raise ValueError(f"Missing query for {mode} search")
             return list(results)
@@ -0,0 +1,36 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+from collections.abc import Sequence
+from enum import StrEnum
+
+import numpy as np
+
+
+class EmbeddingEncoding(StrEnum):
+    FLOAT = "float"  # JSON list of floats
+    BASE64 = "base64"  # base64 of little-endian float32, same as the OpenAI embeddings API
+    BASE64_FLOAT16 = "base64_float16"  # base64 of little-endian float16, half the size, matches HALFVEC precision
+
+
+_DTYPES = {EmbeddingEncoding.BASE64: np.dtype("<f4"), EmbeddingEncoding.BASE64_FLOAT16: np.dtype("<f2")}
+
+
+def encode_embedding(embedding: Sequence[float] | np.ndarray, encoding: EmbeddingEncoding) -> str | list[float]:
+    if encoding == EmbeddingEncoding.FLOAT:
+        return embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
+    return base64.b64encode(np.asarray(embedding, dtype=_DTYPES[encoding]).tobytes()).decode("ascii")
+
+
+def decode_embedding(embedding: str | bytes | memoryview, encoding: EmbeddingEncoding) -> np.ndarray:
+    """
+    Decode a base64 string or a raw buffer without copying it into Python floats. Float encoding is treated as
+    float32 for buffer inputs.
+    """
+    dtype = _DTYPES.get(encoding, _DTYPES[EmbeddingEncoding.BASE64])
+    try:
+        buffer = base64.b64decode(embedding, validate=True) if isinstance(embedding, str) else embedding
+        return np.frombuffer(buffer, dtype=dtype)
+    except ValueError as e:
+        raise ValueError(f"Invalid {dtype.name} embedding buffer: {e}") from e
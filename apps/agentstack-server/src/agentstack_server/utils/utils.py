@@ -8,7 +8,7 @@ import json
 import re
 import shutil
 from asyncio import CancelledError
-from collections.abc import AsyncIterable, Callable, Iterable
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
 from contextlib import suppress
 from datetime import UTC, datetime
 from typing import Any, cast
@@ -52,6 +52,18 @@ async def cancel_task(task: asyncio.Task[None] | None):
             await task
 
 
+async def abatched[T](iterable: AsyncIterable[T], n: int) -> AsyncIterator[list[T]]:
+    """Async version of itertools.batched, the last batch may be shorter."""
+    batch = []
+    async for item in iterable:
+        batch.append(item)
+        if len(batch) >= n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def utc_now() -> datetime:
     return datetime.now(UTC)
 
@@ -66,43 +78,75 @@ def async_to_sync_isolated[AnyCallableT: Callable[..., Any]](fn: AnyCallableT) -
     return wrapped_fn
 
 
+# Longest prefix of a JSON string body made of complete characters and escape sequences
+_JSON_STRING_CONTENT = re.compile(rb'(?:[^"\\]+|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+_HIGH_SURROGATE_ESCAPE = re.compile(rb"\\u[dD][89abAB][0-9a-fA-F]{2}")
+
+
+def _incomplete_utf8_length(data: bytes, end: int) -> int:
+    """Number of bytes before end forming an incomplete UTF-8 sequence."""
+    for length in range(1, min(4, end) + 1):
+        byte = data[end - length]
+        if byte & 0xC0 != 0x80:  # not a continuation byte
+            expected = 4 if byte >= 0xF0 else 3 if byte >= 0xE0 else 2 if byte >= 0xC0 else 1
+            return length if length < expected else 0
+    return 0
+
+
+def _ends_with_high_surrogate(data: bytes, end: int) -> bool:
+    """Whether an \\uD800-\\uDBFF escape, whose low surrogate may be in the next chunk, ends at end."""
+    start = end - 6
+    if start < 0 or not _HIGH_SURROGATE_ESCAPE.fullmatch(data, start, end):
+        return False
+    backslashes = 0
+    while start - backslashes > 0 and data[start - backslashes - 1] == ord("\\"):
+        backslashes += 1
+    return backslashes % 2 == 0  # otherwise the backslash itself is escaped
+
+
 async def extract_string_value_stream(
-    async_stream: Callable[[int], AsyncIterable[str]], key: str, chunk_size: int = 1024
-) -> AsyncIterable[str]:
-    buffer = ""
-    max_buffer_size = len(key) * 2
-    state = "outside"
-    if chunk_size < max_buffer_size:
-        raise ValueError("Chunk size too small")
+    async_stream: Callable[[int], AsyncIterable[bytes]], key: str, chunk_size: int = 1024
+) -> AsyncIterable[bytes]:
+    """
+    Stream the decoded value of a string field from a JSON document as UTF-8 bytes without parsing the whole document.
+
+    The first occurrence of the key (at any depth) is used. Chunks without escape sequences are passed through as is,
+    escaped chunks are decoded in bulk by the json module. Incomplete escape sequences, surrogate pairs and multibyte
+    characters at the end of a chunk are carried over to the next one.
+    """
+    key_pattern = re.compile(rb'"%s"\s*:\s*"' % re.escape(key.encode("utf-8")))
+    max_tail_size = len(key.encode("utf-8")) + 16
+    buffer = b""
+    inside = False
 
     async for chunk in async_stream(chunk_size):
         buffer += chunk
-        if state == "outside":
-            if match := re.search(rf'"{key}" *: *"', buffer):
+        if not inside:
+            if match := key_pattern.search(buffer):
                 buffer = buffer[match.end() :]
-                state = "inside"
+                inside = True
             else:
-                buffer = buffer[-max_buffer_size:]
-        if state == "inside":
-            backslash_count = 0
-            for idx, char in enumerate(buffer):
-                if char == "\\":
-                    backslash_count += 1
-                elif char == '"':
-                    if backslash_count % 2 == 0:
-                        yield json.loads(f'"{buffer[:idx]}"')
-                        return
-                    backslash_count = 0
-                else:
-                    backslash_count = 0
-            if backslash_count % 2 == 0:
-                yield json.loads(f'"{buffer}"')
-                buffer = ""
-            else:
-                yield json.loads(f'"{buffer[:-1]}"')
-                buffer = "\\"
-
-    if state == "inside":
+                buffer = buffer[-max_tail_size:]
+                continue
+
+        end = _JSON_STRING_CONTENT.match(buffer).end()
+        closed = end < len(buffer) and buffer[end] == ord('"')
+        if not closed:
+            if len(buffer) - end >= 6:  # longer than any escape sequence
+                raise ValueError(f"Invalid escape sequence in JSON string: {buffer[end : end + 6]!r}")
+            if _ends_with_high_surrogate(buffer, end):
+                end -= 6
+            end -= _incomplete_utf8_length(buffer, end)
+
+        content, buffer = buffer[:end], buffer[end:]
+        if b"\\" in content:
+            content = json.loads(b'"%s"' % content).encode("utf-8")
+        if content:
+            yield content
+        if closed:
+            return
+
+    if inside:
         raise EOFError("Unterminated string value in JSON input")
     else:
         raise KeyError(f"Key {key} not found in JSON input")
@@ -19,6 +19,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
+from agentstack_server.infrastructure.vector_database.vector_db import register_vector_codecs
 
 
 class TestConfiguration(BaseSettings):
@@ -85,7 +86,7 @@ async def kr8s_client():
 @pytest.fixture()
 async def db_transaction(test_configuration):
     """Auto-rollback connection"""
-    engine = create_async_engine(test_configuration.db_url)
+    engine = register_vector_codecs(create_async_engine(test_configuration.db_url))
     async with engine.connect() as connection, connection.begin() as transaction:
         try:
             yield connection
@@ -32,7 +32,7 @@ async def test_context_pagination(subtests):
         assert created_ats == sorted(created_ats, reverse=True)
 
     with subtests.test("test pagination with limit"):
-        response = await Context.list(limit=2)
+        response = await Context.list(limit=2, total_count="exact")
         assert len(response.items) == 2
         assert response.total_count == 5
         assert response.has_more is True
@@ -1,5 +1,6 @@
 # Copyright 2025 © BeeAI a Series of LF Projects, LLC
 # SPDX-License-Identifier: Apache-2.0
+import uuid
 from collections.abc import Callable
 from datetime import timedelta
 from io import BytesIO
@@ -7,7 +8,7 @@ from io import BytesIO
 import httpx
 import pytest
 from agentstack_sdk.platform import use_platform_client
-from agentstack_sdk.platform.client import PlatformClient
+from agentstack_sdk.platform.client import PlatformClient, get_platform_client
 from agentstack_sdk.platform.context import Context, ContextPermissions
 from agentstack_sdk.platform.file import File
 from tenacity import AsyncRetrying, stop_after_delay, wait_fixed
@@ -39,6 +40,37 @@ async def test_files(subtests):
             _ = await File.get(self=file_id)
 
 
+@pytest.mark.usefixtures("clean_up", "setup_platform_client")
+async def test_get_many_files(subtests):
+    files = [
+        await File.create(filename=f"{i}.txt", content=str(i).encode(), content_type="text/plain") for i in range(3)
+    ]
+    missing_id = str(uuid.uuid4())
+
+    with subtests.test("missing files are omitted and the order is kept"):
+        retrieved = await File.get_many([files[2].id, missing_id, files[0].id, files[2].id])
+        assert [file.id for file in retrieved] == [files[2].id, files[0].id]
+
+    with subtests.test("more ids than a single request allows are batched"):
+        retrieved = await File.get_many([*(str(uuid.uuid4()) for _ in range(150)), files[1].id])
+        assert [file.id for file in retrieved] == [files[1].id]
+
+    with subtests.test("the id count is limited"):
+        async with get_platform_client() as client:
+            response = await client.get("/api/v1/files", params={"ids": [str(uuid.uuid4()) for _ in range(101)]})
+            assert response.status_code == 422
+            response = await client.get("/api/v1/files")
+            assert response.status_code == 422
+
+    with subtests.test("files from other contexts are omitted"):
+        context = await Context.create()
+        token = await context.generate_token(grant_context_permissions=ContextPermissions(files={"read", "write"}))
+        async with PlatformClient(context_id=context.id, auth_token=token.token.get_secret_value()) as client:
+            context_file = await File.create(filename="c.txt", content=b"c", content_type="text/plain", client=client)
+            retrieved = await File.get_many([files[0].id, context_file.id], client=client)
+            assert [file.id for file in retrieved] == [context_file.id]
+
+
 @pytest.fixture
 def test_pdf() -> Callable[[str], BytesIO]:
     from reportlab.lib.pagesizes import letter
@@ -589,3 +589,52 @@ async def test_delete_contexts_no_contexts_to_delete(
         {"context_id": "recent-context-2"},
     )
     assert result.fetchone() is not None
+
+
+# ================================ update_last_accessed tests ================================
+
+
+async def test_update_last_accessed_in_bulk(db_transaction: AsyncConnection, user1_id: UUID, provider_id: UUID):
+    """Test that last_accessed_at of many tasks and contexts is updated by a single call."""
+    repository = SqlAlchemyA2ARequestRepository(connection=db_transaction)
+
+    old_time = utc_now() - timedelta(days=1)
+    for i in range(3):
+        await db_transaction.execute(
+            text(
+                "INSERT INTO a2a_request_tasks (task_id, created_by, provider_id, created_at, last_accessed_at) "
+                "VALUES (:task_id, :created_by, :provider_id, :old_time, :old_time)"
+            ),
+            {"task_id": f"bulk-task-{i}", "created_by": user1_id, "provider_id": provider_id, "old_time": old_time},
+        )
+    await db_transaction.execute(
+        text(
+            "INSERT INTO a2a_request_contexts (context_id, created_by, provider_id, created_at, last_accessed_at) "
+            "VALUES (:context_id, :created_by, :provider_id, :old_time, :old_time)"
+        ),
+        {"context_id": "bulk-context", "created_by": user1_id, "provider_id": provider_id, "old_time": old_time},
+    )
+
+    now = utc_now()
+    await repository.update_last_accessed(
+        tasks={"bulk-task-0": now, "bulk-task-1": now, "nonexistent-task": now},
+        contexts={"bulk-context": now},
+    )
+
+    result = await db_transaction.execute(
+        text("SELECT task_id, last_accessed_at FROM a2a_request_tasks WHERE task_id LIKE 'bulk-task-%'")
+    )
+    last_accessed = {row.task_id: row.last_accessed_at for row in result.fetchall()}
+    assert last_accessed == {"bulk-task-0": now, "bulk-task-1": now, "bulk-task-2": old_time}
+
+    result = await db_transaction.execute(
+        text("SELECT last_accessed_at FROM a2a_request_contexts WHERE context_id = 'bulk-context'")
+    )
+    assert result.fetchone().last_accessed_at == now
+
+    # Older access times never move the timestamp back
+    await repository.update_last_accessed(tasks={"bulk-task-0": old_time})
+    result = await db_transaction.execute(
+        text("SELECT last_accessed_at FROM a2a_request_tasks WHERE task_id = 'bulk-task-0'")
+    )
+    assert result.fetchone().last_accessed_at == now
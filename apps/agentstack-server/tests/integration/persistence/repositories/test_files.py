@@ -272,3 +272,53 @@ async def test_total_usage(db_transaction: AsyncConnection, test_user_id: uuid.U
     # Get total usage for other user
     other_user_total_usage = await repository.total_usage(user_id=other_user_id)
     assert other_user_total_usage == 4096
+
+
+async def test_get_many_files(db_transaction: AsyncConnection, test_user_id: uuid.UUID):
+    repository = SqlAlchemyFileRepository(connection=db_transaction)
+
+    other_user_id = uuid.uuid4()
+    await create_user(db_transaction, other_user_id)
+    context_ids = [uuid.uuid4(), uuid.uuid4()]
+    for context_id in context_ids:
+        await db_transaction.execute(
+            text(
+                "INSERT INTO contexts (id, created_at, updated_at, created_by) "
+                "VALUES (:id, :created_at, :created_at, :created_by)"
+            ),
+            {"id": context_id, "created_at": utc_now(), "created_by": test_user_id},
+        )
+
+    user_files = [{**db_file_for(test_user_id, filename=f"{i}.txt"), "context_id": None} for i in range(3)]
+    context_files = [{**db_file_for(test_user_id), "context_id": context_id} for context_id in context_ids]
+    other_user_file = {**db_file_for(other_user_id), "context_id": None}
+    for file_data in [*user_files, *context_files, other_user_file]:
+        await db_transaction.execute(
+            text(
+                "INSERT INTO files "
+                "(id, filename, content_type, file_size_bytes, file_type, created_at, created_by, context_id) "
+                "VALUES (:id, :filename, :content_type, :file_size_bytes, :file_type, :created_at, :created_by, "
+                ":context_id)"
+            ),
+            file_data,
+        )
+
+    missing_id = uuid.uuid4()
+    requested = [user_files[2]["id"], missing_id, user_files[0]["id"], other_user_file["id"], user_files[2]["id"]]
+
+    # Missing and other users' files are omitted, duplicates collapsed, the requested order is kept
+    files = await repository.get_many(file_ids=requested, user_id=test_user_id)
+    assert [file.id for file in files] == [user_files[2]["id"], user_files[0]["id"]]
+    assert files[0].filename == "2.txt"
+
+    # Without a user filter all existing files are returned
+    files = await repository.get_many(file_ids=requested)
+    assert [file.id for file in files] == [user_files[2]["id"], user_files[0]["id"], other_user_file["id"]]
+
+    # Only files of the given context are returned
+    all_ids = [file_data["id"] for file_data in [*user_files, *context_files, other_user_file]]
+    files = await repository.get_many(file_ids=all_ids, user_id=test_user_id, context_id=context_ids[1])
+    assert [file.id for file in files] == [context_files[1]["id"]]
+
+    assert await repository.get_many(file_ids=[]) == []
+    assert await repository.get_many(file_ids=[missing_id]) == []
@@ -8,7 +8,8 @@ import pytest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.vector_store import VectorStoreItem, VectorStoreSearchResult
+from agentstack_server.configuration import VectorStoresConfiguration
+from agentstack_server.domain.models.vector_store import VectorDistanceMetric, VectorStoreItem, VectorStoreSearchResult
 from agentstack_server.infrastructure.vector_database.vector_db import VectorDatabaseRepository
 
 pytestmark = pytest.mark.integration
@@ -17,7 +18,9 @@ pytestmark = pytest.mark.integration
 @pytest.fixture
 async def vector_db_repository(db_transaction: AsyncConnection) -> VectorDatabaseRepository:
     """Create a VectorDatabaseRepository instance for testing."""
-    return VectorDatabaseRepository(connection=db_transaction, schema_name="vector_db")
+    return VectorDatabaseRepository(
+        connection=db_transaction, schema_name="vector_db", configuration=VectorStoresConfiguration()
+    )
 
 
 @pytest.fixture
@@ -132,6 +135,37 @@ async def test_add_items_to_collection(
     assert rows[2].vector_store_document_id == "doc_002"
 
 
+@pytest.mark.parametrize("dedicated_partition", [False, True])
+async def test_stage_items(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    db_transaction: AsyncConnection,
+    dedicated_partition: bool,
+):
+    """Test loading items in batches through the COPY staging table."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    sample_vector_items[0].metadata = None
+    sample_vector_items[1].text = 'Quoted "text",\nwith a newline'
+
+    await vector_db_repository.stage_items(test_collection_id, sample_vector_items[:2])
+    await vector_db_repository.stage_items(test_collection_id, sample_vector_items[2:])
+    await vector_db_repository.insert_staged_items(test_collection_id, 128, dedicated_partition=dedicated_partition)
+
+    results = await vector_db_repository.similarity_search(test_collection_id, [1.0] * 128, limit=10)
+    items = {result.item.id: result.item for result in results}
+    assert len(items) == 3
+    for item in sample_vector_items:
+        assert items[item.id].text == item.text
+        assert items[item.id].metadata == item.metadata
+        assert items[item.id].embedding.tolist() == item.embedding.tolist()
+
+    result = await db_transaction.execute(
+        text(f"SELECT to_regclass('vector_db.collections_dim_128_{test_collection_id.hex}')")
+    )
+    assert (result.scalar() is not None) == dedicated_partition
+
+
 async def test_add_empty_items_list(
     vector_db_repository: VectorDatabaseRepository,
     test_collection_id: UUID,
@@ -207,7 +241,7 @@ async def test_similarity_search(
     first_result = results_list[0]
     assert first_result.item.text == "The quick brown fox jumps over the lazy dog."
     assert first_result.item.document_id == "doc_001"
-    assert first_result.item.embedding == [1.0] * 128
+    assert first_result.item.embedding.tolist() == [1.0] * 128
 
     # First result should have highest score
     assert first_result.score >= results_list[1].score
@@ -242,6 +276,112 @@ async def test_similarity_search_with_limit(
         assert isinstance(result, VectorStoreSearchResult)
 
 
+async def test_similarity_search_uses_cosine_index(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    db_transaction: AsyncConnection,
+):
+    """Test that the HNSW index operator class matches the default cosine search."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+
+    result = await db_transaction.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE indexname = 'collections_dim_128_vector_index'")
+    )
+    assert "halfvec_cosine_ops" in result.scalar_one()
+
+
+async def test_similarity_search_with_metadata_filter(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+):
+    """Test that metadata filters are applied before the limit."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    results = list(
+        await vector_db_repository.similarity_search(
+            test_collection_id, [1.0] * 128, limit=1, metadata_filter={"source": "test_doc_2.txt"}
+        )
+    )
+    assert [result.item.document_id for result in results] == ["doc_002"]
+
+    results = list(
+        await vector_db_repository.similarity_search(
+            test_collection_id, [1.0] * 128, limit=10, ef_search=100, metadata_filter={"chapter": "1"}
+        )
+    )
+    assert {result.item.text for result in results} == {
+        "The quick brown fox jumps over the lazy dog.",
+        "Vector databases enable efficient similarity search.",
+    }
+
+
+@pytest.mark.parametrize("metric", list(VectorDistanceMetric))
+async def test_similarity_search_with_metric(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    metric: VectorDistanceMetric,
+):
+    """Test that results are ordered by descending score for every metric."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    results = list(
+        await vector_db_repository.similarity_search(test_collection_id, [1.1] * 128, limit=3, metric=metric)
+    )
+    scores = [result.score for result in results]
+    assert len(results) == 3
+    assert scores == sorted(scores, reverse=True)
+    if metric == VectorDistanceMetric.L2:
+        assert results[0].item.embedding.tolist() == [1.0] * 128
+    if metric == VectorDistanceMetric.INNER_PRODUCT:
+        assert results[0].item.embedding.tolist() == [3.0] * 128
+
+
+async def test_collection_partitions(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    db_transaction: AsyncConnection,
+):
+    """Test that collections live in a shared partition until they are moved to a dedicated one."""
+    partition = await vector_db_repository.create_collection(test_collection_id, 128)
+    assert partition.startswith("collections_dim_128_shared_")
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    await vector_db_repository.lock_collection(test_collection_id, exclusive=True)
+    assert await vector_db_repository.exclude_from_shared_partition(test_collection_id, 128)
+    assert await vector_db_repository.exclude_from_shared_partition(test_collection_id, 128)
+    dedicated_partition = await vector_db_repository.create_dedicated_partition(test_collection_id, 128)
+    assert dedicated_partition == f"collections_dim_128_{test_collection_id.hex}"
+    assert await vector_db_repository.create_dedicated_partition(test_collection_id, 128) == dedicated_partition
+    assert not await vector_db_repository.exclude_from_shared_partition(test_collection_id, 128)
+    result = await db_transaction.execute(
+        text("SELECT COUNT(*) FROM pg_constraint WHERE conname = :constraint"),
+        {"constraint": f"exclude_{test_collection_id.hex}"},
+    )
+    assert result.scalar() == 0
+    assert await vector_db_repository.create_collection(test_collection_id, 128) == dedicated_partition
+
+    result = await db_transaction.execute(text(f"SELECT COUNT(*) FROM vector_db.{dedicated_partition}"))
+    assert result.scalar() == 3
+    result = await db_transaction.execute(text("SELECT COUNT(*) FROM vector_db.collections_dim_128_shared"))
+    assert result.scalar() == 0
+    results = list(await vector_db_repository.similarity_search(test_collection_id, [1.0] * 128, limit=10))
+    assert len(results) == 3
+
+    await vector_db_repository.delete_collection(test_collection_id, 128)
+    result = await db_transaction.execute(text(f"SELECT COUNT(*) FROM vector_db.{dedicated_partition}"))
+    assert result.scalar() == 0
+
+    # The vector store does not exist in the vector_stores table
+    assert await vector_db_repository.drop_orphaned_partitions() == [dedicated_partition]
+    result = await db_transaction.execute(text(f"SELECT to_regclass('vector_db.{dedicated_partition}')"))
+    assert result.scalar() is None
+
+
 async def test_delete_documents(
     vector_db_repository: VectorDatabaseRepository,
     test_collection_id: UUID,
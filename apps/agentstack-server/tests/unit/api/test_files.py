@@ -0,0 +1,33 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from contextlib import asynccontextmanager
+from unittest import mock
+
+import pytest
+
+from agentstack_server.api.routes.files import _stream_file
+from agentstack_server.exceptions import FileReadConditionError
+
+pytestmark = pytest.mark.unit
+
+
+async def test_not_modified_carries_validators():
+    file_id = uuid.uuid4()
+
+    @asynccontextmanager
+    async def get_content(**kwargs):
+        raise FileReadConditionError(file_id, 304, etag='"etag"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT")
+        yield
+
+    file_service = mock.MagicMock()
+    file_service.get_content = get_content
+    request = mock.MagicMock()
+    request.headers = {"if-none-match": '"etag"'}
+
+    response = await _stream_file(file_service=file_service, user=mock.MagicMock(), file_id=file_id, request=request)
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"etag"'
+    assert response.headers["last-modified"] == "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert not response.body
@@ -0,0 +1,50 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import openai.types.chat
+import pytest
+
+from agentstack_server.api.routes.openai import _stream_watsonx, _watsonx_chunk
+
+pytestmark = pytest.mark.unit
+
+WATSONX_CHUNK = {
+    "id": "chat-1",
+    "model_id": "ibm/granite",
+    "model_version": "3.3.0",
+    "created": 1700000000,
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": None,
+            "delta": {
+                "role": "assistant",
+                "content": "Hello",
+                "tool_calls": [{"index": 0, "id": "call-1", "function": {"name": "search", "arguments": "{}"}}],
+            },
+        }
+    ],
+    "usage": {"completion_tokens": 1, "prompt_tokens": 2, "total_tokens": 3},
+}
+
+
+def test_watsonx_chunk_matches_openai_schema():
+    chunk = _watsonx_chunk(WATSONX_CHUNK, "watsonx:ibm/granite")
+    assert openai.types.chat.ChatCompletionChunk.model_validate(chunk).model_dump(mode="json") == chunk
+
+
+async def test_stream_watsonx_reports_errors():
+    async def stream():
+        yield WATSONX_CHUNK
+        raise RuntimeError("upstream failed")
+
+    events = [event async for event in _stream_watsonx(stream(), "watsonx:ibm/granite")]
+
+    assert events[-1] == b"data: [DONE]\n\n"
+    assert json.loads(events[0].removeprefix(b"data: "))["choices"][0]["delta"]["content"] == "Hello"
+    assert json.loads(events[1].removeprefix(b"data: "))["error"] == {
+        "message": "upstream failed",
+        "type": "RuntimeError",
+    }
@@ -0,0 +1,64 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import struct
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from agentstack_server.api.routes.vector_stores import _parse_vector_frames
+from agentstack_server.utils.embeddings import EmbeddingEncoding
+
+pytestmark = pytest.mark.unit
+
+
+def _frame(header: dict, embedding: np.ndarray) -> bytes:
+    header_bytes, embedding_bytes = json.dumps(header).encode(), embedding.tobytes()
+    return (
+        struct.pack("<I", len(header_bytes)) + header_bytes + struct.pack("<I", len(embedding_bytes)) + embedding_bytes
+    )
+
+
+async def _parse(chunks: list[bytes], encoding_format: EmbeddingEncoding):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    return [item async for item in _parse_vector_frames(stream(), encoding_format)]
+
+
+@pytest.mark.parametrize(
+    ("encoding_format", "dtype"),
+    [(EmbeddingEncoding.BASE64_FLOAT16, "<f2"), (EmbeddingEncoding.BASE64, "<f4"), (EmbeddingEncoding.FLOAT, "<f4")],
+)
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+async def test_parse_vector_frames(encoding_format: EmbeddingEncoding, dtype: str, chunk_size: int):
+    embeddings = [np.array([0.5, -1.0, 2.0], dtype=dtype), np.array([1.0, 0.0, 0.25], dtype=dtype)]
+    body = b"".join(
+        _frame({"document_id": f"doc-{i}", "text": f"text {i}"}, embedding) for i, embedding in enumerate(embeddings)
+    )
+
+    items = await _parse([body[i : i + chunk_size] for i in range(0, len(body), chunk_size)], encoding_format)
+
+    assert [item.document_id for item in items] == ["doc-0", "doc-1"]
+    assert [item.embedding.tolist() for item in items] == [embedding.tolist() for embedding in embeddings]
+    assert all(item.embedding.dtype == np.dtype(dtype) for item in items)
+
+
+async def test_parse_vector_frames_rejects_truncated_body():
+    body = _frame({"document_id": "doc", "text": "text"}, np.zeros(4, dtype="<f2"))
+
+    with pytest.raises(HTTPException, match="Item 2 is truncated") as exc_info:
+        await _parse([body, body[:-1]], EmbeddingEncoding.BASE64_FLOAT16)
+    assert exc_info.value.status_code == 422
+
+
+@pytest.mark.parametrize("header", [b"[1]", b"not json", b'{"text": "missing document_id"}'])
+async def test_parse_vector_frames_rejects_invalid_header(header: bytes):
+    body = struct.pack("<I", len(header)) + header + struct.pack("<I", 0)
+
+    with pytest.raises(HTTPException, match="Invalid item 1") as exc_info:
+        await _parse([body], EmbeddingEncoding.BASE64)
+    assert exc_info.value.status_code == 422
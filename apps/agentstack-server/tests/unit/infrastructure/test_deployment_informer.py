@@ -0,0 +1,136 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import uuid
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+
+from agentstack_server.domain.models.provider import ProviderDeploymentState
+from agentstack_server.infrastructure.kubernetes.deployment_informer import DeploymentStateInformer
+
+pytestmark = pytest.mark.unit
+
+
+def _deployment(provider_id: uuid.UUID, resource_version: str, uid: str = "", **status) -> dict:
+    return {"metadata": {"name": str(provider_id), "resourceVersion": resource_version, "uid": uid}, "status": status}
+
+
+class FakeResponse:
+    def __init__(self, body: dict | None = None, events: asyncio.Queue | None = None):
+        self._body = body
+        self._events = events
+
+    def json(self):
+        return self._body
+
+    async def aiter_lines(self):
+        assert self._events
+        while (event := await self._events.get()) is not None:
+            yield json.dumps(event)
+
+
+class FakeApi:
+    namespace = "default"
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.watched_versions: list[str] = []
+
+    @asynccontextmanager
+    async def call_api(self, method, *, params, **kwargs):
+        if params.get("watch"):
+            self.watched_versions.append(params["resourceVersion"])
+            yield FakeResponse(events=self.events)
+        else:
+            yield FakeResponse(body={"items": self.items, "metadata": {"resourceVersion": "1"}})
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_informer_tracks_watch_events():
+    running, added = uuid.uuid4(), uuid.uuid4()
+    api = FakeApi(items=[_deployment(running, "1", availableReplicas=1, replicas=1)])
+
+    async def api_factory():
+        return api
+
+    informer = DeploymentStateInformer(
+        api_factory, label_selector="managedBy=agentstack", provider_id_from_name=uuid.UUID
+    )
+    async with informer:
+        await _settle()
+        assert informer.synced
+        assert informer.get(running) == ProviderDeploymentState.RUNNING
+        assert informer.get(added) == ProviderDeploymentState.MISSING
+
+        waiter = asyncio.create_task(
+            informer.wait_for(added, {ProviderDeploymentState.RUNNING}, timeout=timedelta(seconds=5))
+        )
+        api.events.put_nowait({"type": "ADDED", "object": _deployment(added, "2", replicas=1)})
+        await _settle()
+        assert informer.get(added) == ProviderDeploymentState.STARTING
+        assert not waiter.done()
+
+        api.events.put_nowait({"type": "MODIFIED", "object": _deployment(added, "3", replicas=1, availableReplicas=1)})
+        api.events.put_nowait({"type": "DELETED", "object": _deployment(running, "4")})
+        api.events.put_nowait({"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "5"}}})
+        await asyncio.wait_for(waiter, timeout=1)
+        assert informer.get(running) == ProviderDeploymentState.MISSING
+
+        api.events.put_nowait(None)  # server closes the watch, it is resumed from the last bookmark
+        await _settle()
+        assert api.watched_versions == ["1", "5"]
+    assert not informer.synced
+
+
+async def test_wait_for_times_out():
+    async def api_factory():
+        return FakeApi(items=[])
+
+    async with DeploymentStateInformer(api_factory, label_selector="", provider_id_from_name=uuid.UUID) as informer:
+        with pytest.raises(TimeoutError):
+            await informer.wait_for(uuid.uuid4(), {ProviderDeploymentState.RUNNING}, timeout=timedelta(seconds=0.01))
+
+
+async def test_wait_for_ignores_replaced_deployment():
+    provider_id = uuid.uuid4()
+    api = FakeApi(items=[_deployment(provider_id, "1", uid="old", observedGeneration=3, availableReplicas=1)])
+
+    async def api_factory():
+        return api
+
+    async with DeploymentStateInformer(api_factory, label_selector="", provider_id_from_name=uuid.UUID) as informer:
+        await _settle()
+        assert informer.get(provider_id) == ProviderDeploymentState.RUNNING
+
+        waiter = asyncio.create_task(
+            informer.wait_for(
+                provider_id, {ProviderDeploymentState.RUNNING}, timeout=timedelta(seconds=5), min_version=("new", 1)
+            )
+        )
+        await _settle()
+        assert not waiter.done()
+
+        api.events.put_nowait({"type": "DELETED", "object": _deployment(provider_id, "2", uid="old")})
+        api.events.put_nowait({"type": "ADDED", "object": _deployment(provider_id, "3", uid="new", replicas=1)})
+        api.events.put_nowait(
+            {"type": "MODIFIED", "object": _deployment(provider_id, "4", uid="new", replicas=1, availableReplicas=1)}
+        )
+        await _settle()
+        assert not waiter.done()  # available replicas are not from the observed generation yet
+
+        api.events.put_nowait(
+            {
+                "type": "MODIFIED",
+                "object": _deployment(provider_id, "5", uid="new", observedGeneration=1, availableReplicas=1),
+            }
+        )
+        await asyncio.wait_for(waiter, timeout=1)
@@ -0,0 +1,77 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+
+import pytest
+from pydantic import AnyUrl
+from pytest_httpx import HTTPXMock
+
+from agentstack_server.configuration import DoclingExtractionConfiguration
+from agentstack_server.infrastructure.text_extraction.docling import DoclingTextExtractionBackend
+
+pytestmark = pytest.mark.unit
+
+DOCLING_URL = "http://docling-serve:15001"
+
+
+@pytest.fixture
+def config() -> DoclingExtractionConfiguration:
+    return DoclingExtractionConfiguration(
+        enabled=True, docling_service_url=DOCLING_URL, max_queue_depth=2, status_poll_interval_sec=0.01
+    )
+
+
+async def _extract(backend: DoclingTextExtractionBackend) -> bytes:
+    content = b""
+    async with backend.extract_text(file_url=AnyUrl("http://files/doc.pdf")) as file:
+        while chunk := await file.read(1024):
+            content += chunk
+    return content
+
+
+async def test_conversion_is_polled_and_result_streamed(config, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{DOCLING_URL}/v1/convert/source/async",
+        json={"task_id": "task-1", "task_status": "pending", "task_position": 1},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DOCLING_URL}/v1/status/poll/task-1?wait=0.01",
+        json={"task_id": "task-1", "task_status": "success"},
+    )
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{DOCLING_URL}/v1/result/task-1",
+        content=json.dumps({"document": {"md_content": "# Title\n\ntext"}, "status": "success"}).encode(),
+    )
+
+    async with DoclingTextExtractionBackend(config) as backend:
+        assert await _extract(backend) == b"# Title\n\ntext"
+        assert not backend._queue_positions
+
+
+async def test_failed_conversion_raises(config, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{DOCLING_URL}/v1/convert/source/async",
+        json={"task_id": "task-1", "task_status": "failure", "task_meta": {"error": "corrupted file"}},
+    )
+
+    async with DoclingTextExtractionBackend(config) as backend:
+        with pytest.raises(RuntimeError, match="corrupted file"):
+            await _extract(backend)
+
+
+async def test_submission_waits_for_docling_queue(config):
+    backend = DoclingTextExtractionBackend(config)
+    await backend._set_queue_position("queued-task", config.max_queue_depth)
+
+    waiter = asyncio.create_task(backend._wait_for_queue_capacity())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await backend._set_queue_position("queued-task", config.max_queue_depth - 1)
+    await asyncio.wait_for(waiter, timeout=1)
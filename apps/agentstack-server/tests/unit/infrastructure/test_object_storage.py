@@ -0,0 +1,92 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import io
+import uuid
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.file import AsyncFile, FileReadOptions
+from agentstack_server.exceptions import FileReadConditionError
+from agentstack_server.infrastructure.object_storage.repository import S3ObjectStorageRepository
+
+pytestmark = pytest.mark.unit
+
+
+async def test_upload_size_is_counted_from_stream():
+    repository = S3ObjectStorageRepository(Configuration())
+    content = io.BytesIO(b"x" * 10_000)
+
+    async def upload_fileobj(fileobj, *args, **kwargs):
+        while await fileobj.read(4096):
+            pass
+
+    client = mock.MagicMock()
+    client.upload_fileobj = mock.AsyncMock(side_effect=upload_fileobj)
+    client.head_object = mock.AsyncMock()
+    repository._client = client
+
+    async def read(amount: int) -> bytes:
+        return content.read(amount)
+
+    file = AsyncFile(filename="test.txt", content_type="text/plain", read=read)
+    assert await repository.upload_file(file_id=uuid.uuid4(), file=file) == 10_000
+    client.head_object.assert_not_awaited()
+    assert client.upload_fileobj.await_args.kwargs["Config"].max_request_concurrency == 4
+
+
+async def test_read_options_are_passed_to_s3():
+    repository = S3ObjectStorageRepository(Configuration())
+    # aiobotocore's StreamingBody enters into the wrapped aiohttp response whose read() reads everything
+    aiohttp_response = mock.MagicMock()
+    aiohttp_response.read = mock.AsyncMock(side_effect=lambda: b"whole body")
+    body = mock.MagicMock()
+    body.__aenter__.return_value = aiohttp_response
+    body.read = mock.AsyncMock(return_value=b"abc")
+    client = mock.MagicMock()
+    client.get_object = mock.AsyncMock(
+        return_value={
+            "Body": body,
+            "Metadata": {"filename": "test.txt"},
+            "ContentType": "text/plain",
+            "ContentLength": 3,
+            "ContentRange": "bytes 0-2/10",
+            "ETag": '"etag"',
+        }
+    )
+    repository._client = client
+
+    async with repository.get_file(file_id=uuid.uuid4(), options=FileReadOptions(range="bytes=0-2")) as file:
+        assert await file.read(10) == b"abc"
+    body.read.assert_awaited_once_with(10)
+    assert client.get_object.await_args.kwargs["Range"] == "bytes=0-2"
+    assert "IfNoneMatch" not in client.get_object.await_args.kwargs
+    assert (file.size, file.content_range, file.etag) == (3, "bytes 0-2/10", '"etag"')
+    body.__aexit__.assert_awaited_once()
+
+
+async def test_not_modified_is_reported():
+    repository = S3ObjectStorageRepository(Configuration())
+    client = mock.MagicMock()
+    client.get_object = mock.AsyncMock(
+        side_effect=ClientError(
+            {
+                "Error": {"Code": "304", "Message": "Not Modified"},
+                "ResponseMetadata": {
+                    "HTTPStatusCode": 304,
+                    "HTTPHeaders": {"etag": '"etag"', "last-modified": "Wed, 21 Oct 2015 07:28:00 GMT"},
+                },
+            },
+            "GetObject",
+        )
+    )
+    repository._client = client
+
+    with pytest.raises(FileReadConditionError) as ex:
+        async with repository.get_file(file_id=uuid.uuid4(), options=FileReadOptions(if_none_match='"etag"')):
+            pass
+    assert ex.value.status_code == 304
+    assert (ex.value.etag, ex.value.last_modified) == ('"etag"', "Wed, 21 Oct 2015 07:28:00 GMT")
@@ -0,0 +1,38 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from agentstack_server.exceptions import InvalidPageTokenError
+from agentstack_server.infrastructure.persistence.repositories.context import contexts_table
+from agentstack_server.infrastructure.persistence.repositories.utils import (
+    Explain,
+    decode_page_token,
+    encode_page_token,
+)
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+
+def test_page_token_roundtrip():
+    created_at, id = utc_now(), uuid.uuid4()
+    token = encode_page_token(created_at, id)
+    assert "=" not in token
+    assert decode_page_token(token, contexts_table.c.created_at) == (created_at, id)
+
+
+@pytest.mark.parametrize("token", ["not-a-token", encode_page_token("yesterday", uuid.uuid4())])
+def test_invalid_page_token(token):
+    with pytest.raises(InvalidPageTokenError):
+        decode_page_token(token, contexts_table.c.created_at)
+
+
+def test_explain_binds_parameters():
+    query = contexts_table.select().where(contexts_table.c.created_by == uuid.uuid4())
+    compiled = str(Explain(query).compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "%(created_by_1)s" in compiled
@@ -0,0 +1,44 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from pydantic import ValidationError
+
+from agentstack_server.api.schema.vector_stores import SearchRequest
+from agentstack_server.domain.models.vector_store import VectorSearchMode, VectorStoreItem, VectorStoreSearchResult
+from agentstack_server.infrastructure.vector_database.vector_db import reciprocal_rank_fusion
+
+pytestmark = pytest.mark.unit
+
+
+def _results(*items: VectorStoreItem) -> list[VectorStoreSearchResult]:
+    return [VectorStoreSearchResult(item=item, score=1.0) for item in items]
+
+
+def test_reciprocal_rank_fusion_prefers_items_in_both_rankings():
+    a, b, c, d = (VectorStoreItem(document_id="doc", text=text, embedding=[0.0]) for text in "abcd")
+    vector, lexical = _results(a, b, c), _results(d, c)
+
+    fused = reciprocal_rank_fusion([vector, lexical], k=60, limit=3)
+
+    assert [result.item.text for result in fused] == ["c", "a", "d"]
+    assert fused[0].score == pytest.approx(1 / 63 + 1 / 62)
+    assert reciprocal_rank_fusion([[], []], k=60, limit=3) == []
+
+
+@pytest.mark.parametrize(
+    ("request_data", "valid"),
+    [
+        ({"query_vector": [0.1]}, True),
+        ({"query_text": "error 42"}, False),
+        ({"query_text": "error 42", "mode": VectorSearchMode.LEXICAL}, True),
+        ({"query_vector": [0.1], "mode": VectorSearchMode.HYBRID}, False),
+        ({"query_vector": [0.1], "query_text": "error 42", "mode": VectorSearchMode.HYBRID}, True),
+    ],
+)
+def test_search_request_requires_query_for_mode(request_data, valid):
+    if valid:
+        SearchRequest.model_validate(request_data)
+    else:
+        with pytest.raises(ValidationError):
+            SearchRequest.model_validate(request_data)
@@ -0,0 +1,80 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+
+from agentstack_server.configuration import A2AProxyConfiguration
+from agentstack_server.service_layer.services.a2a import A2AClientPool
+
+pytestmark = pytest.mark.unit
+
+
+def _agent_card(url: str = "http://agent:8000/") -> AgentCard:
+    return AgentCard(
+        name="test",
+        description="test",
+        url=url,
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    )
+
+
+async def test_client_is_reused_per_provider():
+    pool = A2AClientPool(A2AProxyConfiguration())
+    provider_id = uuid.uuid4()
+
+    async with pool.transport(provider_id=provider_id, agent_card=_agent_card()) as first:
+        pass
+    async with pool.transport(provider_id=provider_id, agent_card=_agent_card()) as second:
+        pass
+    async with pool.transport(provider_id=uuid.uuid4(), agent_card=_agent_card()) as other:
+        pass
+
+    assert first is second
+    assert other is not first
+    assert len(pool) == 2
+    await pool.aclose()
+    assert len(pool) == 0
+
+
+async def test_transport_is_recreated_when_agent_card_url_changes():
+    pool = A2AClientPool(A2AProxyConfiguration())
+    provider_id = uuid.uuid4()
+
+    async with pool.transport(provider_id=provider_id, agent_card=_agent_card()) as first:
+        pass
+    async with pool.transport(provider_id=provider_id, agent_card=_agent_card("http://other:8000/")) as second:
+        pass
+
+    assert first is not second
+    assert first.httpx_client is second.httpx_client  # pyright: ignore [reportAttributeAccessIssue]
+    await pool.aclose()
+
+
+async def test_evict_waits_for_active_requests():
+    pool = A2AClientPool(A2AProxyConfiguration())
+    provider_id = uuid.uuid4()
+
+    async with pool.transport(provider_id=provider_id, agent_card=_agent_card()) as transport:
+        await pool.evict(provider_id=provider_id)
+        assert len(pool) == 0
+        assert not transport.httpx_client.is_closed  # pyright: ignore [reportAttributeAccessIssue]
+    assert transport.httpx_client.is_closed  # pyright: ignore [reportAttributeAccessIssue]
+
+
+async def test_idle_clients_are_evicted():
+    pool = A2AClientPool(A2AProxyConfiguration(client_idle_expire_after_sec=-1))
+    idle_provider_id = uuid.uuid4()
+
+    async with pool.transport(provider_id=idle_provider_id, agent_card=_agent_card()) as idle_transport:
+        pass
+    async with pool.transport(provider_id=uuid.uuid4(), agent_card=_agent_card()):
+        assert idle_transport.httpx_client.is_closed  # pyright: ignore [reportAttributeAccessIssue]
+        assert len(pool) == 1
+    await pool.aclose()
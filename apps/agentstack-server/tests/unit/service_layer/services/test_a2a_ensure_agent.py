@@ -0,0 +1,101 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from unittest import mock
+
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from pydantic import HttpUrl
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.provider import (
+    DockerImageProviderLocation,
+    Provider,
+    ProviderDeploymentState,
+)
+from agentstack_server.service_layer.services.a2a import A2AProxyService
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def provider() -> Provider:
+    return Provider(
+        source=DockerImageProviderLocation("ghcr.io/i-am-bee/agentstack/agents/chat:latest"),
+        origin="ghcr.io/i-am-bee/agentstack/agents/chat",
+        created_by=uuid.uuid4(),
+        agent_card=AgentCard(
+            name="test",
+            description="test",
+            url="http://agent:8000/",
+            version="1.0.0",
+            capabilities=AgentCapabilities(),
+            default_input_modes=["text"],
+            default_output_modes=["text"],
+            skills=[],
+        ),
+    )
+
+
+@pytest.fixture
+def deployment_manager() -> mock.AsyncMock:
+    manager = mock.AsyncMock()
+    manager.get_provider_url.return_value = HttpUrl("http://agentstack-provider-svc:8000")
+    manager.state.return_value = [ProviderDeploymentState.RUNNING]
+    manager.create_or_replace.return_value = False
+    return manager
+
+
+@pytest.fixture
+def uow() -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.env.get_all = mock.AsyncMock(side_effect=lambda parent_entity_ids, **_: {id: {} for id in parent_entity_ids})
+    uow.providers.update_last_accessed = mock.AsyncMock()
+    uow.commit = mock.AsyncMock()
+    return uow
+
+
+@pytest.fixture
+def service(deployment_manager, uow) -> A2AProxyService:
+    return A2AProxyService(
+        provider_deployment_manager=deployment_manager,
+        uow=lambda: uow,
+        user_service=mock.MagicMock(),
+        configuration=Configuration(),
+    )
+
+
+async def test_running_provider_is_served_from_cache(service, provider, deployment_manager, uow):
+    for _ in range(3):
+        assert await service.ensure_agent(provider=provider) == HttpUrl("http://agentstack-provider-svc:8000")
+
+    deployment_manager.state.assert_awaited_once()
+    deployment_manager.create_or_replace.assert_awaited_once()
+    uow.providers.update_last_accessed.assert_not_awaited()
+
+    await service.flush_last_accessed()
+    uow.providers.update_last_accessed.assert_awaited_once_with(provider_ids={provider.id})
+
+
+async def test_cache_is_invalidated(service, provider, deployment_manager):
+    await service.ensure_agent(provider=provider)
+    service.invalidate_provider(provider_id=provider.id)
+    await service.ensure_agent(provider=provider)
+    assert deployment_manager.state.await_count == 2
+
+    await service.ensure_agent(provider=provider.model_copy(update={"updated_at": utc_now()}))
+    assert deployment_manager.state.await_count == 3
+
+
+async def test_starting_provider_is_not_cached_until_ready(service, provider, deployment_manager):
+    deployment_manager.state.return_value = [ProviderDeploymentState.READY]
+    deployment_manager.wait_for_startup.side_effect = TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        await service.ensure_agent(provider=provider)
+    with pytest.raises(TimeoutError):
+        await service.ensure_agent(provider=provider)
+    assert deployment_manager.state.await_count == 2
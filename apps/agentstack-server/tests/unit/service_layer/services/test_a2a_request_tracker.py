@@ -0,0 +1,73 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from unittest import mock
+
+import pytest
+
+from agentstack_server.configuration import A2AProxyConfiguration
+from agentstack_server.exceptions import ForbiddenUpdateError
+from agentstack_server.service_layer.services.a2a import A2ARequestTracker
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def uow() -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.a2a_requests.track_request_ids_ownership = mock.AsyncMock()
+    uow.a2a_requests.update_last_accessed = mock.AsyncMock()
+    uow.a2a_requests.get_task = mock.AsyncMock()
+    uow.commit = mock.AsyncMock()
+    return uow
+
+
+@pytest.fixture
+def tracker(uow) -> A2ARequestTracker:
+    return A2ARequestTracker(lambda: uow, A2AProxyConfiguration())
+
+
+async def test_repeated_requests_skip_ownership_query(tracker, uow):
+    user_id, provider_id = uuid.uuid4(), uuid.uuid4()
+
+    await tracker.track(user_id=user_id, provider_id=provider_id, context_id="ctx")
+    await tracker.track(user_id=user_id, provider_id=provider_id, task_id="task", context_id="ctx")
+    for _ in range(5):
+        await tracker.track(user_id=user_id, provider_id=provider_id, task_id="task", context_id="ctx")
+        await tracker.check_task(user_id=user_id, task_id="task")
+
+    assert uow.a2a_requests.track_request_ids_ownership.await_count == 2
+    uow.a2a_requests.get_task.assert_not_awaited()
+    uow.a2a_requests.update_last_accessed.assert_not_awaited()
+
+    await tracker.flush()
+    uow.a2a_requests.update_last_accessed.assert_awaited_once()
+    assert uow.a2a_requests.update_last_accessed.await_args.kwargs["tasks"].keys() == {"task"}
+    assert uow.a2a_requests.update_last_accessed.await_args.kwargs["contexts"].keys() == {"ctx"}
+
+    await tracker.flush()
+    uow.a2a_requests.update_last_accessed.assert_awaited_once()
+
+
+async def test_ownership_is_cached_per_user(tracker, uow):
+    provider_id = uuid.uuid4()
+    await tracker.track(user_id=uuid.uuid4(), provider_id=provider_id, context_id="ctx")
+
+    uow.a2a_requests.track_request_ids_ownership.side_effect = ForbiddenUpdateError(
+        entity="a2a_request_context", id="ctx"
+    )
+    with pytest.raises(ForbiddenUpdateError):
+        await tracker.track(user_id=uuid.uuid4(), provider_id=provider_id, context_id="ctx")
+
+
+async def test_failed_flush_is_retried(tracker, uow):
+    user_id, provider_id = uuid.uuid4(), uuid.uuid4()
+    for _ in range(2):
+        await tracker.track(user_id=user_id, provider_id=provider_id, context_id="ctx")
+
+    uow.a2a_requests.update_last_accessed.side_effect = [ConnectionError(), None]
+    await tracker.flush()
+    await tracker.flush()
+    assert uow.a2a_requests.update_last_accessed.await_args.kwargs["contexts"].keys() == {"ctx"}
@@ -0,0 +1,70 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import uuid
+from unittest import mock
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.constants import USER_CHANGED_CHANNEL
+from agentstack_server.domain.models.permissions import AuthorizedUser, Permissions
+from agentstack_server.domain.models.user import User
+from agentstack_server.service_layer.services.auth import AuthorizedUserCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def notification_listener() -> mock.MagicMock:
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def cache(notification_listener) -> AuthorizedUserCache:
+    return AuthorizedUserCache(configuration=Configuration(), notification_listener=notification_listener)
+
+
+def _authorized_user() -> AuthorizedUser:
+    return AuthorizedUser(
+        user=User(id=uuid.uuid4(), email="test@example.com"),
+        global_permissions=Permissions(files={"read"}),
+        context_permissions=Permissions(),
+    )
+
+
+def test_cached_user_is_a_copy(cache):
+    key = cache.key("internal", "token")
+    cache.set(key, _authorized_user())
+
+    first = cache.get(key)
+    assert first is not None
+    first.context_id = uuid.uuid4()
+
+    second = cache.get(key)
+    assert second is not None and second.context_id is None
+
+
+def test_expired_token_is_not_served(cache):
+    key = cache.key("internal", "token")
+    cache.set(key, _authorized_user(), expires_at=time.time() - 1)
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_user_change_notification_invalidates_entries(cache, notification_listener):
+    (channel, on_user_changed), _ = notification_listener.subscribe.call_args
+    assert channel == USER_CHANGED_CHANNEL
+
+    changed, other = _authorized_user(), _authorized_user()
+    cache.set(cache.key("internal", "a"), changed)
+    cache.set(cache.key("oidc", "", "b"), changed)
+    cache.set(cache.key("internal", "c"), other)
+
+    on_user_changed(str(changed.user.id))
+    assert len(cache) == 1
+    assert cache.get(cache.key("internal", "c")) is not None
+
+    on_user_changed(None)  # notifications may have been missed
+    assert len(cache) == 0
@@ -0,0 +1,68 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from unittest import mock
+
+import pytest
+from a2a.types import Message, Part, Role, TextPart
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.context import ContextHistoryItem
+from agentstack_server.domain.models.user import User
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.service_layer.services.contexts import ContextService
+
+pytestmark = pytest.mark.unit
+
+
+def _history_item(context_id: uuid.UUID) -> ContextHistoryItem:
+    message = Message(message_id=str(uuid.uuid4()), role=Role.user, parts=[Part(root=TextPart(text="hi"))])
+    return ContextHistoryItem(context_id=context_id, data=message)
+
+
+@pytest.fixture
+def user() -> User:
+    return User(email="user@example.com")
+
+
+@pytest.fixture
+def uow() -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.contexts.get = mock.AsyncMock()
+    uow.contexts.get_history_item = mock.AsyncMock()
+    return uow
+
+
+@pytest.fixture
+def service(uow) -> ContextService:
+    return ContextService(uow=lambda: uow, configuration=Configuration(), object_storage=mock.MagicMock())
+
+
+async def test_stream_history_after_cursor(service, uow, user):
+    context_id = uuid.uuid4()
+    cursor, *new_items = [_history_item(context_id) for _ in range(3)]
+    uow.contexts.get_history_item.return_value = cursor
+
+    async def stream_history(**_):
+        for item in new_items:
+            yield item
+
+    uow.contexts.stream_history = mock.MagicMock(side_effect=stream_history)
+
+    history = await service.stream_history(context_id=context_id, user=user, after=cursor.id)
+
+    uow.contexts.get.assert_awaited_once_with(context_id=context_id, user_id=user.id)
+    uow.contexts.get_history_item.assert_awaited_once_with(context_id=context_id, history_item_id=cursor.id)
+    assert [item async for item in history] == new_items
+    uow.contexts.stream_history.assert_called_once_with(context_id=context_id, after=cursor)
+
+
+async def test_stream_history_checks_ownership_before_streaming(service, uow, user):
+    uow.contexts.get.side_effect = EntityNotFoundError(entity="context", id=uuid.uuid4())
+    uow.contexts.stream_history = mock.MagicMock()
+
+    with pytest.raises(EntityNotFoundError):
+        await service.stream_history(context_id=uuid.uuid4(), user=user)
+    uow.contexts.stream_history.assert_not_called()
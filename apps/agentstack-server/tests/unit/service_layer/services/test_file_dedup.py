@@ -0,0 +1,133 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import uuid
+from unittest import mock
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.file import (
+    AsyncFile,
+    ExtractionMetadata,
+    ExtractionStatus,
+    File,
+    FileType,
+)
+from agentstack_server.domain.models.user import User
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.service_layer.services.files import FileService
+
+pytestmark = pytest.mark.unit
+
+CONTENT = b"%PDF-1.4 some content"
+
+
+@pytest.fixture
+def user() -> User:
+    return User(email="user@example.com")
+
+
+@pytest.fixture
+def uow() -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.commit = mock.AsyncMock()
+    uow.files = mock.AsyncMock()
+    uow.files.total_usage.return_value = 0
+    return uow
+
+
+@pytest.fixture
+def object_storage() -> mock.AsyncMock:
+    object_storage = mock.AsyncMock()
+
+    async def upload_file(*, file_id, file):
+        return len(await file.read(-1))
+
+    object_storage.upload_file.side_effect = upload_file
+    return object_storage
+
+
+@pytest.fixture
+def extraction_backend() -> mock.MagicMock:
+    backend = mock.MagicMock()
+    backend.metadata = ExtractionMetadata(backend="docling", version="1")
+    return backend
+
+
+@pytest.fixture
+def service(uow, object_storage, extraction_backend) -> FileService:
+    return FileService(
+        object_storage_repository=object_storage,
+        extraction_backend=extraction_backend,
+        uow=lambda: uow,
+        user_service=mock.MagicMock(),
+        configuration=Configuration(),
+    )
+
+
+def _async_file() -> AsyncFile:
+    async def read(size: int = -1) -> bytes:
+        return CONTENT
+
+    return AsyncFile(filename="doc.pdf", content_type="application/pdf", read=read)
+
+
+async def test_upload_links_existing_object(service, uow, object_storage, user):
+    existing_object_id = uuid.uuid4()
+    uow.files.find_storage_object.return_value = existing_object_id
+
+    file = await service.upload_file(file=_async_file(), user=user)
+
+    assert file.content_hash == hashlib.sha256(CONTENT).hexdigest()
+    uow.files.find_storage_object.assert_awaited_once_with(content_hash=file.content_hash)
+    assert file.object_id == existing_object_id
+    object_storage.delete_files.assert_awaited_once_with(file_ids=[file.id])
+
+
+async def test_upload_of_new_content_keeps_object(service, uow, object_storage, user):
+    uow.files.find_storage_object.return_value = None
+
+    file = await service.upload_file(file=_async_file(), user=user)
+
+    assert file.object_id == file.id
+    object_storage.delete_files.assert_not_awaited()
+
+
+async def test_extraction_is_reused_for_same_content(service, uow, extraction_backend, user):
+    content_hash = hashlib.sha256(CONTENT).hexdigest()
+    file = File(filename="doc.pdf", content_type="application/pdf", created_by=user.id, content_hash=content_hash)
+    cached_file = File(
+        filename="doc.md",
+        content_type="text/markdown",
+        created_by=uuid.uuid4(),
+        file_type=FileType.EXTRACTED_TEXT,
+        content_hash=hashlib.sha256(b"# text").hexdigest(),
+    )
+    uow.files.get.return_value = file
+    uow.files.get_extraction_by_file_id.side_effect = EntityNotFoundError("extraction", file.id)
+    uow.files.find_extracted_file.return_value = cached_file
+
+    extraction = await service.create_extraction(file_id=file.id, user=user)
+
+    uow.files.find_extracted_file.assert_awaited_once_with(
+        content_hash=content_hash, metadata=extraction_backend.metadata
+    )
+    extracted_file = uow.files.create.await_args.kwargs["file"]
+    assert extracted_file.object_id == cached_file.id
+    assert extracted_file.created_by == user.id
+    assert extracted_file.parent_file_id == file.id
+    assert extraction.status == ExtractionStatus.COMPLETED
+    assert extraction.extracted_file_id == extracted_file.id
+
+
+async def test_delete_keeps_shared_objects(service, uow, object_storage, user):
+    shared_object_id, own_object_id = uuid.uuid4(), uuid.uuid4()
+    uow.files.list_storage_object_ids.return_value = [shared_object_id, own_object_id]
+    uow.files.filter_unreferenced_objects.return_value = [own_object_id]
+
+    await service.delete(file_id=uuid.uuid4(), user=user)
+
+    object_storage.delete_files.assert_awaited_once_with(file_ids=[own_object_id])
@@ -0,0 +1,90 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from unittest import mock
+
+import pytest
+from pydantic import HttpUrl
+
+from agentstack_server.configuration import Configuration, ModelProvidersConfiguration
+from agentstack_server.domain.models.model_provider import ModelProvider, ModelProviderType
+from agentstack_server.service_layer.services.model_providers import EmbeddingsCache, ModelProviderService
+from agentstack_server.utils.embeddings import EmbeddingEncoding, decode_embedding
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def uow() -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.model_providers.get = mock.AsyncMock()
+    uow.model_providers.delete = mock.AsyncMock()
+    uow.env.get = mock.AsyncMock(return_value="secret")
+    uow.commit = mock.AsyncMock()
+    return uow
+
+
+@pytest.fixture
+def provider() -> ModelProvider:
+    return ModelProvider(name="test", type=ModelProviderType.OPENAI, base_url=HttpUrl("http://openai:8000/v1"))
+
+
+async def test_clients_and_api_keys_are_cached_until_provider_is_deleted(uow, provider):
+    async with ModelProviderService(
+        uow=lambda: uow, configuration=Configuration(), notification_listener=mock.MagicMock()
+    ) as service:
+        first = await service.get_openai_client(provider=provider)
+        second = await service.get_openai_client(provider=provider)
+        assert first is second
+        assert first.api_key == "secret"
+        uow.env.get.assert_awaited_once()
+
+        await service.delete_provider(model_provider_id=provider.id)
+        assert first.is_closed()
+        assert await service.get_openai_client(provider=provider) is not first
+        assert uow.env.get.await_count == 2
+
+
+def test_embeddings_cache():
+    cache = EmbeddingsCache(ModelProvidersConfiguration(embeddings_cache_enabled=True))
+
+    assert cache.get_many(model_id="openai:embed", inputs=["a", "b"]) == [None, None]
+    cache.set_many(model_id="openai:embed", inputs=["a"], embeddings=[[0.5, 1.0]])
+
+    hit, miss = cache.get_many(model_id="openai:embed", inputs=["a", "b"])
+    assert hit is not None and decode_embedding(hit, EmbeddingEncoding.BASE64).tolist() == [0.5, 1.0]
+    assert miss is None
+    assert cache.get_many(model_id="openai:other", inputs=["a"]) == [None]
+
+
+def test_embeddings_cache_disabled():
+    cache = EmbeddingsCache(ModelProvidersConfiguration(embeddings_cache_enabled=False))
+    cache.set_many(model_id="openai:embed", inputs=[str(uuid.uuid4())], embeddings=[[0.5]])
+    assert len(cache) == 0
+
+
+async def test_api_keys_are_evicted_when_provider_is_deleted_elsewhere(uow, provider):
+    notification_listener = mock.MagicMock()
+    service = ModelProviderService(
+        uow=lambda: uow, configuration=Configuration(), notification_listener=notification_listener
+    )
+    [(_, on_provider_changed)] = [call.args for call in notification_listener.subscribe.call_args_list]
+
+    client = await service.get_openai_client(provider=provider)
+    on_provider_changed(str(provider.id))
+    await service.get_provider_api_key(model_provider_id=provider.id)
+    assert uow.env.get.await_count == 2
+
+    async def no_providers():
+        for _ in ():
+            yield
+
+    uow.model_providers.list = no_providers
+    uow.env.get_all = mock.AsyncMock(return_value={})
+    await service._refresh_model_index()
+
+    assert client.is_closed()
+    await service.get_provider_api_key(model_provider_id=provider.id)
+    assert uow.env.get.await_count == 3
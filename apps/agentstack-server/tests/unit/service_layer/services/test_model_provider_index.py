@@ -0,0 +1,151 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from unittest import mock
+
+import pytest
+from httpx import ConnectError
+from pydantic import HttpUrl
+
+from agentstack_server.configuration import Configuration, ModelProvidersConfiguration
+from agentstack_server.domain.constants import MODEL_API_KEY_SECRET_NAME, MODEL_PROVIDER_CHANGED_CHANNEL
+from agentstack_server.domain.models.model_provider import (
+    Model,
+    ModelProvider,
+    ModelProviderInfo,
+    ModelProviderType,
+)
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.service_layer.services.model_providers import ModelProviderService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def providers() -> list[ModelProvider]:
+    return [
+        ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl("http://openai:8000/v1")),
+        ModelProvider(type=ModelProviderType.OLLAMA, base_url=HttpUrl("http://ollama:11434/v1")),
+    ]
+
+
+@pytest.fixture
+def uow(providers) -> mock.MagicMock:
+    async def list_providers():
+        for provider in providers:
+            yield provider
+
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.model_providers.list.side_effect = list_providers
+    uow.env.get_all = mock.AsyncMock(
+        side_effect=lambda parent_entity, parent_entity_ids: {
+            provider_id: {MODEL_API_KEY_SECRET_NAME: "key"} for provider_id in parent_entity_ids
+        }
+    )
+    return uow
+
+
+@pytest.fixture
+def notification_listener() -> mock.MagicMock:
+    return mock.MagicMock()
+
+
+@pytest.fixture
+def service(uow, notification_listener) -> ModelProviderService:
+    configuration = Configuration(model_providers=ModelProvidersConfiguration(model_index_min_refresh_interval_sec=0))
+    return ModelProviderService(
+        uow=lambda: uow, configuration=configuration, notification_listener=notification_listener
+    )
+
+
+def _models(provider: ModelProvider, *names: str) -> list[Model]:
+    info = ModelProviderInfo(capabilities=provider.capabilities)
+    return [Model(id=f"{provider.type}:{name}", provider=info) for name in names]
+
+
+async def test_models_are_routed_from_index(service, providers):
+    openai, ollama = providers
+    listings = {openai.id: _models(openai, "gpt-4o"), ollama.id: _models(ollama, "granite")}
+    load_models = mock.AsyncMock(side_effect=lambda provider, api_key: listings[provider.id])
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=load_models):
+        assert await service.get_provider_by_model_id(model_id="ollama:granite") == ollama
+        assert await service.get_provider_by_model_id(model_id="openai:gpt-4o") == openai
+        assert load_models.await_count == 2  # listed once when building the index
+
+        with pytest.raises(EntityNotFoundError):
+            await service.get_provider_by_model_id(model_id="openai:unknown")
+
+
+async def test_stale_provider_keeps_models_and_receives_unknown_models(service, providers):
+    openai, ollama = providers
+    listings = {openai.id: _models(openai, "gpt-4o"), ollama.id: _models(ollama, "granite")}
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=lambda p, api_key: listings[p.id]):
+        await service.get_all_models()
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=ConnectError("unavailable")):
+        await service._refresh_model_index()
+
+    assert set(await service.get_all_models()) == {"openai:gpt-4o", "ollama:granite"}
+    assert await service.get_provider_by_model_id(model_id="openai:new-model") == openai
+
+
+async def test_provider_change_refreshes_index_in_background(service, providers, notification_listener):
+    openai, _ = providers
+    [(channel, on_provider_changed)] = [call.args for call in notification_listener.subscribe.call_args_list]
+    assert channel == MODEL_PROVIDER_CHANGED_CHANNEL
+
+    listed = asyncio.Event()
+
+    async def load_models(provider, api_key):
+        listed.set()
+        return _models(provider, "model")
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=load_models):
+        async with service:
+            await asyncio.wait_for(listed.wait(), timeout=1)  # initial build
+            listed.clear()
+            on_provider_changed(str(openai.id))
+            await asyncio.wait_for(listed.wait(), timeout=1)
+
+
+async def test_initial_index_build_is_awaited(service, providers):
+    second_openai = ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl("http://vllm:8000/v1"))
+    providers.append(second_openai)
+    listings = {provider.id: _models(provider, str(provider.id)) for provider in providers}
+
+    async def load_models(provider, api_key):
+        await asyncio.sleep(0.01)
+        return listings[provider.id]
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=load_models):
+        async with service:
+            # the background build has not finished yet, the model must not fall back to the first openai provider
+            model_id = f"openai:{second_openai.id}"
+            assert await service.get_provider_by_model_id(model_id=model_id) == second_openai
+
+
+async def test_unknown_model_is_not_routed_to_one_of_several_stale_providers(service, providers):
+    openai, _ = providers
+    second_openai = ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl("http://vllm:8000/v1"))
+    providers.append(second_openai)
+
+    with (
+        mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=ConnectError("unavailable")),
+        pytest.raises(EntityNotFoundError),
+    ):
+        await service.get_provider_by_model_id(model_id="openai:gpt-4o")
+
+    async def load_models(provider, api_key):
+        if provider != second_openai:
+            raise ConnectError("unavailable")
+        return _models(provider, "llama")
+
+    with mock.patch.object(ModelProvider, "load_models", autospec=True, side_effect=load_models):
+        await service._refresh_model_index()
+
+    # only the first openai provider has unknown models now
+    assert await service.get_provider_by_model_id(model_id="openai:gpt-4o") == openai
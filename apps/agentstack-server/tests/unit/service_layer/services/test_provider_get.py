@@ -0,0 +1,81 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import uuid
+from unittest import mock
+
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from kink import di
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.provider import DockerImageProviderLocation, Provider, ProviderDeploymentState
+from agentstack_server.service_layer.services.providers import ProviderService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def configuration():
+    di[Configuration] = Configuration()  # provider location validation reads the configuration
+
+
+@pytest.fixture
+def provider() -> Provider:
+    return Provider(
+        source=DockerImageProviderLocation("ghcr.io/i-am-bee/agentstack/agents/chat:latest"),
+        origin="ghcr.io/i-am-bee/agentstack/agents/chat",
+        created_by=uuid.uuid4(),
+        agent_card=AgentCard(
+            name="test",
+            description="test",
+            url="http://agent:8000/",
+            version="1.0.0",
+            capabilities=AgentCapabilities(),
+            default_input_modes=["text"],
+            default_output_modes=["text"],
+            skills=[],
+        ),
+    )
+
+
+@pytest.fixture
+def deployment_manager() -> mock.AsyncMock:
+    manager = mock.AsyncMock()
+    manager.state.return_value = [ProviderDeploymentState.RUNNING]
+    return manager
+
+
+@pytest.fixture
+def uow(provider) -> mock.MagicMock:
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.providers.get = mock.AsyncMock(return_value=provider)
+    uow.providers.list = mock.MagicMock(side_effect=AssertionError("providers must not be listed"))
+    uow.providers.delete = mock.AsyncMock()
+    uow.env.get_all = mock.AsyncMock()
+    uow.commit = mock.AsyncMock()
+    return uow
+
+
+@pytest.fixture
+def service(deployment_manager, uow) -> ProviderService:
+    return ProviderService(deployment_manager=deployment_manager, uow=lambda: uow, a2a_proxy=mock.AsyncMock())
+
+
+async def test_get_provider_reads_single_provider(service, provider, deployment_manager, uow):
+    for _ in range(3):
+        result = await service.get_provider(provider_id=provider.id)
+        assert result.id == provider.id
+        assert result.state == ProviderDeploymentState.RUNNING
+
+    uow.providers.get.assert_awaited_once_with(provider_id=provider.id)
+    deployment_manager.state.assert_awaited_once_with(provider_ids=[provider.id])
+    uow.env.get_all.assert_not_awaited()  # provider does not declare any variables
+
+
+async def test_get_provider_cache_is_invalidated_on_delete(service, provider, uow):
+    await service.get_provider(provider_id=provider.id)
+    await service.delete_provider(provider_id=provider.id, user=mock.MagicMock())
+    await service.get_provider(provider_id=provider.id)
+    assert uow.providers.get.await_count == 3  # get, delete ownership check, get
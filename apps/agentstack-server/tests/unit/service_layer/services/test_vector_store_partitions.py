@@ -0,0 +1,40 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.vector_store import VectorStore
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
+
+pytestmark = pytest.mark.unit
+
+
+async def test_rebalance_locks_vector_store_before_excluding_it():
+    calls: list[str] = []
+    vector_store = VectorStore(name="store", dimension=128, model_id="model", created_by=uuid4())
+
+    async def list_vector_stores(**_):
+        yield vector_store
+
+    def record(call: str, result=None):
+        return lambda *args, **kwargs: calls.append(call.format(**kwargs)) or result
+
+    def create_uow():
+        uow = mock.AsyncMock()
+        uow.__aenter__.return_value = uow
+        uow.commit = mock.AsyncMock(side_effect=record("commit"))
+        uow.vector_stores.list = list_vector_stores
+        uow.vector_database.lock_collection = mock.AsyncMock(side_effect=record("lock(exclusive={exclusive})"))
+        uow.vector_database.exclude_from_shared_partition = mock.AsyncMock(side_effect=record("exclude", True))
+        uow.vector_database.create_dedicated_partition = mock.AsyncMock(side_effect=record("move", "partition"))
+        return uow
+
+    stats = await VectorStoreService(uow=create_uow, configuration=Configuration()).rebalance_partitions()
+
+    assert stats["promoted"] == ["partition"]
+    # the exclusion is committed while the exclusive lock is held, writes to the store wait until the move is committed
+    assert calls[1:] == ["lock(exclusive=True)", "exclude", "commit", "move", "commit"]
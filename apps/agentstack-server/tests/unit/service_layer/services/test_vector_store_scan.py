@@ -0,0 +1,32 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest import mock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize(
+    ("version", "iterative_scan"),
+    [("0.7.4", False), (None, False), ("0.8.0", True), ("0.10.1", True)],
+)
+async def test_iterative_scan_is_turned_off_on_old_pgvector(version, iterative_scan):
+    uow = mock.MagicMock()
+    uow.__aenter__.return_value = uow
+    uow.vector_database.get_extension_version = mock.AsyncMock(return_value=version)
+    uow.vector_stores.get = mock.AsyncMock()
+    uow.vector_database.similarity_search = mock.AsyncMock(return_value=[])
+    configuration = Configuration()
+
+    async with VectorStoreService(uow=lambda: uow, configuration=configuration) as service:
+        await service.search(vector_store_id=uuid4(), query_vector=np.zeros(4), user=mock.MagicMock())
+
+    assert uow.vector_database.similarity_search.call_args.kwargs["iterative_scan"] is iterative_scan
+    assert configuration.vector_stores.hnsw_iterative_scan == "relaxed_order"
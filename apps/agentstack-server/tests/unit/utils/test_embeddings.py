@@ -0,0 +1,61 @@
+# Copyright 2025 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import struct
+
+import numpy as np
+import pytest
+
+from agentstack_server.domain.models.vector_store import VectorStoreItem
+from agentstack_server.utils.embeddings import EmbeddingEncoding, decode_embedding, encode_embedding
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("encoding", [EmbeddingEncoding.BASE64, EmbeddingEncoding.BASE64_FLOAT16])
+def test_embedding_roundtrip(encoding: EmbeddingEncoding):
+    embedding = [0.5, -1.25, 3.0, 0.0]
+    encoded = encode_embedding(embedding, encoding)
+    assert isinstance(encoded, str)
+    assert decode_embedding(encoded, encoding).tolist() == embedding
+
+
+def test_base64_is_compatible_with_openai_format():
+    embedding = [0.1, 0.2, 0.3]
+    assert (
+        encode_embedding(embedding, EmbeddingEncoding.BASE64)
+        == base64.b64encode(struct.pack("<3f", *embedding)).decode()
+    )
+
+
+def test_invalid_embedding_buffer():
+    with pytest.raises(ValueError, match="float32"):
+        decode_embedding(base64.b64encode(b"\x00" * 6).decode(), EmbeddingEncoding.BASE64)
+    with pytest.raises(ValueError, match="float16"):
+        decode_embedding(b"\x00" * 3, EmbeddingEncoding.BASE64_FLOAT16)
+
+
+def test_raw_embedding_buffer():
+    buffer = np.array([0.5, -2.0], dtype="<f4").tobytes()
+    assert decode_embedding(buffer, EmbeddingEncoding.BASE64).tolist() == [0.5, -2.0]
+    assert decode_embedding(memoryview(buffer), EmbeddingEncoding.FLOAT).tolist() == [0.5, -2.0]
+
+
+def test_vector_store_item_embedding_encoding():
+    encoded = encode_embedding([1.0, 2.0], EmbeddingEncoding.BASE64_FLOAT16)
+    item = VectorStoreItem.model_validate(
+        {"document_id": "doc", "text": "text", "embedding": encoded}, context={"encoding_format": "base64_float16"}
+    )
+    assert isinstance(item.embedding, np.ndarray)
+    assert item.embedding.tolist() == [1.0, 2.0]
+    assert item.model_dump(mode="json")["embedding"] == [1.0, 2.0]
+    assert item.model_dump(mode="json", context={"encoding_format": "base64_float16"})["embedding"] == encoded
+
+
+def test_vector_store_item_float_list_embedding():
+    item = VectorStoreItem.model_validate_json('{"document_id": "doc", "text": "text", "embedding": [1, 2.5]}')
+    assert item.embedding.dtype == np.float32
+    assert item.embedding.tolist() == [1.0, 2.5]
+    with pytest.raises(ValueError, match="Embedding"):
+        VectorStoreItem.model_validate({"document_id": "doc", "text": "text", "embedding": [[1.0]]})
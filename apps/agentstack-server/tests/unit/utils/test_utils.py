@@ -2,19 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
-from io import StringIO
+from io import BytesIO
 from typing import Any
 
 import pytest
 
-from agentstack_server.utils.utils import extract_string_value_stream
+from agentstack_server.utils.utils import abatched, extract_string_value_stream
 
 
-def async_json_reader(obj: dict[str, Any] | str):
-    stringio = StringIO(json.dumps(obj) if not isinstance(obj, str) else obj)
+def async_json_reader(obj: dict[str, Any] | str, ensure_ascii: bool = True):
+    bytesio = BytesIO((json.dumps(obj, ensure_ascii=ensure_ascii) if not isinstance(obj, str) else obj).encode())
 
     async def read(size: int):
-        while chunk := stringio.read(size):
+        while chunk := bytesio.read(size):
             yield chunk
 
     return read
@@ -29,16 +29,21 @@ def async_json_reader(obj: dict[str, Any] | str):
         {"first_key": '"text": "haha"', "text": "abcde" * 100, "other_key": 666},
         {"text": 'escape "hell\\"\\' * 1000},
         {"text": 'escape "hell2\\n\t\r\\d"\\' * 1000},
+        {"text": "unicode žluťoučký kůň 🐴 \u2028 " * 100},
+        {"nested": {"text": "abcde" * 100}},
     ],
 )
-async def test_extract_string_value_stream(obj):
-    reader = async_json_reader(obj)
+@pytest.mark.parametrize("chunk_size", [1, 7, 128])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+async def test_extract_string_value_stream(obj, chunk_size, ensure_ascii):
+    reader = async_json_reader(obj, ensure_ascii=ensure_ascii)
 
     result = []
-    async for chunk in extract_string_value_stream(reader, "text", chunk_size=128):
+    async for chunk in extract_string_value_stream(reader, "text", chunk_size=chunk_size):
+        assert chunk
         result.append(chunk)
 
-    assert "".join(result) == obj["text"]
+    assert b"".join(result).decode() == obj.get("nested", obj)["text"]
 
 
 @pytest.mark.unit
@@ -47,6 +52,7 @@ async def test_extract_string_value_stream(obj):
     [
         ({"txt": "aa"}, KeyError),
         ('{"text": "aaaa ', EOFError),
+        ('{"text": "aaaa \\x0000 "}', ValueError),
     ],
 )
 async def test_extract_string_value_stream_key_in_between_chunks(obj, error):
@@ -55,3 +61,34 @@ async def test_extract_string_value_stream_key_in_between_chunks(obj, error):
     with pytest.raises(error):
         async for _chunk in extract_string_value_stream(reader, "text"):
             ...
+
+
+@pytest.mark.unit
+async def test_extract_string_value_stream_large_document():
+    """Large synthetic docling response, markdown with a newline escape every line and some non-ASCII text."""
+    line = '| Column | Hodnota "ř" | 🐴 | \\ | value |\n'
+    md_content = line * (20 * 1024 * 1024 // len(line))
+    response = {
+        "document": {"filename": "doc.pdf", "md_content": md_content, "json_content": None, "html_content": None},
+        "status": "success",
+        "errors": [],
+        "processing_time": 1.5,
+    }
+    reader = async_json_reader(response)
+    expected = md_content.encode()
+
+    result = [chunk async for chunk in extract_string_value_stream(reader, "md_content", chunk_size=64 * 1024)]
+
+    assert b"".join(result) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("size", [0, 1, 5, 6])
+async def test_abatched(size: int):
+    async def numbers():
+        for i in range(size):
+            yield i
+
+    batches = [batch async for batch in abatched(numbers(), 2)]
+    assert [i for batch in batches for i in batch] == list(range(size))
+    assert all(len(batch) == 2 for batch in batches[:-1])